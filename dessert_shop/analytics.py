@@ -0,0 +1,219 @@
+"""analytics.py
+
+Incremental sales rollups over streams of completed orders.
+
+`SalesAggregator` keeps revenue, tax, units and line counts grouped by
+hour, product type (the DessertItem class name) and PayType. Each item
+updates one group in O(1) from its cached cost and tax in cents, so
+nothing is priced again. Columnar OrderBatch input is folded in the same
+way from its priced columns.
+
+Aggregators are mergeable: workers can aggregate separate parts of a
+stream, send ``snapshot()`` (plain lists, strings and numbers, so it can
+be pickled or written as JSON) back, and the parent combines them with
+``merge()``. Merging is exact, since money is summed in integer cents.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from batch import PRODUCT_BY_KIND, OrderBatch
+from dessert import Order
+from money import Cents
+from payment import PayType
+
+SNAPSHOT_VERSION = 1
+
+GroupKey = Tuple[datetime, str, PayType]
+
+
+class SalesRow(NamedTuple):
+    """Totals of one (hour, product, pay type) group.
+
+    Attributes
+    ----------
+    hour: datetime
+        Start of the hour
+    product: str
+        Product type, e.g. "Cookie"
+    pay_type: PayType
+        Payment method of the orders
+    revenue: Cents
+        Sum of the item costs in cents
+    tax: Cents
+        Sum of the item taxes in cents
+    units: float
+        Pounds of candy, cookies or scoops sold
+    lines: int
+        Number of order lines
+    """
+
+    hour: datetime
+    product: str
+    pay_type: PayType
+    revenue: Cents
+    tax: Cents
+    units: float
+    lines: int
+
+
+def hour_of(when: datetime) -> datetime:
+    """Return the start of the hour containing when."""
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+class SalesAggregator:
+    """Group-by rollups of revenue, tax and units sold."""
+
+    def __init__(self) -> None:
+        # (hour, product, pay type) -> [revenue cents, tax cents, units, lines]
+        self._groups: Dict[GroupKey, List] = {}
+
+    def __len__(self) -> int:
+        """Number of non-empty groups."""
+        return len(self._groups)
+
+    def _group(self, key: GroupKey) -> List:
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = [0, 0, 0, 0]
+        return group
+
+    def add_order(self, order: Order, when: datetime) -> None:
+        """Add a completed order.
+
+        Parameters
+        ----------
+        order : Order
+            The order; its items' cached cost and tax are used as is
+        when : datetime
+            When the order was completed
+        """
+        hour = hour_of(when)
+        pay_type = order.get_pay_type()
+        for item in order.order:
+            group = self._group((hour, type(item).__name__, pay_type))
+            group[0] += item.cost_cents()
+            group[1] += item.tax_cents()
+            group[2] += item.pricing_quantity()
+            group[3] += 1
+
+    def add_batch(self, batch: OrderBatch, pay_type: PayType, when: datetime) -> None:
+        """Add every line of a columnar batch paid with pay_type.
+
+        The batch is priced once (see ``OrderBatch.line_cost_cents``) and
+        its columns are folded into the groups.
+        """
+        hour = hour_of(when)
+        groups = {
+            kind: self._group((hour, product, pay_type))
+            for kind, product in PRODUCT_BY_KIND.items()
+        }
+        for kind, quantity, cost, tax in zip(
+            batch.kind, batch.quantity, batch.line_cost_cents(), batch.line_tax_cents()
+        ):
+            group = groups[kind]
+            group[0] += int(cost)
+            group[1] += int(tax)
+            group[2] += quantity
+            group[3] += 1
+        # drop the groups of products the batch did not contain
+        for product in PRODUCT_BY_KIND.values():
+            key = (hour, product, pay_type)
+            if not self._groups[key][3]:
+                del self._groups[key]
+
+    def consume(self, orders: Iterable[Tuple[datetime, Order]]) -> "SalesAggregator":
+        """Add every (completion time, Order) pair of a stream; returns self."""
+        for when, order in orders:
+            self.add_order(order, when)
+        return self
+
+    def rows(self) -> Iterator[SalesRow]:
+        """Yield one SalesRow per group, ordered by hour, product and pay type."""
+        for key in sorted(self._groups, key=lambda k: (k[0], k[1], k[2].value)):
+            revenue, tax, units, lines = self._groups[key]
+            yield SalesRow(*key, Cents(revenue), Cents(tax), units, lines)
+
+    def totals(
+        self,
+        hour: Optional[datetime] = None,
+        product: Optional[str] = None,
+        pay_type: Optional[PayType] = None,
+    ) -> Tuple[Cents, Cents, float, int]:
+        """Return (revenue, tax, units, lines) over the matching groups.
+
+        Parameters left as None match every group, so ``totals()`` is the
+        grand total and ``totals(product="Cookie")`` the cookie sales.
+        """
+        if hour is not None:
+            hour = hour_of(hour)
+        revenue = tax = lines = 0
+        units = 0.0
+        for (group_hour, group_product, group_pay), group in self._groups.items():
+            if (
+                (hour is None or group_hour == hour)
+                and (product is None or group_product == product)
+                and (pay_type is None or group_pay is pay_type)
+            ):
+                revenue += group[0]
+                tax += group[1]
+                units += group[2]
+                lines += group[3]
+        return Cents(revenue), Cents(tax), units, lines
+
+    def merge(self, other: "SalesAggregator") -> "SalesAggregator":
+        """Add the groups of another aggregator into this one; returns self."""
+        for key, (revenue, tax, units, lines) in other._groups.items():
+            group = self._group(key)
+            group[0] += revenue
+            group[1] += tax
+            group[2] += units
+            group[3] += lines
+        return self
+
+    def snapshot(self) -> dict:
+        """Return the aggregate as plain data (JSON and pickle friendly)."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "groups": [
+                [hour.isoformat(), product, pay_type.value, *group]
+                for (hour, product, pay_type), group in self._groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, state: dict) -> "SalesAggregator":
+        """Rebuild an aggregator from ``snapshot()`` data.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot has an unsupported version
+        """
+        if state.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {state.get('version')}")
+        aggregator = cls()
+        for hour, product, pay_type, revenue, tax, units, lines in state["groups"]:
+            key = (datetime.fromisoformat(hour), product, PayType(pay_type))
+            aggregator._groups[key] = [revenue, tax, units, lines]
+        return aggregator
+
+
+def merge_snapshots(states: Iterable[dict]) -> SalesAggregator:
+    """Combine the snapshots of several partial aggregators."""
+    aggregator = SalesAggregator()
+    for state in states:
+        aggregator.merge(SalesAggregator.from_snapshot(state))
+    return aggregator
+
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "SalesRow",
+    "SalesAggregator",
+    "hour_of",
+    "merge_snapshots",
+]
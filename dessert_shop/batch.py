@@ -0,0 +1,373 @@
+"""batch.py
+
+Columnar OrderBatch for bulk pricing of dessert lines.
+
+An OrderBatch stores one row per dessert line in typed arrays (``array``
+module) instead of one DessertItem object per line. Pricing is done in
+whole-column passes: with NumPy installed the arrays are viewed through
+``numpy.frombuffer`` without copying and priced with vectorized
+operations, otherwise a plain Python loop over the arrays is used.
+
+Both passes work in integer cents with the rounding policy from
+money.py and apply the active pricing rules from pricing.py (the NumPy
+pass looks up each product's discount tier for the whole column with
+``searchsorted``), so results are identical to the per-object path in dessert.py:
+per-line cost matches ``cost_cents()``, per-line tax matches
+``tax_cents()`` and the totals match ``Order.order_cost()`` and
+``Order.order_tax()``.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, Iterable, Optional, Sequence
+
+from dessert import Candy, Cookie, DessertItem, IceCream, Order, Sundae
+from money import (
+    Rounding,
+    get_rounding,
+    percent_of,
+    to_basis_points,
+    to_cents,
+)
+from pricing import CompiledRules, get_pricing_rules
+from taxes import TaxTable, get_jurisdiction, get_tax_table
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Product kind codes stored in the `kind` column
+CANDY = 0
+COOKIE = 1
+ICE_CREAM = 2
+SUNDAE = 3
+
+# Kind code of each item class, and the product name of each kind code
+KIND_BY_TYPE = {Candy: CANDY, Cookie: COOKIE, IceCream: ICE_CREAM, Sundae: SUNDAE}
+PRODUCT_BY_KIND = {kind: cls.__name__ for cls, kind in KIND_BY_TYPE.items()}
+
+
+class OrderBatch:
+    """Column-oriented collection of dessert lines.
+
+    Attributes
+    ----------
+    kind : array
+        Product kind code per line (CANDY, COOKIE, ICE_CREAM, SUNDAE)
+    quantity : array
+        Pounds, cookies or scoops per line
+    unit_price : array
+        Price per pound, per dozen or per scoop
+    topping_price : array
+        Topping price (0.0 for everything but sundaes)
+    tax_percent : array
+        Sales tax percent per line, NaN for the tax table rate of the
+        line's product (see taxes.py)
+    """
+
+    def __init__(self) -> None:
+        self.kind = array("B")
+        self.quantity = array("d")
+        self.unit_price = array("d")
+        self.topping_price = array("d")
+        self.tax_percent = array("d")
+        # (costs, taxes) from the last pricing pass, None when stale
+        self._priced = None
+        # (pricing rules, tax table, jurisdiction, rounding) of the last pass
+        self._priced_with = None
+
+    @classmethod
+    def from_items(cls, items: Iterable[DessertItem]) -> "OrderBatch":
+        """Create a batch holding one line per item."""
+        batch = cls()
+        batch.extend(items)
+        return batch
+
+    @classmethod
+    def from_order(cls, order: Order) -> "OrderBatch":
+        """Create a batch holding the lines of an Order."""
+        return cls.from_items(order.order)
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def append_line(
+        self,
+        kind: int,
+        quantity: float,
+        unit_price: float,
+        topping_price: float = 0.0,
+        tax_percent: Optional[float] = None,
+    ) -> None:
+        """Append one line given its raw column values.
+
+        Parameters
+        ----------
+        kind : int
+            One of CANDY, COOKIE, ICE_CREAM or SUNDAE
+        quantity : float
+            Pounds (candy), cookies (cookie) or scoops (ice cream, sundae)
+        unit_price : float
+            Price per pound, per dozen or per scoop
+        topping_price : float, optional
+            Topping price for sundaes (default 0.0)
+        tax_percent : float, optional
+            Sales tax percent (default None: the tax table rate for the
+            product, like an item without its own ``tax_percent``)
+        """
+        if kind not in (CANDY, COOKIE, ICE_CREAM, SUNDAE):
+            raise ValueError(f"Invalid product kind: {kind}")
+        self.kind.append(kind)
+        self.quantity.append(quantity)
+        self.unit_price.append(unit_price)
+        self.topping_price.append(topping_price)
+        self.tax_percent.append(math.nan if tax_percent is None else tax_percent)
+        self._priced = None
+
+    def append(self, item: DessertItem) -> None:
+        """Append the pricing fields of a DessertItem as a new line.
+
+        Raises
+        ------
+        TypeError
+            If item is not a Candy, Cookie, IceCream or Sundae
+        """
+        kind = KIND_BY_TYPE.get(type(item))
+        if kind == CANDY:
+            self.append_line(
+                kind, item.candy_weight, item.price_per_pound, 0.0, item._tax_percent
+            )
+        elif kind == COOKIE:
+            self.append_line(
+                kind, item.cookie_quantity, item.price_per_dozen, 0.0, item._tax_percent
+            )
+        elif kind == ICE_CREAM:
+            self.append_line(
+                kind, item.scoop_count, item.price_per_scoop, 0.0, item._tax_percent
+            )
+        elif kind == SUNDAE:
+            self.append_line(
+                kind,
+                item.scoop_count,
+                item.price_per_scoop,
+                item.topping_price,
+                item._tax_percent,
+            )
+        else:
+            raise TypeError(f"Cannot batch item of type {type(item).__name__}")
+
+    def extend(self, items: Iterable[DessertItem]) -> None:
+        """Append every item in items."""
+        for item in items:
+            self.append(item)
+
+    def line_cost_cents(self) -> Sequence[int]:
+        """Return the cost in cents of every line, matching ``cost_cents()``."""
+        return self._price()[0]
+
+    def line_tax_cents(
+        self, table: Optional[TaxTable] = None, jurisdiction: Optional[str] = None
+    ) -> Sequence[int]:
+        """Return the tax in cents of every line, matching ``tax_cents()``.
+
+        Parameters
+        ----------
+        table : TaxTable, optional
+            Rate table to tax the whole batch against (default the active one)
+        jurisdiction : str, optional
+            Jurisdiction within the table (default the active one)
+        """
+        if table is None and jurisdiction is None:
+            return self._price()[1]
+        lookup = _tax_lookup(
+            table or get_tax_table(), jurisdiction or get_jurisdiction()
+        )
+        return self._tax(self.line_cost_cents(), lookup)
+
+    def line_costs(self) -> list:
+        """Return the cost of every line, matching ``calculate_cost()``."""
+        return [cents / 100 for cents in self.line_cost_cents()]
+
+    def line_taxes(self) -> list:
+        """Return the tax of every line, matching ``calculate_tax()``."""
+        return [cents / 100 for cents in self.line_tax_cents()]
+
+    def order_cost_cents(self) -> int:
+        """Return the batch subtotal in cents."""
+        return int(sum(self.line_cost_cents()))
+
+    def order_tax_cents(
+        self, table: Optional[TaxTable] = None, jurisdiction: Optional[str] = None
+    ) -> int:
+        """Return the batch tax total in cents; see :meth:`line_tax_cents`."""
+        return int(sum(self.line_tax_cents(table, jurisdiction)))
+
+    def order_cost(self) -> float:
+        """Return the batch subtotal, matching ``Order.order_cost()``."""
+        return self.order_cost_cents() / 100
+
+    def order_tax(self) -> float:
+        """Return the batch tax total, matching ``Order.order_tax()``."""
+        return self.order_tax_cents() / 100
+
+    def _price(self):
+        """Run the pricing pass if needed and return (cost cents, tax cents)."""
+        rules = get_pricing_rules()
+        table = get_tax_table()
+        jurisdiction = get_jurisdiction()
+        rounding = get_rounding()
+        priced_with = self._priced_with
+        if (
+            self._priced is None
+            or priced_with[0] is not rules
+            or priced_with[1] is not table
+            or priced_with[2] != jurisdiction
+            or priced_with[3] is not rounding
+        ):
+            if np is not None and len(self):
+                costs = self._price_numpy(rules)
+            else:
+                costs = self._price_python(rules)
+            taxes = self._tax(costs, _tax_lookup(table, jurisdiction))
+            self._priced = costs, taxes
+            self._priced_with = rules, table, jurisdiction, rounding
+        return self._priced
+
+    def _tax(self, costs, lookup: Dict[int, int]):
+        """Return the tax in cents of every line given its cost."""
+        if np is not None and len(self):
+            return self._tax_numpy(costs, lookup)
+        return self._tax_python(costs, lookup)
+
+    def _price_python(self, rules: CompiledRules) -> array:
+        """Return the cost in cents of every line, with a plain loop."""
+        price_functions = {
+            kind: rules.price_function(product)
+            for kind, product in PRODUCT_BY_KIND.items()
+        }
+        costs = array("q")
+        for kind, quantity, unit_price, topping in zip(
+            self.kind, self.quantity, self.unit_price, self.topping_price
+        ):
+            if kind == COOKIE:
+                amount = quantity / 12 * unit_price
+            else:
+                amount = quantity * unit_price
+            cost = to_cents(amount)
+            if kind == SUNDAE:
+                cost += to_cents(topping)
+            price = price_functions[kind]
+            if price is not None:
+                cost = price(quantity, cost)
+            costs.append(cost)
+        return costs
+
+    def _tax_python(self, costs: Sequence[int], lookup: Dict[int, int]) -> array:
+        """Return the tax in cents of every line, with a plain loop."""
+        taxes = array("q")
+        for kind, cost, percent in zip(self.kind, costs, self.tax_percent):
+            # NaN (no rate of its own) is the only value not equal to itself
+            if percent != percent:
+                basis_points = lookup[kind]
+            else:
+                basis_points = to_basis_points(percent)
+            taxes.append(percent_of(cost, basis_points))
+        return taxes
+
+    def _price_numpy(self, rules: CompiledRules):
+        """Return the cost in cents of every line, with vectorized passes."""
+        kind = np.frombuffer(self.kind, dtype=np.uint8)
+        quantity = np.frombuffer(self.quantity, dtype=np.float64)
+        unit_price = np.frombuffer(self.unit_price, dtype=np.float64)
+        topping = np.frombuffer(self.topping_price, dtype=np.float64)
+
+        # cookies are priced by the dozen: quantity / 12 * price, in that order
+        amount = np.where(kind == COOKIE, quantity / 12, quantity) * unit_price
+        # topping_price is 0.0 on every line that is not a sundae
+        costs = _to_cents_array(amount) + _to_cents_array(topping)
+        if rules.tables:
+            costs = costs - _round_div_array(
+                costs * _discount_array(rules, kind, quantity), 10_000
+            )
+        return costs
+
+    def _tax_numpy(self, costs, lookup: Dict[int, int]):
+        """Return the tax in cents of every line, with vectorized passes."""
+        kind = np.frombuffer(self.kind, dtype=np.uint8)
+        percent = np.frombuffer(self.tax_percent, dtype=np.float64)
+        table_rates = np.zeros(max(lookup) + 1, dtype=np.int64)
+        for code, basis_points in lookup.items():
+            table_rates[code] = basis_points
+        own_rates = np.rint(np.nan_to_num(percent) * 100).astype(np.int64)
+        basis_points = np.where(np.isnan(percent), table_rates[kind], own_rates)
+        return _round_div_array(np.asarray(costs) * basis_points, 10_000)
+
+
+def _tax_lookup(table: TaxTable, jurisdiction: str) -> Dict[int, int]:
+    """Return the tax rate in basis points of every product kind."""
+    lookup = {}
+    for cls, kind in KIND_BY_TYPE.items():
+        basis_points = table.basis_points(jurisdiction, cls.tax_category)
+        if basis_points is None:
+            basis_points = to_basis_points(cls.default_tax_percent)
+        lookup[kind] = basis_points
+    return lookup
+
+
+def _discount_array(rules: CompiledRules, kind, quantity):
+    """Return the discount in basis points for every line."""
+    basis_points = np.zeros(len(kind), dtype=np.int64)
+    for code, product in PRODUCT_BY_KIND.items():
+        table = rules.tables.get(product)
+        if table is None:
+            continue
+        thresholds, discounts = table
+        lines = kind == code
+        # index of the highest threshold strictly below each quantity, + 1
+        tiers = np.searchsorted(thresholds, quantity[lines], side="left")
+        basis_points[lines] = np.array((0,) + discounts, dtype=np.int64)[tiers]
+    return basis_points
+
+
+def _round_tie_array(whole):
+    """Vectorized ``money._round_tie``: resolve exact halves under the policy."""
+    if get_rounding() is Rounding.HALF_EVEN:
+        return np.where(whole % 2 == 0, whole, whole + 1)
+    return np.where(whole >= 0, whole + 1, whole)
+
+
+def _to_cents_array(amounts):
+    """Vectorized ``money.to_cents`` for a float64 array of dollar amounts."""
+    # amount == mantissa * 2**exponent exactly, with an integer mantissa of
+    # at most 53 bits, so cents == mantissa * 100 / 2**shift exactly
+    fractions, exponents = np.frexp(amounts)
+    mantissas = (fractions * 2.0**53).astype(np.int64)
+    # amounts under 2**-10 dollars (shift > 62) round to zero cents either way
+    shifts = np.clip(53 - exponents, 0, 62)
+    mantissas = np.where(53 - exponents > 62, 0, mantissas)
+    return _round_div_array(mantissas * 100, np.left_shift(np.int64(1), shifts))
+
+
+def _round_div_array(numerators, denominator):
+    """Vectorized ``money.round_div`` for an int64 array of numerators.
+
+    denominator is a positive int, or an int64 array of them.
+    """
+    whole, remainder = np.divmod(numerators, denominator)
+    twice = 2 * remainder
+    cents = np.where(twice < denominator, whole, whole + 1)
+    return np.where(twice == denominator, _round_tie_array(whole), cents)
+
+
+__all__ = [
+    "OrderBatch",
+    "CANDY",
+    "COOKIE",
+    "ICE_CREAM",
+    "SUNDAE",
+    "KIND_BY_TYPE",
+    "PRODUCT_BY_KIND",
+]
@@ -0,0 +1,80 @@
+"""bench_checkout.py
+
+Benchmark for parallel checkout (checkout.py) against the number of
+worker processes.
+
+Builds the rows of a set of orders, checks them out with 1, 2, 4, ...
+workers up to the CPU count and reports the speedup over a single process.
+Parsing, pricing and rendering all happen in the workers, as in the bulk
+checkout. The speedup depends on the core count, which is printed first;
+on a single core the pool only adds overhead.
+
+Run from the dessert_shop directory:
+
+    python bench_checkout.py [ORDERS]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+from checkout import checkout_rows
+
+
+def make_rows(count: int) -> list:
+    """Return `count` (order_id, rows) pairs of 40 rows each."""
+    groups = []
+    for i in range(count):
+        order_id = str(i)
+        rows = []
+        for line in range(10):
+            for kind, quantity, price in (
+                ("candy", 0.25 * (i % 7 + 1), 0.35),
+                ("cookie", i % 24 + 1, 3.99),
+                ("ice_cream", line % 4 + 1, 0.79),
+                ("sundae", line % 3 + 1, 0.69),
+            ):
+                record = {
+                    "order_id": order_id,
+                    "kind": kind,
+                    "name": f"{kind} {line}",
+                    "quantity": str(quantity),
+                    "price": str(price),
+                }
+                if kind == "sundae":
+                    record["topping_name"] = "Hot Fudge"
+                    record["topping_price"] = "1.29"
+                rows.append((len(rows) + 2, record))
+        groups.append((order_id, rows))
+    return groups
+
+
+def worker_counts() -> list:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    groups = make_rows(count)
+    print(f"{os.cpu_count() or 1} CPUs, {count} orders")
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8}")
+    baseline = None
+    for workers in worker_counts():
+        start = time.perf_counter()
+        for _ in checkout_rows(groups, workers=workers):
+            pass
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
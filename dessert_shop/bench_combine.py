@@ -0,0 +1,51 @@
+"""bench_combine.py
+
+Benchmark for Order.add with combinable items.
+
+Builds orders of increasing size and reports the average time per add.
+With the combine index the per-add latency should stay roughly flat as the
+order grows, instead of growing linearly with the number of lines.
+
+Run from the dessert_shop directory:
+
+    python bench_combine.py
+"""
+
+from __future__ import annotations
+
+import time
+
+from dessert import Candy, Cookie, Order
+
+SIZES = [1_000, 10_000, 50_000]
+
+
+def build_order(lines: int) -> Order:
+    """Build an order with `lines` distinct lines, each added twice.
+
+    The first pass appends every line, the second pass combines into them,
+    so half of the adds hit the combine path.
+    """
+    order = Order()
+    for _ in range(2):
+        for i in range(lines // 2):
+            if i % 2:
+                order.add(Candy(f"Candy {i}", 0.5, 0.25))
+            else:
+                order.add(Cookie(f"Cookie {i}", 6, 3.99))
+    return order
+
+
+def main() -> None:
+    print(f"{'lines':>10} {'total (s)':>12} {'per add (us)':>14}")
+    for lines in SIZES:
+        start = time.perf_counter()
+        order = build_order(lines)
+        elapsed = time.perf_counter() - start
+        adds = 2 * (lines // 2)
+        assert len(order) == lines // 2
+        print(f"{lines:>10} {elapsed:>12.4f} {elapsed / adds * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""bench_ingest.py
+
+Throughput benchmark for bulk order ingestion (ingest.py).
+
+Generates an in-memory CSV file of the requested size, streams it through
+ingest.write_receipts and reports rows per second.
+
+Run from the dessert_shop directory:
+
+    python bench_ingest.py [ROWS]
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import time
+
+from ingest import write_receipts
+
+ROWS_PER_ORDER = 5
+
+
+def make_csv(rows: int) -> str:
+    """Return CSV text with `rows` item rows, ROWS_PER_ORDER per order."""
+    lines = ["order_id,kind,name,quantity,price,topping_name,topping_price,pay_type"]
+    for i in range(rows):
+        order_id = i // ROWS_PER_ORDER
+        match i % 4:
+            case 0:
+                lines.append(f"{order_id},candy,Candy Corn,1.5,0.25,,,CARD")
+            case 1:
+                lines.append(f"{order_id},cookie,Chocolate Chip,6,3.99,,,")
+            case 2:
+                lines.append(f"{order_id},ice_cream,Pistachio,2,0.79,,,")
+            case _:
+                lines.append(f"{order_id},sundae,Vanilla,3,0.69,Hot Fudge,1.29,")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    text = make_csv(rows)
+    out = io.StringIO()
+    start = time.perf_counter()
+    orders = write_receipts(io.StringIO(text), out)
+    elapsed = time.perf_counter() - start
+    print(f"{rows} rows, {orders} orders in {elapsed:.2f} s ({rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""bench_iter.py
+
+Benchmark of a full traversal of a large Order.
+
+Compares Order.__iter__ (an independent list iterator) with the old
+stateful iterator that returned the order itself and produced each item
+from a Python-level __next__.
+
+Run from the dessert_shop directory:
+
+    python bench_iter.py [ITEMS]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from dessert import IceCream, Order
+
+
+class StatefulOrder(Order):
+    """Order with the old iterator protocol, kept here for comparison."""
+
+    def __iter__(self):
+        self._current_index = 0
+        return self
+
+    def __next__(self):
+        if self._current_index >= len(self.order):
+            raise StopIteration
+        item = self.order[self._current_index]
+        self._current_index += 1
+        return item
+
+
+def fill(order: Order, count: int) -> Order:
+    for i in range(count):
+        order.add(IceCream("Vanilla", i % 4, 0.79))
+    return order
+
+
+def traverse(order: Order) -> int:
+    count = 0
+    for _ in order:
+        count += 1
+    return count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'iterator':>10} {'per item (ns)':>14}")
+    for label, order in (
+        ("stateful", fill(StatefulOrder(), count)),
+        ("list", fill(Order(), count)),
+    ):
+        best = min(timeit.repeat(lambda: traverse(order), number=1, repeat=10))
+        print(f"{label:>10} {best / count * 1e9:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""bench_memory.py
+
+tracemalloc benchmark of the memory used per dessert item.
+
+For every dessert class it compares the slotted class from dessert.py
+("after") with a subclass that adds back a per-instance __dict__ and the
+per-item copy of tax_percent the items used to carry ("before").
+
+Run from the dessert_shop directory:
+
+    python bench_memory.py [ITEMS]
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+
+from dessert import Candy, Cookie, IceCream, Sundae
+
+ARGS = {
+    Candy: ("Candy Corn", 1.5, 0.25),
+    Cookie: ("Chocolate Chip", 6, 3.99),
+    IceCream: ("Pistachio", 2, 0.79),
+    Sundae: ("Vanilla", 3, 0.69, "Hot Fudge", 1.29),
+}
+
+
+def with_dict(cls: type) -> type:
+    """Return a subclass of cls laid out like the old dict-based items."""
+
+    def __init__(self, *args):
+        cls.__init__(self, *args)
+        self.tax_percent = float(self.default_tax_percent)
+
+    return type(f"Dict{cls.__name__}", (cls,), {"__init__": __init__})
+
+
+def bytes_per_item(cls: type, args: tuple, count: int) -> float:
+    """Return the bytes allocated per instance when creating count items."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [cls(*args) for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    allocated = sum(stat.size_diff for stat in stats)
+    # exclude the list holding the items
+    allocated -= sys.getsizeof(items)
+    return allocated / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'class':>10} {'before (B)':>12} {'after (B)':>11} {'saved':>7}")
+    for cls, args in ARGS.items():
+        before = bytes_per_item(with_dict(cls), args, count)
+        after = bytes_per_item(cls, args, count)
+        print(
+            f"{cls.__name__:>10} {before:>12.1f} {after:>11.1f} "
+            f"{1 - after / before:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""bench_money.py
+
+Micro-benchmark of item pricing: integer cents versus the old
+float -> str -> Decimal -> float round trip.
+
+Both variants price the same lines (cost plus tax) from scratch; the
+legacy functions reproduce what DessertItem.calculate_tax did before the
+money engine was introduced.
+
+Run from the dessert_shop directory:
+
+    python bench_money.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from decimal import ROUND_HALF_UP, Decimal
+
+from money import percent_of, to_basis_points, to_cents
+
+LINES = [(1.5, 0.25), (0.25, 0.35), (6 / 12, 3.99), (2, 0.79), (3, 0.69)] * 200
+TAX_PERCENT = 7.25
+REPEAT = 20
+
+
+def legacy_price(quantity: float, price: float, tax_percent: float):
+    """Return (cost, tax) the way dessert.py did with floats and Decimal."""
+    cost = round(quantity * price, 2)
+    cost_decimal = Decimal(str(cost))
+    tax_decimal = cost_decimal * (Decimal(str(tax_percent)) / Decimal("100"))
+    tax = float(tax_decimal.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+    return cost, tax
+
+
+def cents_price(quantity: float, price: float, tax_percent: float):
+    """Return (cost, tax) in integer cents."""
+    cost = to_cents(quantity * price)
+    return cost, percent_of(cost, to_basis_points(tax_percent))
+
+
+def run(price_line) -> float:
+    """Return the best time in seconds to price every line once."""
+
+    def price_all():
+        for quantity, price in LINES:
+            price_line(quantity, price, TAX_PERCENT)
+
+    return min(timeit.repeat(price_all, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    legacy = run(legacy_price)
+    cents = run(cents_price)
+    per_line = 1e6 / len(LINES)
+    print(f"{'variant':>10} {'per line (us)':>14}")
+    print(f"{'decimal':>10} {legacy * per_line:>14.3f}")
+    print(f"{'cents':>10} {cents * per_line:>14.3f}")
+    print(f"speedup: {legacy / cents:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
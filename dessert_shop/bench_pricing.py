@@ -0,0 +1,58 @@
+"""bench_pricing.py
+
+Micro-benchmark of volume pricing rules: the per-item path (each item's
+compiled price function, called from ``cost_cents``) versus the columnar
+OrderBatch pass, with and without rules.
+
+Run from the dessert_shop directory:
+
+    python bench_pricing.py
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from batch import OrderBatch
+from dessert import Candy, Cookie, IceCream, Sundae
+from pricing import set_pricing_rules
+
+RULES = [
+    "Cookie: 10% off above 5 dozen",
+    "Cookie: 15% off above 8 dozen",
+    "Candy: 5% off above 10 lbs",
+    "Sundae: 20% off above 3 scoops",
+]
+ITEMS = [
+    Candy("Gummy Bears", 12.5, 0.40),
+    Cookie("Chocolate Chip", 72, 3.99),
+    IceCream("Vanilla", 2, 0.79),
+    Sundae("Vanilla", 4, 0.69, "Fudge", 1.29),
+    Cookie("Oatmeal", 6, 3.45),
+] * 2000
+REPEAT = 5
+
+
+def per_item() -> None:
+    for item in ITEMS:
+        item._cost = None
+        item.cost_cents()
+
+
+def batched() -> None:
+    OrderBatch.from_items(ITEMS).line_cost_cents()
+
+
+def main() -> None:
+    per_line = 1e6 / len(ITEMS)
+    print(f"{'variant':>10} {'rules':>6} {'per line (us)':>14}")
+    for label, rules in (("none", ()), ("tiered", RULES)):
+        set_pricing_rules(rules)
+        for name, func in (("per item", per_item), ("batch", batched)):
+            best = min(timeit.repeat(func, number=1, repeat=REPEAT))
+            print(f"{name:>10} {label:>6} {best * per_line:>14.3f}")
+    set_pricing_rules(())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""bench_snapshot.py
+
+Reload benchmark: pickle versus the memory-mapped snapshot format.
+
+Builds a day's worth of orders, saves them both ways, then times how long
+it takes to reopen the file and read one order, and to rebuild every
+order.
+
+Run from the dessert_shop directory:
+
+    python bench_snapshot.py [ORDERS]
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from dessert import Candy, Cookie, IceCream, Order, Sundae
+from snapshot import Snapshot, write_snapshot
+
+
+def make_orders(count: int):
+    orders = []
+    for i in range(count):
+        order = Order()
+        order.add(Candy("Candy Corn", 1.5, 0.25))
+        order.add(Cookie("Chocolate Chip", 6, 3.99))
+        order.add(IceCream("Pistachio", 2, 0.79))
+        order.add(Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29))
+        orders.append((str(i), order))
+    return orders
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    orders = make_orders(count)
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, "orders.pickle")
+        snapshot_path = os.path.join(directory, "orders.snap")
+        with open(pickle_path, "wb") as stream:
+            pickle.dump(orders, stream)
+        write_snapshot(snapshot_path, orders)
+
+        def pickle_load():
+            with open(pickle_path, "rb") as stream:
+                return pickle.load(stream)
+
+        def snapshot_one():
+            with Snapshot(snapshot_path) as snap:
+                snap[len(snap) // 2]
+
+        def snapshot_all():
+            with Snapshot(snapshot_path) as snap:
+                for _ in snap:
+                    pass
+
+        print(f"{count} orders")
+        print(f"{'file size (KiB)':>24} pickle {os.path.getsize(pickle_path) // 1024:>8}"
+              f"  snapshot {os.path.getsize(snapshot_path) // 1024:>8}")
+        print(f"{'pickle load all (s)':>24} {timed(pickle_load):.4f}")
+        print(f"{'snapshot open + one (s)':>24} {timed(snapshot_one):.6f}")
+        print(f"{'snapshot load all (s)':>24} {timed(snapshot_all):.4f}")
+
+
+if __name__ == "__main__":
+    main()
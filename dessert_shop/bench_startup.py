@@ -0,0 +1,100 @@
+"""bench_startup.py
+
+Startup benchmark for the dessertshop CLI, based on ``python -X importtime``.
+
+The kiosk starts dessertshop.py once per transaction, so importing it
+must stay cheap. This script imports dessertshop in fresh interpreters,
+reports the best cumulative import time and the slowest direct imports,
+and fails (exit status 1) if the time is over the budget or if a module
+that should be imported lazily (tabulate, argparse, ...) shows up.
+
+Bytecode caching is forced on and one warm-up run fills __pycache__, so
+the numbers do not include compiling the sources.
+
+Run from the dessert_shop directory:
+
+    python bench_startup.py [--budget-ms 40] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+MODULE = "dessertshop"
+DEFAULT_BUDGET_MS = 40.0
+DEFAULT_RUNS = 5
+# Modules the interactive CLI must not import at startup
+LAZY_MODULES = ("tabulate", "argparse", "threading", "json", "checkout", "ingest")
+
+
+def import_times(module: str = MODULE) -> List[Tuple[str, int, int]]:
+    """Import module in a fresh interpreter; return (name, depth, cumulative us)."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # one space, then two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(cumulative)))
+    return rows
+
+
+def measure(runs: int = DEFAULT_RUNS) -> Tuple[float, Dict[str, int], List[str]]:
+    """Return (best total ms, direct imports of the best run, all modules)."""
+    import_times()  # warm up __pycache__
+    best: Optional[List[Tuple[str, int, int]]] = None
+    best_total = float("inf")
+    for _ in range(runs):
+        rows = import_times()
+        total = next(us for name, _, us in rows if name == MODULE)
+        if total < best_total:
+            best, best_total = rows, total
+    # rows come after their imports, so the direct imports of the module
+    # are the depth 1 rows since the previous top-level row
+    end = next(i for i, (name, depth, _) in enumerate(best) if name == MODULE)
+    start = end
+    while start > 0 and best[start - 1][1] > 0:
+        start -= 1
+    direct = {name: us for name, depth, us in best[start:end] if depth == 1}
+    return best_total / 1000, direct, [name for name, _, _ in best]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="dessertshop startup benchmark")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    total_ms, direct, modules = measure(args.runs)
+    print(f"import {MODULE}: {total_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    for name, us in sorted(direct.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {name:<20} {us / 1000:>7.1f} ms")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print(f"imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""bench_suite.py
+
+Benchmark suite for the dessert_shop hot paths, with JSON baselines.
+
+Every case runs at several order sizes:
+
+    add        Order.add of combinable candies and cookies (half combine)
+    sort       Order.sort of a shuffled order
+    totals     order_cost() and order_tax()
+    tax        calculate_tax() of freshly built (uncached) items
+    str        Order.__str__ (the text receipt)
+    tabulate   tabulate(order.to_list()) as printed by dessertshop.py
+
+Each measurement is the best of several repeats, in seconds per run.
+Results can be saved as a baseline and later runs compared against it;
+cases slower than the baseline by more than the tolerance are reported
+as regressions and make the script exit with status 1.
+
+Run from the dessert_shop directory:
+
+    python bench_suite.py --save baseline.json
+    python bench_suite.py --compare baseline.json [--tolerance 0.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from dessert import Candy, Cookie, DessertItem, IceCream, Order, Sundae
+
+try:
+    from tabulate import tabulate
+except ImportError:  # pragma: no cover - tabulate is only needed for one case
+    tabulate = None
+
+DEFAULT_SIZES = [10, 100, 1_000]
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+# Each measurement runs the case often enough to cover this many items
+ITEMS_PER_MEASUREMENT = 5_000
+
+
+class Case(NamedTuple):
+    """A benchmark case.
+
+    Attributes
+    ----------
+    name: str
+        Short name used in reports and baselines
+    setup: Callable[[int], object]
+        Builds the input for one run at the given size (not timed)
+    run: Callable[[object], object]
+        The code being measured
+    """
+
+    name: str
+    setup: Callable[[int], object]
+    run: Callable[[object], object]
+
+
+def make_items(size: int, seed: int = 1420) -> List[DessertItem]:
+    """Return `size` dessert items of every kind with varied prices."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(size):
+        price = rng.randrange(1, 500) / 100
+        match i % 4:
+            case 0:
+                items.append(Candy(f"Candy {i}", rng.randrange(1, 40) / 8, price))
+            case 1:
+                items.append(Cookie(f"Cookie {i}", rng.randrange(1, 36), price))
+            case 2:
+                items.append(IceCream(f"Ice Cream {i}", rng.randrange(1, 5), price))
+            case _:
+                items.append(Sundae(f"Sundae {i}", 2, price, "Fudge", 0.5))
+    return items
+
+
+def make_order(size: int) -> Order:
+    order = Order()
+    for item in make_items(size):
+        order.add(item)
+    return order
+
+
+def make_combinable(size: int) -> List[DessertItem]:
+    """Return `size` candies and cookies, each distinct line added twice."""
+    lines = max(size // 2, 1)
+    items = []
+    for i in list(range(lines)) * 2:
+        if i % 2:
+            items.append(Candy(f"Candy {i}", 0.5, 0.25))
+        else:
+            items.append(Cookie(f"Cookie {i}", 6, 3.99))
+    return items[:size]
+
+
+def add_all(items: List[DessertItem]) -> Order:
+    order = Order()
+    for item in items:
+        order.add(item)
+    return order
+
+
+def shuffled_order(size: int) -> Order:
+    order = make_order(size)
+    random.Random(size).shuffle(order.order)
+    return order
+
+
+def totals(order: Order) -> float:
+    return order.order_cost() + order.order_tax()
+
+
+def tax_all(items: List[DessertItem]) -> float:
+    return sum(item.calculate_tax() for item in items)
+
+
+def tabulate_order(order: Order) -> str:
+    return tabulate(order.to_list(), tablefmt="fancy_grid")
+
+
+CASES = [
+    Case("add", make_combinable, add_all),
+    Case("sort", shuffled_order, Order.sort),
+    Case("totals", make_order, totals),
+    Case("tax", make_items, tax_all),
+    Case("str", make_order, str),
+]
+if tabulate is not None:
+    CASES.append(Case("tabulate", make_order, tabulate_order))
+
+
+def measure(case: Case, size: int, repeat: int = DEFAULT_REPEAT) -> float:
+    """Return the best time in seconds for one run of case at size."""
+    number = max(1, ITEMS_PER_MEASUREMENT // size)
+    best = float("inf")
+    for _ in range(repeat):
+        inputs = [case.setup(size) for _ in range(number)]
+        start = time.perf_counter()
+        for value in inputs:
+            case.run(value)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_suite(
+    sizes: List[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    cases: Optional[List[Case]] = None,
+) -> Dict[str, float]:
+    """Run every case at every size; returns {"case[size]": seconds}."""
+    results = {}
+    for case in CASES if cases is None else cases:
+        for size in sizes:
+            results[f"{case.name}[{size}]"] = measure(case, size, repeat)
+    return results
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    """Write results to a JSON baseline file."""
+    data = {"python": platform.python_version(), "results": results}
+    with open(path, "w") as stream:
+        json.dump(data, stream, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """Read the results of a JSON baseline file."""
+    with open(path) as stream:
+        return json.load(stream)["results"]
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Return the names of cases slower than baseline by more than tolerance.
+
+    Cases missing from either side are ignored.
+    """
+    return [
+        name
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + tolerance)
+    ]
+
+
+def report(
+    results: Dict[str, float], baseline: Optional[Dict[str, float]] = None
+) -> None:
+    header = f"{'case':<18} {'per run (us)':>14}"
+    if baseline is not None:
+        header += f" {'baseline (us)':>14} {'change':>8}"
+    print(header)
+    for name, seconds in results.items():
+        line = f"{name:<18} {seconds * 1e6:>14.2f}"
+        if baseline is not None and name in baseline:
+            change = seconds / baseline[name] - 1
+            line += f" {baseline[name] * 1e6:>14.2f} {change:>+8.1%}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="order sizes to run every case at",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed slowdown before a case counts as a regression (0.25 = 25%%)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat)
+    baseline = load_baseline(args.compare) if args.compare else None
+    report(results, baseline)
+    if args.save:
+        save_baseline(args.save, results)
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
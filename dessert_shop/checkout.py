@@ -0,0 +1,216 @@
+"""checkout.py
+
+Parallel checkout of many independent orders.
+
+Checking out an order means pricing its items, sorting it by cost
+(`Order.sort`), assigning its PayType and rendering its receipt. Orders do
+not share any state, so the work is spread over a `concurrent.futures`
+process pool:
+
+- `checkout_rows` takes the unparsed rows of each order (from
+  ``ingest.iter_order_rows``), so parsing, validation and pricing all
+  happen in the workers. This is what the bulk checkout uses.
+- `checkout_orders` takes Order objects. Items are pickled without their
+  cached prices, so they are priced again in the workers.
+
+Workers start with the pricing rules, tax table and rounding policy active
+in the calling process (`_init_worker`), so receipts match a serial run
+also with the "spawn" start method, where module globals are not
+inherited.
+
+Orders are sent to the workers in chunks to keep the pickling and IPC
+overhead per order low, and only a few chunks are in flight at a time so
+memory stays bounded for long streams. Results are yielded in the same
+order as the input, whatever order the workers finish in.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Tuple, TypeVar
+
+from dessert import Order
+from ingest import RowError, build_order, report_error
+from money import Rounding, get_rounding, set_rounding
+from payment import PayType
+from pricing import PricingRule, get_pricing_rules, set_pricing_rules
+from taxes import TaxTable, get_jurisdiction, get_tax_table, set_tax_table
+
+DEFAULT_CHUNKSIZE = 64
+
+OrderRows = List[Tuple[int, Optional[Mapping[str, str]]]]
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def checkout_order(order: Order, pay_type: Optional[PayType] = None) -> str:
+    """Sort an order, assign its payment type and return its receipt.
+
+    Parameters
+    ----------
+    order : Order
+        The order to check out (sorted in place)
+    pay_type : PayType, optional
+        Payment type to assign; None keeps the order's current one
+
+    Returns
+    -------
+    str
+        The rendered receipt
+    """
+    order.sort()
+    if pay_type is not None:
+        order.set_pay_type(pay_type)
+    return str(order)
+
+
+def _checkout_chunk(
+    chunk: List[Tuple[str, Order]], pay_type: Optional[PayType]
+) -> List[Tuple[str, str]]:
+    """Worker entry point: check out every order of a chunk."""
+    return [(order_id, checkout_order(order, pay_type)) for order_id, order in chunk]
+
+
+def _checkout_rows_chunk(
+    chunk: List[Tuple[str, OrderRows]], pay_type: Optional[PayType]
+) -> List[Tuple[str, Optional[str], List[RowError]]]:
+    """Worker entry point: build and check out every order of a chunk.
+
+    Returns (order_id, receipt, errors) per order; the receipt is None if
+    every row of the order was rejected.
+    """
+    results = []
+    for order_id, rows in chunk:
+        errors: List[RowError] = []
+        order = build_order(rows, errors.append)
+        receipt = None if order is None else checkout_order(order, pay_type)
+        results.append((order_id, receipt, errors))
+    return results
+
+
+def _init_worker(
+    rules: Tuple[PricingRule, ...],
+    table: TaxTable,
+    jurisdiction: str,
+    rounding: Rounding,
+) -> None:
+    """Pool initializer: install the calling process's pricing policies."""
+    set_pricing_rules(rules)
+    set_tax_table(table, jurisdiction)
+    set_rounding(rounding)
+
+
+def _chunks(items: Iterable[T], chunksize: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_chunks(
+    work: Callable[[List[T], Optional[PayType]], List[R]],
+    items: Iterable[T],
+    pay_type: Optional[PayType],
+    workers: Optional[int],
+    chunksize: int,
+) -> Iterator[R]:
+    """Run work over chunks of items in a process pool, yielding in order."""
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(items, chunksize):
+            yield from work(chunk, pay_type)
+        return
+
+    policies = (
+        get_pricing_rules().rules,
+        get_tax_table(),
+        get_jurisdiction(),
+        get_rounding(),
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=policies
+    ) as executor:
+        pending = deque()
+        for chunk in _chunks(items, chunksize):
+            pending.append(executor.submit(work, chunk, pay_type))
+            # keep every worker busy without queueing the whole input
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def checkout_orders(
+    orders: Iterable[Tuple[str, Order]],
+    pay_type: Optional[PayType] = None,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[Tuple[str, str]]:
+    """Check out (order_id, Order) pairs across a process pool.
+
+    Parameters
+    ----------
+    orders : Iterable[Tuple[str, Order]]
+        Orders to check out
+    pay_type : PayType, optional
+        Payment type assigned to every order; None keeps each order's own
+    workers : int, optional
+        Number of worker processes (default os.cpu_count()); 1 checks out
+        in the calling process without a pool
+    chunksize : int, optional
+        Number of orders sent to a worker at a time
+
+    Yields
+    ------
+    Tuple[str, str]
+        (order_id, receipt) in the same order as the input
+    """
+    return _map_chunks(_checkout_chunk, orders, pay_type, workers, chunksize)
+
+
+def checkout_rows(
+    groups: Iterable[Tuple[str, OrderRows]],
+    pay_type: Optional[PayType] = None,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    on_error: Callable[[RowError], None] = report_error,
+) -> Iterator[Tuple[str, str]]:
+    """Build and check out orders from their unparsed rows across a process pool.
+
+    Parameters
+    ----------
+    groups : Iterable[Tuple[str, OrderRows]]
+        (order_id, rows) pairs, e.g. from ``ingest.iter_order_rows``
+    pay_type : PayType, optional
+        Payment type assigned to every order; None keeps each order's own
+    workers : int, optional
+        Number of worker processes (default os.cpu_count()); 1 checks out
+        in the calling process without a pool
+    chunksize : int, optional
+        Number of orders sent to a worker at a time
+    on_error : Callable[[RowError], None], optional
+        Called in the calling process for every rejected row, in input
+        order (default prints to stderr)
+
+    Yields
+    ------
+    Tuple[str, str]
+        (order_id, receipt) in the same order as the input; orders whose
+        rows were all rejected are skipped
+    """
+    results = _map_chunks(_checkout_rows_chunk, groups, pay_type, workers, chunksize)
+    for order_id, receipt, errors in results:
+        for error in errors:
+            on_error(error)
+        if receipt is not None:
+            yield order_id, receipt
+
+
+__all__ = ["checkout_order", "checkout_orders", "checkout_rows", "DEFAULT_CHUNKSIZE"]
@@ -4,9 +4,27 @@ Protocol class for combining similar dessert items.
 
 This module defines a Protocol (interface) for items that can be combined
 if they meet certain criteria (e.g., same name and price).
+
+`Combinable` is the public contract. Because ``isinstance`` against a
+runtime_checkable Protocol inspects the object's attributes on every call,
+Order does not use it on its hot path: it asks `combine_spec` instead,
+which answers from a per-class registry with a single dict lookup. Classes
+declare their merge key with the `register_combinable` decorator, which
+is the only definition of that key; subclasses inherit it. Any other
+class is checked against the Protocol once and the answer cached; it may
+provide its merge key with a ``combine_key()`` method.
 """
 
-from typing import Protocol, runtime_checkable
+from operator import attrgetter
+from typing import (
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+    runtime_checkable,
+)
 
 
 @runtime_checkable
@@ -61,3 +79,81 @@ class Combinable(Protocol):
             If other is not the same type as self
         """
         ...
+
+
+class CombineSpec(NamedTuple):
+    """How the items of one combinable class are merged.
+
+    Attributes
+    ----------
+    key: Callable[[object], tuple], optional
+        Returns the merge key of an item: two items combine exactly when
+        their keys are equal. None when the class has no key, in which
+        case Order falls back to scanning with ``can_combine``.
+    key_attributes: Tuple[str, ...]
+        Attributes forming the key (empty when the key comes from an
+        unregistered class's ``combine_key()`` method)
+    """
+
+    key: Optional[Callable[[object], tuple]]
+    key_attributes: Tuple[str, ...]
+
+
+# class -> CombineSpec, or None for classes that are not combinable
+_registry: Dict[type, Optional[CombineSpec]] = {}
+
+
+def register_combinable(*key_attributes: str) -> Callable[[type], type]:
+    """Class decorator recording a combinable class and its merge key.
+
+    The key of an item is ``(cls, *attributes)``. Unregistered
+    subclasses of cls use the same key.
+
+    Parameters
+    ----------
+    *key_attributes : str
+        Attributes that must be equal for two items to combine
+
+    Raises
+    ------
+    TypeError
+        If the class does not implement the Combinable protocol
+    """
+    get_attributes = attrgetter(*key_attributes)
+
+    def register(cls: type) -> type:
+        if not issubclass(cls, Combinable):
+            raise TypeError(f"{cls.__name__} does not implement Combinable")
+        if len(key_attributes) == 1:
+            key = lambda item: (cls, get_attributes(item))  # noqa: E731
+        else:
+            key = lambda item: (cls, *get_attributes(item))  # noqa: E731
+        _registry[cls] = CombineSpec(key, key_attributes)
+        return cls
+
+    return register
+
+
+def combine_spec(cls: type) -> Optional[CombineSpec]:
+    """Return the CombineSpec of cls, or None if its items never combine.
+
+    Registered classes are answered from the registry; other classes are
+    checked against the Combinable protocol on first use and cached.
+    """
+    try:
+        return _registry[cls]
+    except KeyError:
+        pass
+    spec = None
+    if issubclass(cls, Combinable):
+        key_func = getattr(cls, "combine_key", None)
+        spec = CombineSpec(key_func, ())
+        if key_func is None:
+            # Merge like the nearest registered base class, if any
+            for base in cls.__mro__[1:]:
+                base_spec = _registry.get(base)
+                if base_spec is not None and base_spec.key_attributes:
+                    spec = base_spec
+                    break
+    _registry[cls] = spec
+    return spec
@@ -7,20 +7,51 @@ inherits from the Packaging Protocol. DessertItem implements comparison
 operators to enable sorting by cost. The Order class implements the Payable
 Protocol to track payment methods and includes a sort() method. Candy and
 Cookie classes implement the Combinable Protocol to allow combining like items.
-Order is iterable via __iter__() and __next__(). It has a `tax_percent`
-attribute and abstract `calculate_cost` method. Concrete subclasses implement
+Order is iterable via __iter__(). It has a `tax_percent`
+attribute and abstract `_cost_cents` method. Concrete subclasses implement
 cost calculation, set their packaging type, and inherit `calculate_tax` which
-computes tax from the cost and `tax_percent`.
+computes tax from the cost and `tax_percent`. Cost and tax are cached on
+each item and the cache is dropped whenever a public attribute changes.
+Dessert items use __slots__ instead of a per-instance __dict__, and
+`tax_percent` comes from the active tax table (taxes.py) for the item's
+`tax_category`, falling back to the class default, unless set on the item.
+
+Receipts are streamed: items and orders yield receipt rows from
+`receipt_rows()`, and `Order.line_items()` yields one structured
+(name, cost, tax) row per item; `__str__` and `to_list()` are built from
+those generators.
+
+Money is handled as integer cents (see money.py): costs and taxes are
+rounded once, with the configured rounding policy, and every total is an
+exact sum of cents. Volume discounts from the active pricing rules
+(pricing.py) are applied to each item's list price.
+
+The hot paths (adding, combining, pricing, tax, sorting and receipts) are
+registered as instrumentation hook points; see instrument.py.
+
+`ConcurrentOrder` is an Order that several threads (e.g. point-of-sale
+terminals sharing a catering order) can add to at the same time.
 """
 
 from __future__ import annotations
 
+import heapq
 from abc import ABC, abstractmethod
-from typing import List
-from decimal import Decimal, ROUND_HALF_UP
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from money import Cents, format_cents, percent_of, to_basis_points, to_cents
 from packaging import Packaging
+from pricing import price_function
+from taxes import DEFAULT_TAX_PERCENT, tax_basis_points
 from payment import PayType, Payable
-from combine import Combinable
+from combine import combine_spec, register_combinable
+from instrument import hook_point
+
+if TYPE_CHECKING:
+    import threading
+
+
+# Slots left out of copies and pickles: the owning order and cached prices
+_UNCOPIED_SLOTS = ("_cost", "_tax", "_order", "_line_totals")
 
 
 class DessertItem(ABC, Packaging):
@@ -31,71 +62,211 @@ class DessertItem(ABC, Packaging):
     name: str
         Name of the dessert item (default empty string)
     tax_percent: float
-        Sales tax percent to apply to the item (default 7.25)
+        Sales tax percent to apply to the item (default the active tax
+        table's rate for ``tax_category``, else ``default_tax_percent``)
     packaging: str
         Type of packaging for the item (default None)
+
+    Subclasses implement ``_cost_cents``; ``cost_cents`` and ``tax_cents``
+    cache the item's cost and tax in cents until a public attribute (a
+    pricing field, the name, ``tax_percent``...) is assigned again.
+
+    Items are slotted: every subclass lists its own fields in __slots__.
+
+    An item belongs to at most one Order at a time. Copies and pickles of
+    an item do not belong to any order, and are priced again on first use
+    under the policies active then (e.g. in a checkout worker process).
     """
 
-    tax_percent: float = 7.25
+    __slots__ = ("name", "packaging", "_tax_percent", "_cost", "_tax", "_order", "_line_totals")
+
+    default_tax_percent: float = DEFAULT_TAX_PERCENT
+    # category looked up in the active tax table (see taxes.py)
+    tax_category: str = "dessert"
 
     def __init__(self, name: str = "") -> None:
+        # cached results of cost_cents / tax_cents, see __setattr__
+        self._cost: Optional[Cents] = None
+        self._tax: Optional[Cents] = None
+        # None means "use the tax table", so nothing is copied per item
+        self._tax_percent: Optional[float] = None
+        # Order holding this item, told about price changes (see _invalidate),
+        # and the (cost, tax) in cents it added to that order's totals
+        self._order: Optional[Order] = None
+        self._line_totals: Optional[Tuple[Cents, Cents]] = None
         self.name: str = name
-        # instance-level copy so tests/instances can override if needed
-        self.tax_percent = float(self.tax_percent)
         self.packaging: str = None
 
+    @property
+    def tax_percent(self) -> float:
+        """Sales tax percent for this item."""
+        percent = self._tax_percent
+        if percent is not None:
+            return percent
+        basis_points = tax_basis_points(self.tax_category)
+        if basis_points is None:
+            return self.default_tax_percent
+        return basis_points / 100
+
+    @tax_percent.setter
+    def tax_percent(self, value: float) -> None:
+        self._tax_percent = float(value)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Set an attribute, dropping cached cost and tax for public fields."""
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._invalidate()
+
+    def __getstate__(self) -> tuple:
+        """Return the state to copy or pickle, without the owning Order or prices."""
+        attributes, slots = super().__getstate__()
+        slots = {name: value for name, value in slots.items() if name not in _UNCOPIED_SLOTS}
+        return attributes, slots
+
+    def __setstate__(self, state: tuple) -> None:
+        """Restore a copied or pickled item without triggering cache invalidation.
+
+        The copy does not belong to any order; Order re-links the items it
+        restores.
+        """
+        attributes, slots = state
+        if attributes:
+            self.__dict__.update(attributes)
+        for name, value in (slots or {}).items():
+            object.__setattr__(self, name, value)
+        for name in _UNCOPIED_SLOTS:
+            object.__setattr__(self, name, None)
+
+    def _invalidate(self) -> None:
+        """Drop the cached cost and tax and let the owning Order re-total."""
+        object.__setattr__(self, "_cost", None)
+        object.__setattr__(self, "_tax", None)
+        order = self._order
+        if order is not None:
+            order._item_repriced(self)
+
     @abstractmethod
+    def _cost_cents(self) -> Cents:
+        """Return the uncached cost in cents. Implemented by subclasses."""
+
+    def pricing_quantity(self) -> float:
+        """Return the quantity pricing rules compare against (default 1)."""
+        return 1.0
+
+    def cost_cents(self) -> Cents:
+        """Return the cost in cents for this item, computed once and cached.
+
+        The list price from ``_cost_cents`` is passed through the active
+        pricing rules (see pricing.py) for this item's product, if any.
+        """
+        cost = self._cost
+        if cost is None:
+            cost = self._cost_cents()
+            price = price_function(type(self).__name__)
+            if price is not None:
+                cost = price(self.pricing_quantity(), cost)
+            self._cost = cost
+        return cost
+
+    def tax_cents(self) -> Cents:
+        """Return the tax in cents for this item, computed once and cached."""
+        tax = self._tax
+        if tax is None:
+            tax = self._tax = percent_of(self.cost_cents(), self._tax_basis_points())
+        return tax
+
+    def _tax_basis_points(self) -> int:
+        """Return the tax rate in basis points, without a float round trip."""
+        percent = self._tax_percent
+        if percent is None:
+            basis_points = tax_basis_points(self.tax_category)
+            if basis_points is not None:
+                return basis_points
+            percent = self.default_tax_percent
+        return to_basis_points(percent)
+
     def calculate_cost(self) -> float:
-        """Return the cost (dollars) for this item. Implemented by subclasses."""
+        """Return the cost (dollars) for this item."""
+        return self.cost_cents() / 100
 
     def calculate_tax(self) -> float:
-        """Return the tax for this item (rounded to 2 decimals)."""
-        # use Decimal with ROUND_HALF_UP to match expected monetary rounding
-        cost_decimal = Decimal(str(self.calculate_cost()))
-        tax_decimal = cost_decimal * (Decimal(str(self.tax_percent)) / Decimal("100"))
-        tax_rounded = tax_decimal.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        return float(tax_rounded)
+        """Return the tax (dollars) for this item."""
+        return self.tax_cents() / 100
+
+    @abstractmethod
+    def receipt_title(self) -> str:
+        """Return the first receipt line, e.g. "Candy Corn (Bag)"."""
+
+    @abstractmethod
+    def receipt_details(self) -> List[str]:
+        """Return the detail lines shown under the title on the receipt."""
+
+    def receipt_rows(self) -> Iterator[List[str]]:
+        """Yield this item's receipt rows; the last row holds cost and tax.
+
+        Yields
+        ------
+        List[str]
+            One receipt row, split into its columns
+        """
+        yield [self.receipt_title()]
+        *details, last = self.receipt_details()
+        for detail in details:
+            yield [f"-    {detail}"]
+        yield [
+            f"-    {last}:",
+            f"${format_cents(self.cost_cents())}",
+            f"[Tax: ${format_cents(self.tax_cents())}]",
+        ]
+
+    def __str__(self) -> str:
+        return "\n".join(", ".join(row) for row in self.receipt_rows())
 
     def __eq__(self, other: object) -> bool:
         """Check if two dessert items have equal cost."""
         if not isinstance(other, DessertItem):
             return NotImplemented
-        return self.calculate_cost() == other.calculate_cost()
+        return self.cost_cents() == other.cost_cents()
 
     def __ne__(self, other: object) -> bool:
         """Check if two dessert items have different cost."""
         if not isinstance(other, DessertItem):
             return NotImplemented
-        return self.calculate_cost() != other.calculate_cost()
+        return self.cost_cents() != other.cost_cents()
 
     def __lt__(self, other: object) -> bool:
         """Check if this item costs less than another."""
         if not isinstance(other, DessertItem):
             return NotImplemented
-        return self.calculate_cost() < other.calculate_cost()
+        return self.cost_cents() < other.cost_cents()
 
     def __le__(self, other: object) -> bool:
         """Check if this item costs less than or equal to another."""
         if not isinstance(other, DessertItem):
             return NotImplemented
-        return self.calculate_cost() <= other.calculate_cost()
+        return self.cost_cents() <= other.cost_cents()
 
     def __gt__(self, other: object) -> bool:
         """Check if this item costs more than another."""
         if not isinstance(other, DessertItem):
             return NotImplemented
-        return self.calculate_cost() > other.calculate_cost()
+        return self.cost_cents() > other.cost_cents()
 
     def __ge__(self, other: object) -> bool:
         """Check if this item costs more than or equal to another."""
         if not isinstance(other, DessertItem):
             return NotImplemented
-        return self.calculate_cost() >= other.calculate_cost()
+        return self.cost_cents() >= other.cost_cents()
 
 
+@register_combinable("name", "price_per_pound")
 class Candy(DessertItem):
     """Candy sold by the pound."""
 
+    __slots__ = ("candy_weight", "price_per_pound")
+    tax_category = "candy"
+
     def __init__(
         self, name: str = "", candy_weight: float = 0.0, price_per_pound: float = 0.0
     ) -> None:
@@ -104,13 +275,18 @@ class Candy(DessertItem):
         self.price_per_pound: float = float(price_per_pound)
         self.packaging = "Bag"
 
-    def calculate_cost(self) -> float:
-        return round(self.candy_weight * self.price_per_pound, 2)
+    def _cost_cents(self) -> Cents:
+        return to_cents(self.candy_weight * self.price_per_pound)
 
-    def __str__(self) -> str:
-        cost = self.calculate_cost()
-        tax = self.calculate_tax()
-        return f"{self.name} ({self.packaging})\n-    {self.candy_weight} lbs. @ ${self.price_per_pound:.2f}/lb:, ${cost:.2f}, [Tax: ${tax:.2f}]"
+    def pricing_quantity(self) -> float:
+        """Return the weight in pounds."""
+        return self.candy_weight
+
+    def receipt_title(self) -> str:
+        return f"{self.name} ({self.packaging})"
+
+    def receipt_details(self) -> List[str]:
+        return [f"{self.candy_weight} lbs. @ ${self.price_per_pound:.2f}/lb"]
 
     def can_combine(self, other: "Candy") -> bool:
         """Check if this candy can be combined with another candy.
@@ -155,9 +331,13 @@ class Candy(DessertItem):
         return self
 
 
+@register_combinable("name", "price_per_dozen")
 class Cookie(DessertItem):
     """Cookie sold by the dozen."""
 
+    __slots__ = ("cookie_quantity", "price_per_dozen")
+    tax_category = "bakery"
+
     def __init__(
         self, name: str = "", cookie_quantity: int = 0, price_per_dozen: float = 0.0
     ) -> None:
@@ -166,14 +346,18 @@ class Cookie(DessertItem):
         self.price_per_dozen: float = float(price_per_dozen)
         self.packaging = "Box"
 
-    def calculate_cost(self) -> float:
-        dozens = float(self.cookie_quantity) / 12.0
-        return round(dozens * self.price_per_dozen, 2)
+    def _cost_cents(self) -> Cents:
+        return to_cents(self.cookie_quantity / 12 * self.price_per_dozen)
 
-    def __str__(self) -> str:
-        cost = self.calculate_cost()
-        tax = self.calculate_tax()
-        return f"{self.name} Cookies ({self.packaging})\n-    {self.cookie_quantity} cookies. @ ${self.price_per_dozen:.2f}/dozen:, ${cost:.2f}, [Tax: ${tax:.2f}]"
+    def pricing_quantity(self) -> float:
+        """Return the number of cookies."""
+        return self.cookie_quantity
+
+    def receipt_title(self) -> str:
+        return f"{self.name} Cookies ({self.packaging})"
+
+    def receipt_details(self) -> List[str]:
+        return [f"{self.cookie_quantity} cookies. @ ${self.price_per_dozen:.2f}/dozen"]
 
     def can_combine(self, other: "Cookie") -> bool:
         """Check if this cookie can be combined with another cookie.
@@ -221,6 +405,9 @@ class Cookie(DessertItem):
 class IceCream(DessertItem):
     """Ice cream sold by the scoop."""
 
+    __slots__ = ("scoop_count", "price_per_scoop")
+    tax_category = "ice_cream"
+
     def __init__(
         self, name: str = "", scoop_count: int = 0, price_per_scoop: float = 0.0
     ) -> None:
@@ -229,18 +416,25 @@ class IceCream(DessertItem):
         self.price_per_scoop: float = float(price_per_scoop)
         self.packaging = "Bowl"
 
-    def calculate_cost(self) -> float:
-        return round(self.scoop_count * self.price_per_scoop, 2)
+    def _cost_cents(self) -> Cents:
+        return to_cents(self.scoop_count * self.price_per_scoop)
 
-    def __str__(self) -> str:
-        cost = self.calculate_cost()
-        tax = self.calculate_tax()
-        return f"{self.name} Ice Cream ({self.packaging})\n-    {self.scoop_count} scoops. @ ${self.price_per_scoop:.2f}/scoop:, ${cost:.2f}, [Tax: ${tax:.2f}]"
+    def pricing_quantity(self) -> float:
+        """Return the number of scoops."""
+        return self.scoop_count
+
+    def receipt_title(self) -> str:
+        return f"{self.name} Ice Cream ({self.packaging})"
+
+    def receipt_details(self) -> List[str]:
+        return [f"{self.scoop_count} scoops. @ ${self.price_per_scoop:.2f}/scoop"]
 
 
 class Sundae(IceCream):
     """Sundae: ice cream with a topping."""
 
+    __slots__ = ("topping_name", "topping_price")
+
     def __init__(
         self,
         name: str = "",
@@ -254,28 +448,66 @@ class Sundae(IceCream):
         self.topping_price: float = float(topping_price)
         self.packaging = "Boat"
 
-    def calculate_cost(self) -> float:
-        ice_cost = super().calculate_cost()
-        return round(ice_cost + self.topping_price, 2)
+    def _cost_cents(self) -> Cents:
+        ice_cost = super()._cost_cents()
+        return Cents(ice_cost + to_cents(self.topping_price))
 
-    def __str__(self) -> str:
-        cost = self.calculate_cost()
-        tax = self.calculate_tax()
-        return f"{self.topping_name} {self.name} Sundae ({self.packaging})\n-    {self.scoop_count} scoops. @ ${self.price_per_scoop:.2f}/scoop\n-    {self.topping_name} topping @ ${self.topping_price:.2f}:, ${cost:.2f}, [Tax: ${tax:.2f}]"
+    def receipt_title(self) -> str:
+        return f"{self.topping_name} {self.name} Sundae ({self.packaging})"
+
+    def receipt_details(self) -> List[str]:
+        return super().receipt_details() + [
+            f"{self.topping_name} topping @ ${self.topping_price:.2f}"
+        ]
+
+
+class LineItem(NamedTuple):
+    """Structured receipt row for one item of an order.
+
+    Attributes
+    ----------
+    name: str
+        Receipt title of the item, e.g. "Candy Corn (Bag)"
+    cost: Cents
+        Cost of the item in cents
+    tax: Cents
+        Tax on the item in cents
+    """
+
+    name: str
+    cost: Cents
+    tax: Cents
 
 
 class Order(Payable):
     """Order container for DessertItem instances.
 
     Implements Payable interface for payment method tracking.
-    Implements iterator protocol via __iter__() and __next__().
+    Iterable: __iter__() returns an independent iterator over the items.
     Combines like items if they implement Combinable protocol.
+
+    Whether an item combines, and its merge key, come from the registry in
+    combine.py (one dict lookup per item instead of a Protocol
+    ``isinstance`` check). Items with a merge key are tracked in a
+    combine index so that finding the item to merge into is a dict lookup
+    instead of a scan over the whole order.
+
+    The subtotal and tax are running totals in cents, updated when an item
+    is added, merged, edited or removed, so ``order_cost()`` and
+    ``order_tax()`` are O(1). Items must be added and removed through
+    ``add()``/``remove()`` rather than by editing the ``order`` list.
     """
 
     def __init__(self) -> None:
         self.order: List[DessertItem] = []
         self._pay_type: PayType = PayType.CASH
-        self._current_index: int = 0
+        # combine key -> first item in the order with that key
+        self._combine_index: Dict[tuple, DessertItem] = {}
+        # Combinable items without a merge key force the linear scan
+        self._unkeyed_combinables: int = 0
+        # running totals in cents over every item in the order
+        self._subtotal: int = 0
+        self._tax_total: int = 0
 
     def add(self, item: DessertItem) -> None:
         """Add an item to the order, combining with existing items if possible.
@@ -289,58 +521,189 @@ class Order(Payable):
         item : DessertItem
             The item to add to the order
         """
-        # Check if item is Combinable
-        if isinstance(item, Combinable):
-            # Try to find an existing item to combine with
-            for existing_item in self.order:
-                if isinstance(existing_item, Combinable) and existing_item.can_combine(
-                    item
-                ):
-                    # Combine the new item into the existing one
-                    existing_item.combine(item)
-                    return
-
-        # If not combinable or no match found, add as new item
+        spec = combine_spec(type(item))
+        if spec is None:
+            self._append(item)
+            return
+
+        if spec.key is None or self._unkeyed_combinables:
+            # Fall back to the first-match scan for items we cannot index
+            if self._combine_scan(item):
+                return
+            self._append_combinable(item)
+            return
+
+        key = spec.key(item)
+        existing_item = self._combine_index.get(key)
+        if existing_item is not None and not existing_item.can_combine(item):
+            # A private field of an indexed item was edited without going
+            # through _item_repriced(); rebuild and retry
+            self._rebuild_combine_index()
+            existing_item = self._combine_index.get(key)
+        if existing_item is not None:
+            existing_item.combine(item)
+            return
+
+        self._combine_index[key] = self._append(item)
+
+    def _append(self, item: DessertItem) -> DessertItem:
+        """Append a new line and add it to the running totals.
+
+        An item that already belongs to an order (this one or another) is
+        copied first, so each line has its own item and its own share of
+        the totals.
+
+        Returns
+        -------
+        DessertItem
+            The item appended: item itself, or its copy
+        """
+        if item._order is not None:
+            # imported here so orders that never share items do not pay for it
+            import copy
+
+            item = copy.copy(item)
+        cost, tax = item.cost_cents(), item.tax_cents()
+        # set before _order, so a concurrent edit never sees an owner
+        # without the totals it added
+        item._line_totals = cost, tax
+        item._order = self
         self.order.append(item)
+        self._subtotal += cost
+        self._tax_total += tax
+        return item
 
-    def __iter__(self):
-        """Return an iterator for the order.
+    def _item_repriced(self, item: DessertItem) -> None:
+        """Update the running totals after an item's price changed.
+
+        Called by DessertItem when a field of an item in this order is
+        assigned, which includes merges done by ``combine()``. The order
+        subtracts what the item added last time, recorded by the order
+        itself, so the item's cache is never trusted for the old values.
+        If the edit changed the item's combine key, the combine index is
+        rebuilt so later adds merge into the same item the baseline scan
+        would pick.
+        """
+        old_cost, old_tax = item._line_totals
+        cost, tax = item.cost_cents(), item.tax_cents()
+        item._line_totals = cost, tax
+        self._subtotal += cost - old_cost
+        self._tax_total += tax - old_tax
+        spec = combine_spec(type(item))
+        if spec is not None and spec.key is not None:
+            # An item is indexed under its key unless its key changed (or an
+            # earlier edit already made it a duplicate of another line)
+            if self._combine_index.get(spec.key(item)) is not item:
+                self._rebuild_combine_index()
+
+    def remove(self, item: DessertItem) -> None:
+        """Remove an item (the object itself, not an equal-cost one).
+
+        Parameters
+        ----------
+        item : DessertItem
+            The item to remove
+
+        Raises
+        ------
+        ValueError
+            If item is not in the order
+        """
+        for index, existing_item in enumerate(self.order):
+            if existing_item is item:
+                break
+        else:
+            raise ValueError("Item is not in the order")
+        del self.order[index]
+        cost, tax = item._line_totals
+        item._order = None
+        item._line_totals = None
+        self._subtotal -= cost
+        self._tax_total -= tax
+        self._rebuild_combine_index()
+
+    def _combine_scan(self, item: DessertItem) -> bool:
+        """Merge item into the first existing item it can combine with.
 
         Returns
         -------
-        Order
-            Self, as Order implements the iterator protocol
+        bool
+            True if item was merged, False if no existing item matched
         """
-        self._current_index = 0
-        return self
+        for existing_item in self.order:
+            if combine_spec(type(existing_item)) is not None and (
+                existing_item.can_combine(item)
+            ):
+                existing_item.combine(item)
+                return True
+        return False
+
+    def _append_combinable(self, item: DessertItem) -> None:
+        """Append a Combinable item and record it in the combine index."""
+        item = self._append(item)
+        key = combine_spec(type(item)).key
+        if key is None:
+            self._unkeyed_combinables += 1
+        else:
+            self._combine_index.setdefault(key(item), item)
+
+    def _rebuild_combine_index(self) -> None:
+        """Recompute the combine index from the items currently in the order."""
+        self._combine_index = {}
+        self._unkeyed_combinables = 0
+        for existing_item in self.order:
+            spec = combine_spec(type(existing_item))
+            if spec is None:
+                continue
+            if spec.key is None:
+                self._unkeyed_combinables += 1
+            else:
+                self._combine_index.setdefault(spec.key(existing_item), existing_item)
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a copied or pickled order and re-link its items.
+
+        Items still owned by another order (those of a shallow copy) are
+        copied, so the two orders never share an item.
+        """
+        self.__dict__.update(state)
+        items = self.order
+        self.order = []
+        self._subtotal = 0
+        self._tax_total = 0
+        for item in items:
+            self._append(item)
+        self._rebuild_combine_index()
+
+    def __iter__(self) -> Iterator[DessertItem]:
+        """Return a new iterator over the items in the order.
 
-    def __next__(self) -> DessertItem:
-        """Return the next item in the order.
+        Each call returns an independent iterator over the underlying list,
+        so nested loops and concurrent readers do not interfere.
 
         Returns
         -------
-        DessertItem
-            The next item in the order
-
-        Raises
-        ------
-        StopIteration
-            When there are no more items
+        Iterator[DessertItem]
+            Iterator over the items, in order
         """
-        if self._current_index >= len(self.order):
-            raise StopIteration
-        item = self.order[self._current_index]
-        self._current_index += 1
-        return item
+        return iter(self.order)
 
     def __len__(self) -> int:
         return len(self.order)
 
+    def order_cost_cents(self) -> Cents:
+        """Return the order subtotal in cents (a running total)."""
+        return Cents(self._subtotal)
+
+    def order_tax_cents(self) -> Cents:
+        """Return the order tax in cents (a running total)."""
+        return Cents(self._tax_total)
+
     def order_cost(self) -> float:
-        return round(sum(item.calculate_cost() for item in self.order), 2)
+        return self.order_cost_cents() / 100
 
     def order_tax(self) -> float:
-        return round(sum(item.calculate_tax() for item in self.order), 2)
+        return self.order_tax_cents() / 100
 
     def get_pay_type(self) -> PayType:
         """Return the payment type for this order.
@@ -376,43 +739,267 @@ class Order(Payable):
             raise ValueError(f"Invalid payment type: {payment_method}")
         self._pay_type = payment_method
 
-    def sort(self) -> None:
-        """Sort the order items by cost in ascending order."""
-        self.order.sort()
+    def sort(self, reverse: bool = False) -> None:
+        """Sort the order items by cost in ascending order.
 
-    def __str__(self) -> str:
-        """Return string representation of the order with header and items."""
-        lines = []
-        lines.append("Name, Cost, Tax")
-        lines.append("----------, ----------, ----------")
+        Sorts on each item's cached cost in cents, which orders items the
+        same way as the DessertItem comparison operators. The sort is
+        stable: items of equal cost keep their relative order.
+
+        Parameters
+        ----------
+        reverse : bool, optional
+            Sort in descending order instead (default False)
+        """
+        self.order.sort(key=DessertItem.cost_cents, reverse=reverse)
+
+    def top_k(self, k: int, reverse: bool = False) -> List[DessertItem]:
+        """Return the k cheapest items, or the k most expensive with reverse.
+
+        Uses heap selection, O(n log k), without reordering the order. The
+        result equals ``sorted(order, reverse=reverse)[:k]``, including the
+        relative order of items with equal cost.
 
-        # Use banker's rounding for display (consistent with Part 5)
+        Parameters
+        ----------
+        k : int
+            Number of items to return
+        reverse : bool, optional
+            Select the most expensive items instead (default False)
+
+        Returns
+        -------
+        List[DessertItem]
+            Up to k items, in the same order ``sort(reverse)`` would give
+        """
+        if reverse:
+            return heapq.nlargest(k, self.order, key=DessertItem.cost_cents)
+        return heapq.nsmallest(k, self.order, key=DessertItem.cost_cents)
+
+    def line_items(self) -> Iterator[LineItem]:
+        """Yield one structured (name, cost, tax) row per item in the order.
+
+        Yields
+        ------
+        LineItem
+            The item's receipt title with its cost and tax in cents
+        """
         for item in self.order:
-            lines.append(str(item))
+            yield LineItem(item.receipt_title(), item.cost_cents(), item.tax_cents())
 
-        lines.append("----------, ----------, ----------")
-        lines.append(f"Total number of items in order:, {len(self.order)}")
+    def receipt_rows(self) -> Iterator[List[str]]:
+        """Yield the receipt one row at a time, straight from the items.
 
-        subtotal = self.order_cost()
-        # Use banker's rounding for display tax
-        display_tax = sum(
-            round(item.calculate_cost() * (item.tax_percent / 100.0), 2)
-            for item in self.order
-        )
-        total = round(subtotal + display_tax, 2)
+        Rows are lists of column strings, ready for ``tabulate`` or a CSV
+        writer; nothing is rendered to an intermediate string.
 
-        lines.append(f"Order Subtotals:, ${subtotal:.2f}, [Tax: ${display_tax:.2f}]")
-        lines.append(f"Order Total:, , ${total:.2f}")
-        lines.append("--------------------")
-        lines.append(f"Paid with {self.get_pay_type().value}")
+        Yields
+        ------
+        List[str]
+            One receipt row, split into its columns
+        """
+        yield ["Name", "Cost", "Tax"]
+        yield ["----------", "----------", "----------"]
+
+        for item in self.order:
+            yield from item.receipt_rows()
+
+        yield ["----------", "----------", "----------"]
+        yield ["Total number of items in order:", str(len(self.order))]
+
+        # the tax line is the sum of the item tax lines, so they always agree
+        subtotal = self.order_cost_cents()
+        tax = self.order_tax_cents()
+        total = subtotal + tax
 
-        return "\n".join(lines)
+        yield ["Order Subtotals:", f"${format_cents(subtotal)}", f"[Tax: ${format_cents(tax)}]"]
+        yield ["Order Total:", "", f"${format_cents(total)}"]
+        yield ["--------------------"]
+        yield [f"Paid with {self.get_pay_type().value}"]
+
+    def __str__(self) -> str:
+        """Return string representation of the order with header and items."""
+        return "\n".join(", ".join(row) for row in self.receipt_rows())
 
     def to_list(self) -> List[List[str]]:
-        """Convert the string representation of the order to a 2D list."""
-        order_str = str(self)
-        lines = order_str.split("\n")
-        return [line.split(", ") for line in lines]
+        """Return the receipt as a 2D list of rows and columns."""
+        return list(self.receipt_rows())
+
 
+class ConcurrentOrder(Order):
+    """Order that can be added to from several threads at once.
 
-__all__ = ["DessertItem", "Candy", "Cookie", "IceCream", "Sundae", "Order"]
+    Adds of combinable items are serialized per combine key with a set of
+    striped locks, so terminals adding different products do not wait for
+    each other and two merges into the same item can never lose weight or
+    quantity. A short order-wide lock guards the item list, the combine
+    index and the running totals.
+
+    Lock order is always stripe(s) first, then the order lock. Rare
+    operations (``remove()``, items without a merge key) take every
+    stripe and run the plain Order code.
+
+    Only ``add()``, ``remove()``, ``sort()`` and ``top_k()`` are
+    synchronized; items already in the order must not be edited directly
+    while other threads are adding to it.
+    """
+
+    DEFAULT_STRIPES = 16
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES) -> None:
+        """Create an empty order.
+
+        Parameters
+        ----------
+        stripes : int, optional
+            Number of combine-key locks (default DEFAULT_STRIPES)
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        super().__init__()
+        self._init_locks(stripes)
+
+    def _init_locks(self, stripes: int) -> None:
+        # imported here so the single-terminal CLI does not pay for it
+        import threading
+
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        # reentrant: combine() re-enters through _item_repriced()
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        """Pickle the order without its locks."""
+        state = self.__dict__.copy()
+        state["_stripes"] = len(self._stripes)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled order with fresh locks."""
+        stripes = state.pop("_stripes")
+        self._init_locks(stripes)
+        super().__setstate__(state)
+
+    def add(self, item: DessertItem) -> None:
+        """Add an item to the order, combining with existing items if possible.
+
+        Safe to call from several threads at once; see the class docstring.
+
+        Parameters
+        ----------
+        item : DessertItem
+            The item to add to the order
+        """
+        spec = combine_spec(type(item))
+        if spec is None:
+            with self._lock:
+                self._append(item)
+            return
+
+        if spec.key is None or self._unkeyed_combinables:
+            self._add_exclusive(item)
+            return
+
+        key = spec.key(item)
+        with self._stripes[hash(key) % len(self._stripes)]:
+            # every add for this key holds this stripe, so the lookup, the
+            # merge and the append below cannot interleave with another one
+            existing_item = self._combine_index.get(key)
+            if existing_item is None:
+                with self._lock:
+                    self._combine_index[key] = self._append(item)
+                return
+            if existing_item.can_combine(item):
+                existing_item.combine(item)
+                return
+        # an indexed item was edited after it was added
+        self._add_exclusive(item)
+
+    def _add_exclusive(self, item: DessertItem) -> None:
+        """Add an item with every lock held, using the plain Order logic."""
+        with self._all_locks():
+            super().add(item)
+
+    def _all_locks(self) -> "_AllLocks":
+        return _AllLocks(self._stripes, self._lock)
+
+    def _append(self, item: DessertItem) -> DessertItem:
+        with self._lock:
+            return super()._append(item)
+
+    def _item_repriced(self, item: DessertItem) -> None:
+        with self._lock:
+            super()._item_repriced(item)
+
+    def remove(self, item: DessertItem) -> None:
+        """Remove an item (the object itself, not an equal-cost one).
+
+        Raises
+        ------
+        ValueError
+            If item is not in the order
+        """
+        with self._all_locks():
+            super().remove(item)
+
+    def sort(self, reverse: bool = False) -> None:
+        """Sort the order items by cost; see :meth:`Order.sort`."""
+        with self._all_locks():
+            super().sort(reverse)
+
+    def top_k(self, k: int, reverse: bool = False) -> List[DessertItem]:
+        """Return the k cheapest (or most expensive) items; see :meth:`Order.top_k`."""
+        with self._all_locks():
+            return super().top_k(k, reverse)
+
+
+class _AllLocks:
+    """Context manager holding every stripe, in order, then the order lock."""
+
+    __slots__ = ("_stripes", "_lock")
+
+    def __init__(self, stripes: List[threading.Lock], lock: threading.RLock) -> None:
+        self._stripes = stripes
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        for stripe in self._stripes:
+            stripe.acquire()
+        self._lock.acquire()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._lock.release()
+        for stripe in reversed(self._stripes):
+            stripe.release()
+
+
+# Hook points timed while instrumentation is enabled (see instrument.py)
+for _cls, _attribute in [
+    (DessertItem, "cost_cents"),
+    (DessertItem, "tax_cents"),
+    (DessertItem, "calculate_cost"),
+    (DessertItem, "calculate_tax"),
+    (Candy, "combine"),
+    (Cookie, "combine"),
+    (Order, "add"),
+    (Order, "sort"),
+    (Order, "__str__"),
+    (Order, "to_list"),
+    (Order, "receipt_rows"),
+    (Order, "line_items"),
+    (ConcurrentOrder, "add"),
+]:
+    hook_point(_cls, _attribute)
+del _cls, _attribute
+
+
+__all__ = [
+    "DessertItem",
+    "Candy",
+    "Cookie",
+    "IceCream",
+    "Sundae",
+    "LineItem",
+    "Order",
+    "ConcurrentOrder",
+]
@@ -1,137 +1,102 @@
 """Application driver for the Dessert Shop.
 
 Part 9: Adding sorting functionality to order items by cost.
+
+Run without arguments for the interactive shop, or pass an orders file to
+check out every order in it in parallel:
+
+    python dessertshop.py orders.csv --workers 4
+
+The kiosk starts the CLI once per transaction, so only what the prompts
+need is imported up front; tabulate, argparse and the bulk checkout
+modules are imported when they are first used (see bench_startup.py).
 """
 
 from __future__ import annotations
 
-from tabulate import tabulate
+import sys
+from typing import Callable, List, Optional, TypeVar
 
 try:
     from dessert_shop.dessert import Candy, Cookie, IceCream, Sundae, Order
     from dessert_shop.payment import PayType
+    from dessert_shop.validation import parse_non_negative_float, parse_non_negative_int
 except Exception:  # pragma: no cover - allow running as script from package dir
     from dessert import Candy, Cookie, IceCream, Sundae, Order
     from payment import PayType
+    from validation import parse_non_negative_float, parse_non_negative_int
+
+T = TypeVar("T")
 
 
 class DessertShop:
     """Dessert shop with methods to prompt user for dessert items."""
 
-    def user_prompt_candy(self) -> Candy:
-        """Prompt user for candy details, validate, and return a Candy object."""
-        name = input("Enter name of candy: ")
-
-        while True:
-            try:
-                weight = float(input("Enter weight (lbs): "))
-                if weight < 0:
-                    print("Weight cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-
+    @staticmethod
+    def _prompt_value(prompt: str, parse: Callable[[str, str], T], label: str) -> T:
+        """Prompt until the input passes parse, printing its error otherwise.
+
+        Parameters
+        ----------
+        prompt : str
+            Text shown to the user
+        parse : Callable[[str, str], T]
+            Validation function from validation.py
+        label : str
+            Name of the value used in error messages
+        """
         while True:
             try:
-                price = float(input("Enter price per pound: "))
-                if price < 0:
-                    print("Price cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+                return parse(input(prompt), label)
+            except ValueError as error:
+                print(error)
 
+    def user_prompt_candy(self) -> Candy:
+        """Prompt user for candy details, validate, and return a Candy object."""
+        name = input("Enter name of candy: ")
+        weight = self._prompt_value(
+            "Enter weight (lbs): ", parse_non_negative_float, "Weight"
+        )
+        price = self._prompt_value(
+            "Enter price per pound: ", parse_non_negative_float, "Price"
+        )
         return Candy(name, weight, price)
 
     def user_prompt_cookie(self) -> Cookie:
         """Prompt user for cookie details, validate, and return a Cookie object."""
         name = input("Enter name of cookie: ")
-
-        while True:
-            try:
-                quantity = int(input("Enter quantity (cookies): "))
-                if quantity < 0:
-                    print("Quantity cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter an integer.")
-
-        while True:
-            try:
-                price = float(input("Enter price per dozen: "))
-                if price < 0:
-                    print("Price cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-
+        quantity = self._prompt_value(
+            "Enter quantity (cookies): ", parse_non_negative_int, "Quantity"
+        )
+        price = self._prompt_value(
+            "Enter price per dozen: ", parse_non_negative_float, "Price"
+        )
         return Cookie(name, quantity, price)
 
     def user_prompt_icecream(self) -> IceCream:
         """Prompt user for ice cream details, validate, and return an IceCream object."""
         name = input("Enter the type of ice cream: ")
-
-        while True:
-            try:
-                scoops = int(input("Enter the number of scoops: "))
-                if scoops < 0:
-                    print("Number of scoops cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter an integer.")
-
-        while True:
-            try:
-                price = float(input("Enter the price per scoop: "))
-                if price < 0:
-                    print("Price cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-
+        scoops = self._prompt_value(
+            "Enter the number of scoops: ", parse_non_negative_int, "Number of scoops"
+        )
+        price = self._prompt_value(
+            "Enter the price per scoop: ", parse_non_negative_float, "Price"
+        )
         return IceCream(name, scoops, price)
 
     def user_prompt_sundae(self) -> Sundae:
         """Prompt user for sundae details, validate, and return a Sundae object."""
         name = input("Enter the type of ice cream: ")
-
-        while True:
-            try:
-                scoops = int(input("Enter the number of scoops: "))
-                if scoops < 0:
-                    print("Number of scoops cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter an integer.")
-
-        while True:
-            try:
-                price = float(input("Enter the price per scoop: "))
-                if price < 0:
-                    print("Price cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-
+        scoops = self._prompt_value(
+            "Enter the number of scoops: ", parse_non_negative_int, "Number of scoops"
+        )
+        price = self._prompt_value(
+            "Enter the price per scoop: ", parse_non_negative_float, "Price"
+        )
         topping_name = input("Enter the topping: ")
-
-        while True:
-            try:
-                topping_price = float(input("Enter the price for the topping: "))
-                if topping_price < 0:
-                    print("Price cannot be negative. Please try again.")
-                    continue
-                break
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-
+        topping_price = self._prompt_value(
+            "Enter the price for the topping: ", parse_non_negative_float, "Price"
+        )
         return Sundae(name, scoops, price, topping_name, topping_price)
 
     def user_prompt_payment(self) -> PayType:
@@ -223,9 +188,44 @@ def main():
     payment_type = shop.user_prompt_payment()
     order.set_pay_type(payment_type)
 
-    # Print receipt using tabulate with order.to_list()
-    print(tabulate(order.to_list(), tablefmt="fancy_grid"))
+    # Print receipt using tabulate, streaming rows from order.receipt_rows()
+    from tabulate import tabulate
+
+    print(tabulate(order.receipt_rows(), tablefmt="fancy_grid"))
+
+
+def checkout_main(argv: Optional[List[str]] = None) -> None:
+    """Check out every order of a CSV/JSONL file across a process pool.
+
+    Rows are grouped by order with ingest.py, then parsed, priced, sorted
+    and rendered in parallel by checkout.py. Receipts are printed in file
+    order.
+    """
+    import argparse
+
+    from checkout import DEFAULT_CHUNKSIZE, checkout_rows
+    from ingest import format_for, iter_order_rows
+
+    parser = argparse.ArgumentParser(description="Bulk checkout of dessert orders")
+    parser.add_argument("orders", help="CSV or JSONL file of order rows")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument(
+        "--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="orders per task"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.orders, newline="") as stream:
+        groups = iter_order_rows(stream, format_for(args.orders))
+        for order_id, receipt in checkout_rows(
+            groups, workers=args.workers, chunksize=args.chunksize
+        ):
+            print(f"Order {order_id}")
+            print(receipt)
+            print()
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        checkout_main()
+    else:
+        main()
@@ -0,0 +1,347 @@
+"""ingest.py
+
+Non-interactive bulk loading of orders from CSV or JSONL files.
+
+Each row (CSV line or JSON object) describes one dessert item:
+
+    order_id, kind, name, quantity, price, topping_name, topping_price, pay_type
+
+`kind` is one of candy, cookie, ice_cream or sundae. `quantity` is the
+weight in pounds for candy, the number of cookies for cookies and the
+number of scoops otherwise. The topping columns are only used by sundaes
+and `pay_type` (CASH, CARD or PHONE, default CASH) may be given on any
+row of the order. A blank `topping_price` means a free topping.
+
+Rows are validated with the same rules as the DessertShop prompts
+(validation.py), and errors name the offending column. JSON numbers are
+taken as they are, so a whole number such as 6.0 is a valid count. Consecutive rows with the same order_id form one Order,
+so files are streamed with memory bounded by the largest order. A
+malformed row is reported through `on_error` and skipped; the rest of
+the file is still processed.
+
+Usage, from the dessert_shop directory:
+
+    python ingest.py orders.csv > receipts.txt
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+from dessert import Candy, Cookie, DessertItem, IceCream, Order, Sundae
+from payment import PayType
+from validation import parse_non_negative_float, parse_non_negative_int
+
+
+T = TypeVar("T")
+
+
+class RowError(NamedTuple):
+    """A row that could not be loaded.
+
+    Attributes
+    ----------
+    line: int
+        Line number of the row in the input file
+    message: str
+        Why the row was rejected
+    """
+
+    line: int
+    message: str
+
+
+def report_error(error: RowError) -> None:
+    """Default error handler: print the rejected row to stderr."""
+    print(f"line {error.line}: {error.message}", file=sys.stderr)
+
+
+def _column(
+    record: Mapping[str, str], column: str, parse: Callable[[str, str], T], label: str
+) -> T:
+    """Parse one column of a row, naming the column in validation errors."""
+    try:
+        return parse(record.get(column), label)
+    except ValueError as error:
+        raise ValueError(f"{column}: {error}") from None
+
+
+def parse_item(record: Mapping[str, str]) -> DessertItem:
+    """Build a dessert item from one row.
+
+    Parameters
+    ----------
+    record : Mapping[str, str]
+        Row values keyed by column name
+
+    Returns
+    -------
+    DessertItem
+        The Candy, Cookie, IceCream or Sundae described by the row
+
+    Raises
+    ------
+    ValueError
+        If the kind is unknown or a value breaks the validation rules; the
+        message starts with the name of the column
+    """
+    kind = (record.get("kind") or "").strip().lower()
+    name = record.get("name") or ""
+    match kind:
+        case "candy":
+            return Candy(
+                name,
+                _column(record, "quantity", parse_non_negative_float, "Weight"),
+                _column(record, "price", parse_non_negative_float, "Price"),
+            )
+        case "cookie":
+            return Cookie(
+                name,
+                _column(record, "quantity", parse_non_negative_int, "Quantity"),
+                _column(record, "price", parse_non_negative_float, "Price"),
+            )
+        case "ice_cream":
+            return IceCream(
+                name,
+                _column(record, "quantity", parse_non_negative_int, "Number of scoops"),
+                _column(record, "price", parse_non_negative_float, "Price"),
+            )
+        case "sundae":
+            if not (record.get("topping_price") or "").strip():
+                record = dict(record, topping_price="0")
+            return Sundae(
+                name,
+                _column(record, "quantity", parse_non_negative_int, "Number of scoops"),
+                _column(record, "price", parse_non_negative_float, "Price"),
+                record.get("topping_name") or "",
+                _column(record, "topping_price", parse_non_negative_float, "Price"),
+            )
+        case _:
+            raise ValueError(f"kind: Unknown dessert kind: {kind!r}")
+
+
+def parse_pay_type(text: Optional[str]) -> Optional[PayType]:
+    """Return the PayType named by text, or None if text is empty.
+
+    Raises
+    ------
+    ValueError
+        If text does not name a payment type
+    """
+    if not text:
+        return None
+    try:
+        return PayType(text.strip().upper())
+    except ValueError:
+        raise ValueError(f"pay_type: Invalid payment type: {text}") from None
+
+
+def _json_text(value: object) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_records(
+    stream: TextIO, fmt: str
+) -> Iterator[Tuple[int, Optional[Mapping[str, str]]]]:
+    """Yield (line number, row) pairs from a CSV or JSONL stream.
+
+    Values of JSON rows are converted to strings so both formats go through
+    the same validation; whole-number floats such as 6.0 become "6", so
+    they are valid for integer columns. A JSON line that cannot be decoded
+    is yielded as None so the caller can report it.
+    """
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [column.strip() for column in header]
+        for row in reader:
+            if row:
+                yield reader.line_num, dict(zip(header, row))
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, None
+                continue
+            if not isinstance(data, dict):
+                yield line_number, None
+                continue
+            yield line_number, {key: _json_text(value) for key, value in data.items()}
+    else:
+        raise ValueError(f"Unsupported file format: {fmt}")
+
+
+def format_for(path: str) -> str:
+    """Return "csv" or "jsonl" based on the file extension of path."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def _order_id(record: Optional[Mapping[str, str]]) -> str:
+    return "" if record is None else (record.get("order_id") or "").strip()
+
+
+def _invalid_row(line_number: int, record: Optional[Mapping[str, str]]) -> RowError:
+    if record is None:
+        return RowError(line_number, "Row is not a valid JSON object")
+    return RowError(line_number, "Missing order_id")
+
+
+def iter_order_rows(
+    stream: TextIO,
+    fmt: str = "csv",
+    on_error: Callable[[RowError], None] = report_error,
+) -> Iterator[Tuple[str, List[Tuple[int, Optional[Mapping[str, str]]]]]]:
+    """Group the rows of a CSV or JSONL stream by order, without parsing them.
+
+    The rows are left unparsed so they can be sent to another process and
+    turned into an Order there (see `build_order`). Rows that are not JSON
+    objects or have no order_id are kept with the order read before them,
+    so `build_order` reports them in line order with that order's errors;
+    such rows at the start of the stream are reported through `on_error`.
+
+    Yields
+    ------
+    Tuple[str, List[Tuple[int, Optional[Mapping[str, str]]]]]
+        (order_id, [(line number, row), ...]) for each run of consecutive
+        rows with the same order_id
+    """
+    current_id = None
+    rows: List[Tuple[int, Optional[Mapping[str, str]]]] = []
+    for line_number, record in iter_records(stream, fmt):
+        order_id = _order_id(record)
+        if not order_id:
+            if rows:
+                rows.append((line_number, record))
+            else:
+                on_error(_invalid_row(line_number, record))
+            continue
+        if order_id != current_id:
+            if rows:
+                yield current_id, rows
+            current_id = order_id
+            rows = []
+        rows.append((line_number, record))
+    if rows:
+        yield current_id, rows
+
+
+def build_order(
+    rows: Iterable[Tuple[int, Optional[Mapping[str, str]]]],
+    on_error: Callable[[RowError], None] = report_error,
+) -> Optional[Order]:
+    """Build one Order from its rows, as grouped by `iter_order_rows`.
+
+    Returns
+    -------
+    Order or None
+        The order, or None if every row was rejected
+    """
+    order = Order()
+    for line_number, record in rows:
+        if not _order_id(record):
+            on_error(_invalid_row(line_number, record))
+            continue
+        try:
+            item = parse_item(record)
+            pay_type = parse_pay_type(record.get("pay_type"))
+            order.add(item)
+        except (ValueError, OverflowError) as error:
+            on_error(RowError(line_number, str(error)))
+            continue
+        if pay_type is not None:
+            order.set_pay_type(pay_type)
+    if not len(order):
+        return None
+    return order
+
+
+def iter_orders(
+    stream: TextIO,
+    fmt: str = "csv",
+    on_error: Callable[[RowError], None] = report_error,
+) -> Iterator[Tuple[str, Order]]:
+    """Stream (order_id, Order) pairs from a CSV or JSONL stream.
+
+    Parameters
+    ----------
+    stream : TextIO
+        Open text stream to read from
+    fmt : str, optional
+        "csv" (default) or "jsonl"
+    on_error : Callable[[RowError], None], optional
+        Called for every malformed row (default prints to stderr)
+
+    Yields
+    ------
+    Tuple[str, Order]
+        Each order once all of its consecutive rows have been read; orders
+        whose rows were all rejected are skipped
+    """
+    for order_id, rows in iter_order_rows(stream, fmt, on_error):
+        order = build_order(rows, on_error)
+        if order is not None:
+            yield order_id, order
+
+
+def write_receipts(
+    stream: TextIO,
+    out: TextIO,
+    fmt: str = "csv",
+    on_error: Callable[[RowError], None] = report_error,
+) -> int:
+    """Load every order from stream and write its sorted receipt to out.
+
+    Returns
+    -------
+    int
+        Number of receipts written
+    """
+    count = 0
+    for order_id, order in iter_orders(stream, fmt, on_error):
+        order.sort()
+        out.write(f"Order {order_id}\n")
+        for row in order.receipt_rows():
+            out.write(", ".join(row))
+            out.write("\n")
+        out.write("\n")
+        count += 1
+    return count
+
+
+def main(argv: Optional[list] = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python ingest.py ORDERS.csv|ORDERS.jsonl", file=sys.stderr)
+        sys.exit(2)
+    path = args[0]
+    with open(path, newline="") as stream:
+        write_receipts(stream, sys.stdout, format_for(path))
+
+
+if __name__ == "__main__":
+    main()
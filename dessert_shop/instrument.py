@@ -0,0 +1,270 @@
+"""instrument.py
+
+Opt-in counters and timers for the Dessert Shop hot paths.
+
+Modules declare the methods worth measuring with `hook_point`; dessert.py
+registers Order.add, Order.sort, Order.__str__, the receipt generators
+Order.receipt_rows and Order.line_items, the cost and tax methods of
+DessertItem and the combine methods of Candy and Cookie. Nothing is
+wrapped until `enable` is called with a sink: the registered methods are
+then replaced on their classes by timing wrappers that report every call
+to the sink, and `disable` puts the original functions back. While
+disabled the methods are the plain, unwrapped functions, so
+instrumentation costs nothing.
+
+Timers are inclusive: Order.add includes the time of any combine it does.
+A generator is timed over its whole iteration, counting only the time
+spent producing items (not the caller's work between them), and reported
+once when it is exhausted or closed.
+
+Sinks only need a ``record(name, seconds)`` method. Two are provided:
+`HistogramSink` keeps call counts and log2 latency histograms in memory,
+and `JsonLinesSink` writes one JSON object per call to a stream.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from typing import Callable, Dict, List, Optional, Protocol, TextIO, Tuple
+
+
+class Sink(Protocol):
+    """Receiver of timing events."""
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one call of the hook point `name` that took `seconds`."""
+        ...
+
+
+class Histogram:
+    """Call count, total time and log2 latency buckets of one hook point.
+
+    Attributes
+    ----------
+    count: int
+        Number of calls
+    total: float
+        Total time in seconds
+    min: float
+        Fastest call in seconds
+    max: float
+        Slowest call in seconds
+    buckets: Dict[int, int]
+        Calls per bucket; bucket b holds calls that took less than 2**b
+        microseconds (and at least 2**(b - 1))
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def summary(self) -> dict:
+        """Return the histogram as plain data, times in microseconds."""
+        return {
+            "count": self.count,
+            "total_us": self.total * 1e6,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": self.min * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+            "buckets": {f"<{2 ** b}us": n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class HistogramSink:
+    """In-memory sink keeping one Histogram per hook point."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def count(self, name: str) -> int:
+        """Return the number of calls recorded for name."""
+        histogram = self.histograms.get(name)
+        return 0 if histogram is None else histogram.count
+
+    def summary(self) -> Dict[str, dict]:
+        """Return every histogram as plain data, keyed by hook point."""
+        return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+    def dump(self, stream: TextIO) -> None:
+        """Write the summary to stream as JSON."""
+        import json
+
+        json.dump(self.summary(), stream, indent=2)
+
+
+class JsonLinesSink:
+    """Sink writing {"name": ..., "seconds": ...} per call to a text stream."""
+
+    def __init__(self, stream: TextIO) -> None:
+        import json
+
+        self.stream = stream
+        self._dumps = json.dumps
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stream.write(self._dumps({"name": name, "seconds": seconds}))
+        self.stream.write("\n")
+
+
+# (class, attribute, metric name) of every registered hook point
+_points: List[Tuple[type, str, str]] = []
+# original functions of the wrapped hook points while enabled
+_originals: Dict[Tuple[type, str], Callable] = {}
+_sink: Optional[Sink] = None
+
+# inspect.CO_GENERATOR, without importing inspect
+_CO_GENERATOR = 0x20
+
+
+def _timed(func: Callable, name: str, sink: Sink) -> Callable:
+    """Return func wrapped to report each call's duration to sink."""
+    clock = time.perf_counter
+    record = sink.record
+
+    if func.__code__.co_flags & _CO_GENERATOR:
+
+        @functools.wraps(func)
+        def timed_generator(*args, **kwargs):
+            elapsed = 0.0
+            iterator = func(*args, **kwargs)
+            try:
+                while True:
+                    start = clock()
+                    try:
+                        value = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += clock() - start
+                    yield value
+            finally:
+                iterator.close()
+                record(name, elapsed)
+
+        return timed_generator
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name, clock() - start)
+
+    return timed
+
+
+def _wrap(cls: type, attribute: str, name: str) -> None:
+    func = cls.__dict__[attribute]
+    _originals[(cls, attribute)] = func
+    setattr(cls, attribute, _timed(func, name, _sink))
+
+
+def hook_point(cls: type, attribute: str, name: Optional[str] = None) -> None:
+    """Register a method of cls as a hook point.
+
+    Parameters
+    ----------
+    cls : type
+        Class defining the method (it must be in the class's own __dict__)
+    attribute : str
+        Name of the method
+    name : str, optional
+        Metric name (default "ClassName.attribute")
+    """
+    if attribute not in cls.__dict__:
+        raise AttributeError(f"{cls.__name__} does not define {attribute}")
+    name = name or f"{cls.__name__}.{attribute}"
+    _points.append((cls, attribute, name))
+    if _sink is not None:
+        _wrap(cls, attribute, name)
+
+
+def hook_points() -> List[str]:
+    """Return the metric names of every registered hook point."""
+    return [name for _, _, name in _points]
+
+
+def enabled() -> bool:
+    """Return True if instrumentation is enabled."""
+    return _sink is not None
+
+
+def enable(sink: Sink) -> None:
+    """Start reporting every hook point call to sink.
+
+    Enabling again switches to the new sink.
+    """
+    global _sink
+    disable()
+    _sink = sink
+    for cls, attribute, name in _points:
+        _wrap(cls, attribute, name)
+
+
+def disable() -> None:
+    """Stop instrumentation and restore the original methods."""
+    global _sink
+    for (cls, attribute), func in _originals.items():
+        setattr(cls, attribute, func)
+    _originals.clear()
+    _sink = None
+
+
+class instrumented:
+    """Enable instrumentation with sink for the duration of a with block.
+
+    The previous sink, if any, is restored afterwards. (A class rather
+    than a ``contextlib`` generator to keep the import cheap.)
+    """
+
+    def __init__(self, sink: Sink) -> None:
+        self.sink = sink
+        self._previous: Optional[Sink] = None
+
+    def __enter__(self) -> Sink:
+        self._previous = _sink
+        enable(self.sink)
+        return self.sink
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._previous is None:
+            disable()
+        else:
+            enable(self._previous)
+
+
+__all__ = [
+    "Sink",
+    "Histogram",
+    "HistogramSink",
+    "JsonLinesSink",
+    "hook_point",
+    "hook_points",
+    "enabled",
+    "enable",
+    "disable",
+    "instrumented",
+]
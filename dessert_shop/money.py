@@ -0,0 +1,149 @@
+"""money.py
+
+Fixed-point money helpers for the Dessert Shop.
+
+Amounts are held as integer cents (the `Cents` type) so that item costs,
+taxes and order totals are exact sums of integers. Floats only appear at
+the edges: prices entered by the user are converted with `to_cents`, and
+`to_dollars` turns cents back into the float values the public API
+returns.
+
+All rounding goes through one configurable policy (`Rounding`), which
+defaults to ROUND_HALF_UP. Set it with `set_rounding` before pricing any
+items; items keep their cached cost and tax until they are edited.
+"""
+
+from __future__ import annotations
+
+import math
+from enum import Enum
+from typing import NewType
+
+Cents = NewType("Cents", int)
+
+
+class Rounding(Enum):
+    """Enumeration of supported rounding policies.
+
+    Attributes
+    ----------
+    HALF_UP : str
+        Ties round away from zero (0.125 -> 0.13)
+    HALF_EVEN : str
+        Ties round to the even cent, banker's rounding (0.125 -> 0.12)
+    """
+
+    HALF_UP = "HALF_UP"
+    HALF_EVEN = "HALF_EVEN"
+
+
+_rounding: Rounding = Rounding.HALF_UP
+
+# Upper bound of the relative error of the float product amount * 100
+_PRODUCT_ERROR = 2.0**-52
+
+
+def get_rounding() -> Rounding:
+    """Return the active rounding policy."""
+    return _rounding
+
+
+def set_rounding(policy: Rounding) -> None:
+    """Set the rounding policy used by every money calculation.
+
+    Parameters
+    ----------
+    policy : Rounding
+        The rounding policy to use
+
+    Raises
+    ------
+    ValueError
+        If policy is not a valid Rounding
+    """
+    global _rounding
+    if not isinstance(policy, Rounding):
+        raise ValueError(f"Invalid rounding policy: {policy}")
+    _rounding = policy
+
+
+def _round_tie(whole: int) -> int:
+    """Resolve an exact half between whole and whole + 1 under the policy."""
+    if _rounding is Rounding.HALF_EVEN:
+        return whole if whole % 2 == 0 else whole + 1
+    # HALF_UP rounds away from zero
+    return whole + 1 if whole >= 0 else whole
+
+
+def to_cents(amount: float) -> Cents:
+    """Convert a dollar amount to cents using the rounding policy.
+
+    The exact value of the float is rounded, like ``round(amount, 2)``
+    does: 2 * 3.45 / 12 is 0.57499999999999996 and becomes 57 cents. The
+    policy only decides amounts that are exactly half a cent, such as
+    0.125, so under HALF_EVEN the result always equals
+    ``round(amount, 2) * 100``.
+
+    Parameters
+    ----------
+    amount : float
+        Amount in dollars
+
+    Returns
+    -------
+    Cents
+        The amount rounded to a whole number of cents
+    """
+    scaled = amount * 100
+    whole = math.floor(scaled)
+    fraction = scaled - whole
+    if abs(fraction - 0.5) > abs(scaled) * _PRODUCT_ERROR:
+        return Cents(whole if fraction < 0.5 else whole + 1)
+    # Too close to half a cent to decide from the rounded product
+    numerator, denominator = amount.as_integer_ratio()
+    return Cents(round_div(numerator * 100, denominator))
+
+
+def round_div(numerator: int, denominator: int) -> int:
+    """Divide two ints (denominator > 0), rounding with the policy."""
+    whole, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice == denominator:
+        return _round_tie(whole)
+    return whole if twice < denominator else whole + 1
+
+
+def to_basis_points(percent: float) -> int:
+    """Convert a percentage such as 7.25 to basis points (725)."""
+    return round(percent * 100)
+
+
+def percent_of(cents: int, basis_points: int) -> Cents:
+    """Return `basis_points` hundredths of a percent of cents, rounded."""
+    return Cents(round_div(cents * basis_points, 10_000))
+
+
+def to_dollars(cents: int) -> float:
+    """Convert cents to a float dollar amount."""
+    return cents / 100
+
+
+def format_cents(cents: int) -> str:
+    """Format cents as a dollar amount with two decimals, e.g. "2.05"."""
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{remainder:02d}"
+
+
+__all__ = [
+    "Cents",
+    "Rounding",
+    "get_rounding",
+    "set_rounding",
+    "to_cents",
+    "round_div",
+    "to_basis_points",
+    "percent_of",
+    "to_dollars",
+    "format_cents",
+]
@@ -18,4 +18,7 @@ class Packaging(Protocol):
         The type of packaging used for the item (e.g., "Bag", "Box", "Bowl", "Boat")
     """
 
+    # lets implementing classes drop their per-instance __dict__
+    __slots__ = ()
+
     packaging: str
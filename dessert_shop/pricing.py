@@ -0,0 +1,255 @@
+"""pricing.py
+
+Volume and tiered pricing rules for the Dessert Shop.
+
+A `PricingRule` gives a product a percentage discount once its quantity
+goes above a threshold, for example "Cookie: 10% off above 5 dozen".
+Several rules for the same product form tiers: the rule with the highest
+threshold below the quantity wins. Quantities are in each product's
+pricing unit: pounds of candy, cookies, and scoops for ice cream and
+sundaes.
+
+Rules are compiled once per rule set (`compile_rules`, memoized) into
+`CompiledRules`: one small price function per product for the per-item
+path in dessert.py, and sorted (threshold, basis points) tables that
+batch.py applies to whole columns at once. Products without rules get no
+price function at all, so the default, rule-free pricing costs nothing.
+
+The active rule set is module-wide, like the rounding policy in money.py.
+Set it with `set_pricing_rules` before pricing any items; items keep their
+cached cost until they are edited.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from money import Cents, percent_of, to_basis_points
+
+# Product names rules can apply to (the DessertItem class names)
+PRODUCTS = ("Candy", "Cookie", "IceCream", "Sundae")
+
+# Quantity units accepted by parse_rule, as multiples of the pricing unit
+_UNITS = {
+    "": 1,
+    "lb": 1,
+    "lbs": 1,
+    "pound": 1,
+    "pounds": 1,
+    "cookie": 1,
+    "cookies": 1,
+    "dozen": 12,
+    "scoop": 1,
+    "scoops": 1,
+}
+
+_RULE_PATTERN = (
+    r"^\s*(?P<product>[A-Za-z ]+?)\s*:\s*(?P<percent>[0-9.]+)\s*%\s*off\s+"
+    r"above\s+(?P<above>[0-9.]+)\s*(?P<unit>[A-Za-z]*)\s*$"
+)
+
+PriceFunction = Callable[[float, int], Cents]
+
+
+class PricingRule(NamedTuple):
+    """A volume discount for one product.
+
+    Attributes
+    ----------
+    product: str
+        Product the rule applies to, one of PRODUCTS
+    above: float
+        The discount applies when the quantity is greater than this
+    percent_off: float
+        Discount in percent, taken off the whole line
+    """
+
+    product: str
+    above: float
+    percent_off: float
+
+
+def make_rule(product: str, above: float, percent_off: float) -> PricingRule:
+    """Create a validated PricingRule.
+
+    Raises
+    ------
+    ValueError
+        If the product is unknown or a value is out of range
+    """
+    if product not in PRODUCTS:
+        raise ValueError(f"Unknown product: {product}")
+    if above < 0:
+        raise ValueError("Threshold cannot be negative")
+    if not 0 <= percent_off <= 100:
+        raise ValueError("Discount must be between 0 and 100 percent")
+    return PricingRule(product, float(above), float(percent_off))
+
+
+def parse_rule(text: str) -> PricingRule:
+    """Parse a rule such as "Cookie: 10% off above 5 dozen".
+
+    The product name is matched case-insensitively and may contain spaces
+    ("Ice Cream"). The unit after the threshold is optional; "dozen"
+    multiplies it by 12.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid rule
+    """
+    match = _rule_regex().match(text)
+    if match is None:
+        raise ValueError(f"Invalid pricing rule: {text!r}")
+    name = match["product"].replace(" ", "").lower()
+    product = next((p for p in PRODUCTS if p.lower() == name), None)
+    if product is None:
+        raise ValueError(f"Unknown product: {match['product']}")
+    unit = match["unit"].lower()
+    if unit not in _UNITS:
+        raise ValueError(f"Unknown unit: {match['unit']}")
+    try:
+        above = float(match["above"]) * _UNITS[unit]
+        percent_off = float(match["percent"])
+    except ValueError:
+        raise ValueError(f"Invalid pricing rule: {text!r}") from None
+    return make_rule(product, above, percent_off)
+
+
+@lru_cache(maxsize=None)
+def _rule_regex():
+    """Compile the rule pattern on first use; `re` is not needed at startup."""
+    import re
+
+    return re.compile(_RULE_PATTERN, re.IGNORECASE)
+
+
+class CompiledRules:
+    """A rule set compiled for fast pricing.
+
+    Attributes
+    ----------
+    rules: Tuple[PricingRule, ...]
+        The rules, in canonical (sorted) order
+    tables: Dict[str, Tuple[Tuple[float, ...], Tuple[int, ...]]]
+        Per product, the ascending thresholds and the discount in basis
+        points that applies above each of them
+    """
+
+    __slots__ = ("rules", "tables", "_functions")
+
+    def __init__(self, rules: Tuple[PricingRule, ...]) -> None:
+        self.rules = rules
+        self.tables: Dict[str, Tuple[Tuple[float, ...], Tuple[int, ...]]] = {}
+        self._functions: Dict[str, PriceFunction] = {}
+        by_product: Dict[str, Dict[float, int]] = {}
+        for rule in rules:
+            tiers = by_product.setdefault(rule.product, {})
+            basis_points = to_basis_points(rule.percent_off)
+            # duplicate thresholds keep the larger discount
+            tiers[rule.above] = max(basis_points, tiers.get(rule.above, 0))
+        for product, tiers in by_product.items():
+            thresholds = tuple(sorted(tiers))
+            discounts = tuple(tiers[above] for above in thresholds)
+            self.tables[product] = (thresholds, discounts)
+            self._functions[product] = _compile_tiers(thresholds, discounts)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def price_function(self, product: str) -> Optional[PriceFunction]:
+        """Return the price function for product, or None if it has no rules.
+
+        The function maps (quantity, list price in cents) to the discounted
+        price in cents.
+        """
+        return self._functions.get(product)
+
+
+def _compile_tiers(
+    thresholds: Tuple[float, ...], discounts: Tuple[int, ...]
+) -> PriceFunction:
+    """Build the price function for one product's tiers."""
+    if len(thresholds) == 1:
+        (above,) = thresholds
+        (basis_points,) = discounts
+
+        def single_tier(quantity: float, cents: int) -> Cents:
+            if quantity > above:
+                return Cents(cents - percent_of(cents, basis_points))
+            return Cents(cents)
+
+        return single_tier
+
+    def tiered(quantity: float, cents: int) -> Cents:
+        # number of thresholds strictly below quantity
+        tier = bisect_left(thresholds, quantity)
+        if tier:
+            return Cents(cents - percent_of(cents, discounts[tier - 1]))
+        return Cents(cents)
+
+    return tiered
+
+
+@lru_cache(maxsize=32)
+def _compile(rules: Tuple[PricingRule, ...]) -> CompiledRules:
+    return CompiledRules(rules)
+
+
+def compile_rules(rules: Iterable[PricingRule]) -> CompiledRules:
+    """Compile a rule set, reusing the result for an identical set.
+
+    Rules may be PricingRule tuples or strings for `parse_rule`.
+    """
+    parsed = (
+        parse_rule(rule) if isinstance(rule, str) else make_rule(*rule)
+        for rule in rules
+    )
+    return _compile(tuple(sorted(set(parsed))))
+
+
+_active: CompiledRules = compile_rules(())
+
+
+def get_pricing_rules() -> CompiledRules:
+    """Return the active compiled rule set."""
+    return _active
+
+
+def set_pricing_rules(rules: Iterable[PricingRule]) -> CompiledRules:
+    """Compile rules and make them the active rule set.
+
+    Parameters
+    ----------
+    rules : Iterable[PricingRule]
+        The rules (or rule strings) to apply; an empty iterable restores
+        list prices
+
+    Returns
+    -------
+    CompiledRules
+        The active compiled rule set
+    """
+    global _active
+    _active = compile_rules(rules)
+    return _active
+
+
+def price_function(product: str) -> Optional[PriceFunction]:
+    """Return the active price function for product, or None."""
+    return _active._functions.get(product)
+
+
+__all__ = [
+    "PRODUCTS",
+    "PricingRule",
+    "CompiledRules",
+    "make_rule",
+    "parse_rule",
+    "compile_rules",
+    "get_pricing_rules",
+    "set_pricing_rules",
+    "price_function",
+]
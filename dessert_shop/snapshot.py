@@ -0,0 +1,324 @@
+"""snapshot.py
+
+Compact, versioned binary snapshots of orders.
+
+A snapshot file holds many (order_id, Order) pairs, e.g. a day's worth of
+orders from ``ingest.iter_orders``. All integers are little-endian:
+
+    header   magic b"DSNP", format version, counts and section offsets
+    orders   one fixed-width record per order: order id (string index),
+             first item, item count and PayType
+    items    one fixed-width record per item: kind (the batch.py codes),
+             name, packaging and topping name (string indexes), quantity,
+             unit price, topping price and the item's own tax percent
+             (NaN when it uses the tax table)
+    strings  an offset table followed by UTF-8 data; every distinct name
+             is stored once
+
+`Snapshot` opens a file with ``mmap`` and only reads the header, so
+reopening a large snapshot is close to instant. Orders are rebuilt from
+the mapped records only when they are accessed, and strings are decoded
+on first use. ``snapshot[i]`` rebuilds every item of the order at once;
+``snapshot.items(i)`` gives lazy access to single items of a large order.
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import struct
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from batch import CANDY, COOKIE, ICE_CREAM, KIND_BY_TYPE, SUNDAE
+from dessert import Candy, Cookie, DessertItem, IceCream, Order, Sundae
+from payment import PayType
+
+MAGIC = b"DSNP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIQQQQ")
+_ORDER = struct.Struct("<IIIB3x")
+_ITEM = struct.Struct("<B3xIIIdddd")
+_OFFSET = struct.Struct("<I")
+
+_PAY_TYPES = tuple(PayType)
+_PAY_CODES = {pay_type: code for code, pay_type in enumerate(_PAY_TYPES)}
+
+
+class _StringTable:
+    """Assigns each distinct string an index while writing."""
+
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.data = bytearray()
+        self.offsets: List[int] = [0]
+
+    def add(self, text: str) -> int:
+        index = self.index.get(text)
+        if index is None:
+            index = self.index[text] = len(self.offsets) - 1
+            self.data += text.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return index
+
+
+def _item_record(item: DessertItem, strings: _StringTable) -> bytes:
+    kind = KIND_BY_TYPE.get(type(item))
+    if kind is None:
+        raise TypeError(f"Cannot snapshot item of type {type(item).__name__}")
+    topping_name = ""
+    topping_price = 0.0
+    if kind == CANDY:
+        quantity, unit_price = item.candy_weight, item.price_per_pound
+    elif kind == COOKIE:
+        quantity, unit_price = item.cookie_quantity, item.price_per_dozen
+    else:
+        quantity, unit_price = item.scoop_count, item.price_per_scoop
+        if kind == SUNDAE:
+            topping_name, topping_price = item.topping_name, item.topping_price
+    tax_percent = item._tax_percent
+    return _ITEM.pack(
+        kind,
+        strings.add(item.name),
+        strings.add(item.packaging or ""),
+        strings.add(topping_name),
+        quantity,
+        unit_price,
+        topping_price,
+        math.nan if tax_percent is None else tax_percent,
+    )
+
+
+def write_snapshot(path: str, orders: Iterable[Tuple[str, Order]]) -> int:
+    """Write (order_id, Order) pairs to a snapshot file.
+
+    Parameters
+    ----------
+    path : str
+        File to create or overwrite
+    orders : Iterable[Tuple[str, Order]]
+        The orders to save, e.g. from ``ingest.iter_orders``
+
+    Returns
+    -------
+    int
+        Number of orders written
+
+    Raises
+    ------
+    TypeError
+        If an order holds an item that is not a Candy, Cookie, IceCream
+        or Sundae
+    """
+    strings = _StringTable()
+    order_records = bytearray()
+    item_records = bytearray()
+    order_count = 0
+    item_count = 0
+    for order_id, order in orders:
+        first_item = item_count
+        for item in order.order:
+            item_records += _item_record(item, strings)
+            item_count += 1
+        order_records += _ORDER.pack(
+            strings.add(order_id),
+            first_item,
+            item_count - first_item,
+            _PAY_CODES[order.get_pay_type()],
+        )
+        order_count += 1
+
+    orders_offset = _HEADER.size
+    items_offset = orders_offset + len(order_records)
+    string_index_offset = items_offset + len(item_records)
+    string_data_offset = string_index_offset + _OFFSET.size * len(strings.offsets)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        order_count,
+        item_count,
+        len(strings.offsets) - 1,
+        orders_offset,
+        items_offset,
+        string_index_offset,
+        string_data_offset,
+    )
+    with open(path, "wb") as stream:
+        stream.write(header)
+        stream.write(order_records)
+        stream.write(item_records)
+        stream.write(struct.pack(f"<{len(strings.offsets)}I", *strings.offsets))
+        stream.write(strings.data)
+    return order_count
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file.
+
+    Opening a snapshot maps the file and reads the header only. Indexing
+    (``snapshot[i]``) rebuilds the i-th Order from its records; each access
+    returns a new Order, so callers keep the ones they need. The
+    granularity is one order: all of its items are rebuilt together. Use
+    ``items(i)`` to read single items of an order without rebuilding it.
+
+    Use as a context manager, or call ``close()`` when done.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a snapshot or has an unsupported version
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"Not an order snapshot: {path}")
+        (
+            magic,
+            version,
+            _,
+            self._order_count,
+            self._item_count,
+            self._string_count,
+            self._orders_offset,
+            self._items_offset,
+            self._string_index_offset,
+            self._string_data_offset,
+        ) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"Not an order snapshot: {path}")
+        if version != VERSION:
+            self._map.close()
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        self._strings: Dict[int, str] = {}
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._order_count
+
+    @property
+    def item_count(self) -> int:
+        """Total number of items over every order."""
+        return self._item_count
+
+    def _string(self, index: int) -> str:
+        text = self._strings.get(index)
+        if text is None:
+            start, end = struct.unpack_from(
+                "<II", self._map, self._string_index_offset + _OFFSET.size * index
+            )
+            base = self._string_data_offset
+            text = self._strings[index] = self._map[base + start : base + end].decode(
+                "utf-8"
+            )
+        return text
+
+    def _order_record(self, index: int) -> Tuple[int, int, int, int]:
+        if not 0 <= index < self._order_count:
+            raise IndexError("snapshot index out of range")
+        return _ORDER.unpack_from(self._map, self._orders_offset + _ORDER.size * index)
+
+    def order_id(self, index: int) -> str:
+        """Return the id of the index-th order without rebuilding it."""
+        return self._string(self._order_record(index)[0])
+
+    def _item(self, index: int) -> DessertItem:
+        (
+            kind,
+            name,
+            packaging,
+            topping_name,
+            quantity,
+            unit_price,
+            topping_price,
+            tax_percent,
+        ) = _ITEM.unpack_from(self._map, self._items_offset + _ITEM.size * index)
+        slots = {
+            "name": self._string(name),
+            "packaging": self._string(packaging) or None,
+            "_tax_percent": None if math.isnan(tax_percent) else tax_percent,
+        }
+        if kind == CANDY:
+            cls = Candy
+            slots["candy_weight"] = quantity
+            slots["price_per_pound"] = unit_price
+        elif kind == COOKIE:
+            cls = Cookie
+            slots["cookie_quantity"] = int(quantity)
+            slots["price_per_dozen"] = unit_price
+        else:
+            cls = IceCream if kind == ICE_CREAM else Sundae
+            slots["scoop_count"] = int(quantity)
+            slots["price_per_scoop"] = unit_price
+            if kind == SUNDAE:
+                slots["topping_name"] = self._string(topping_name)
+                slots["topping_price"] = topping_price
+        # restore the slots the way unpickling does, skipping __init__ and
+        # the per-field cache invalidation of __setattr__; the cached prices
+        # and owning order start out empty
+        item = cls.__new__(cls)
+        item.__setstate__((None, slots))
+        return item
+
+    def _normalize(self, index: int) -> int:
+        return index + self._order_count if index < 0 else index
+
+    def items(self, index: int) -> Sequence[DessertItem]:
+        """Return the items of the index-th order as a lazy sequence.
+
+        Each item is rebuilt from its record when it is accessed, and is not
+        part of any Order.
+        """
+        _, first_item, item_count, _ = self._order_record(self._normalize(index))
+        return _ItemView(self, first_item, item_count)
+
+    def __getitem__(self, index: int) -> Order:
+        """Rebuild the index-th order and all of its items from their records."""
+        index = self._normalize(index)
+        _, first_item, item_count, pay_code = self._order_record(index)
+        order = Order()
+        # items were combined when they were first added; keep them as saved
+        for item_index in range(first_item, first_item + item_count):
+            order._append(self._item(item_index))
+        order._rebuild_combine_index()
+        order.set_pay_type(_PAY_TYPES[pay_code])
+        return order
+
+    def __iter__(self) -> Iterator[Tuple[str, Order]]:
+        """Yield every (order_id, Order) pair, rebuilding orders one at a time."""
+        for index in range(self._order_count):
+            yield self.order_id(index), self[index]
+
+
+class _ItemView(Sequence[DessertItem]):
+    """Items of one snapshot order, rebuilt one at a time on access."""
+
+    def __init__(self, snapshot: Snapshot, first_item: int, item_count: int) -> None:
+        self._snapshot = snapshot
+        self._range = range(first_item, first_item + item_count)
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[DessertItem, List[DessertItem]]:
+        if isinstance(index, slice):
+            return [self._snapshot._item(i) for i in self._range[index]]
+        return self._snapshot._item(self._range[index])
+
+
+__all__ = ["MAGIC", "VERSION", "Snapshot", "write_snapshot"]
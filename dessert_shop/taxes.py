@@ -0,0 +1,154 @@
+"""taxes.py
+
+Sales tax rates per jurisdiction and item category.
+
+A `TaxTable` maps a jurisdiction (a store, city or state code) to the tax
+percent of each item category ("candy", "bakery", "ice_cream"...), with an
+optional "*" rate for every other category of that jurisdiction. Rates are
+converted to basis points when the table is built, and resolved lookups go
+through an LRU cache, so pricing an item's tax is one cached call and an
+integer multiply (see money.percent_of).
+
+The active table and jurisdiction are module-wide, like the rounding
+policy in money.py. Set them with `set_tax_table` before pricing any
+items; items keep their cached tax until they are edited. Categories
+without a rate fall back to the item's ``default_tax_percent``.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Mapping, Optional, Tuple
+
+from money import to_basis_points
+
+DEFAULT_TAX_PERCENT = 7.25
+DEFAULT_JURISDICTION = "default"
+# Category key for the rate of every category not listed explicitly
+ANY_CATEGORY = "*"
+
+
+class TaxTable:
+    """Tax rates keyed by jurisdiction and item category.
+
+    Parameters
+    ----------
+    rates : Mapping[str, Mapping[str, float]]
+        Tax percent per category, per jurisdiction
+    cache_size : int, optional
+        Number of resolved (jurisdiction, category) rates kept in the LRU
+        cache (default 256)
+
+    Raises
+    ------
+    ValueError
+        If a rate is negative
+    """
+
+    def __init__(
+        self, rates: Mapping[str, Mapping[str, float]], cache_size: int = 256
+    ) -> None:
+        self._basis_points: Dict[str, Dict[str, int]] = {}
+        for jurisdiction, categories in rates.items():
+            table = {}
+            for category, percent in categories.items():
+                if percent < 0:
+                    raise ValueError(
+                        f"Tax rate for {jurisdiction}/{category} cannot be negative"
+                    )
+                table[category] = to_basis_points(percent)
+            self._basis_points[jurisdiction] = table
+        self._cache_size = cache_size
+        self.basis_points = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def __getstate__(self) -> dict:
+        """Pickle the rates without the cache (e.g. for worker processes)."""
+        state = self.__dict__.copy()
+        del state["basis_points"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled table with an empty cache."""
+        self.__dict__.update(state)
+        self.basis_points = lru_cache(maxsize=self._cache_size)(self._resolve)
+
+    @property
+    def jurisdictions(self) -> Tuple[str, ...]:
+        """The jurisdictions this table has rates for."""
+        return tuple(self._basis_points)
+
+    def _resolve(self, jurisdiction: str, category: str) -> Optional[int]:
+        """Return the rate in basis points, or None if the table has none.
+
+        Wrapped in an LRU cache as ``basis_points(jurisdiction, category)``.
+
+        Raises
+        ------
+        KeyError
+            If the jurisdiction is not in the table
+        """
+        try:
+            categories = self._basis_points[jurisdiction]
+        except KeyError:
+            raise KeyError(f"Unknown tax jurisdiction: {jurisdiction}") from None
+        basis_points = categories.get(category)
+        if basis_points is None:
+            basis_points = categories.get(ANY_CATEGORY)
+        return basis_points
+
+    def percent(self, jurisdiction: str, category: str) -> Optional[float]:
+        """Return the tax percent for a category, or None if the table has none."""
+        basis_points = self.basis_points(jurisdiction, category)
+        return None if basis_points is None else basis_points / 100
+
+
+_table: TaxTable = TaxTable({DEFAULT_JURISDICTION: {}})
+_jurisdiction: str = DEFAULT_JURISDICTION
+
+
+def get_tax_table() -> TaxTable:
+    """Return the active tax table."""
+    return _table
+
+
+def get_jurisdiction() -> str:
+    """Return the active jurisdiction."""
+    return _jurisdiction
+
+
+def set_tax_table(table: TaxTable, jurisdiction: str = DEFAULT_JURISDICTION) -> None:
+    """Make table the active tax table, taxing at jurisdiction's rates.
+
+    Raises
+    ------
+    ValueError
+        If jurisdiction is not in the table
+    """
+    global _table, _jurisdiction
+    if jurisdiction not in table.jurisdictions:
+        raise ValueError(f"Unknown tax jurisdiction: {jurisdiction}")
+    _table = table
+    _jurisdiction = jurisdiction
+
+
+def set_jurisdiction(jurisdiction: str) -> None:
+    """Switch the active jurisdiction within the active tax table."""
+    set_tax_table(_table, jurisdiction)
+
+
+def tax_basis_points(category: str) -> Optional[int]:
+    """Return the active rate for category in basis points, or None."""
+    return _table.basis_points(_jurisdiction, category)
+
+
+__all__ = [
+    "DEFAULT_TAX_PERCENT",
+    "DEFAULT_JURISDICTION",
+    "ANY_CATEGORY",
+    "TaxTable",
+    "get_tax_table",
+    "get_jurisdiction",
+    "set_tax_table",
+    "set_jurisdiction",
+    "tax_basis_points",
+]
@@ -0,0 +1,99 @@
+"""Test cases for the incremental sales aggregator."""
+
+import json
+import pickle
+from datetime import datetime
+
+try:
+    from dessert_shop import analytics
+    from dessert_shop import batch
+    from dessert_shop import dessert as ds
+    from dessert_shop.payment import PayType
+except Exception:  # pragma: no cover
+    import analytics
+    import batch
+    import dessert as ds
+    from payment import PayType
+
+import pytest
+
+MORNING = datetime(2024, 5, 1, 9, 15)
+LATER = datetime(2024, 5, 1, 9, 59, 30)
+NOON = datetime(2024, 5, 1, 12, 5)
+
+
+def make_order(pay_type=PayType.CASH):
+    order = ds.Order()
+    order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    order.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+    order.add(ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29))
+    order.set_pay_type(pay_type)
+    return order
+
+
+def make_stream():
+    return [
+        (MORNING, make_order()),
+        (LATER, make_order(PayType.CARD)),
+        (NOON, make_order()),
+    ]
+
+
+def test_rollups_by_hour_product_and_pay_type():
+    aggregator = analytics.SalesAggregator().consume(make_stream())
+    assert len(aggregator) == 9
+
+    cookie = ds.Cookie("Chocolate Chip", 6, 3.99)
+    revenue, tax, units, lines = aggregator.totals(
+        hour=MORNING, product="Cookie", pay_type=PayType.CASH
+    )
+    assert (revenue, tax, units, lines) == (cookie.cost_cents(), cookie.tax_cents(), 6, 1)
+
+    assert aggregator.totals(hour=LATER)[3] == 6
+    assert aggregator.totals(pay_type=PayType.CARD)[3] == 3
+    assert aggregator.totals(product="Candy")[2] == 4.5
+
+
+def test_grand_total_matches_orders():
+    stream = make_stream()
+    aggregator = analytics.SalesAggregator().consume(stream)
+    revenue, tax, _, lines = aggregator.totals()
+    assert revenue == sum(order.order_cost_cents() for _, order in stream)
+    assert tax == sum(order.order_tax_cents() for _, order in stream)
+    assert lines == sum(len(order) for _, order in stream)
+
+
+def test_rows_are_sorted():
+    rows = list(analytics.SalesAggregator().consume(make_stream()).rows())
+    assert rows == sorted(rows, key=lambda row: (row.hour, row.product, row.pay_type.value))
+    assert rows[0].hour == datetime(2024, 5, 1, 9)
+    assert {row.product for row in rows} == {"Candy", "Cookie", "Sundae"}
+
+
+def test_batch_matches_orders():
+    order = make_order()
+    from_order = analytics.SalesAggregator()
+    from_order.add_order(order, MORNING)
+    from_batch = analytics.SalesAggregator()
+    from_batch.add_batch(batch.OrderBatch.from_order(order), PayType.CASH, MORNING)
+    assert list(from_batch.rows()) == list(from_order.rows())
+
+
+def test_merge_partial_aggregates():
+    stream = make_stream()
+    whole = analytics.SalesAggregator().consume(stream)
+    parts = [
+        analytics.SalesAggregator().consume(stream[:1]).snapshot(),
+        analytics.SalesAggregator().consume(stream[1:]).snapshot(),
+    ]
+    # snapshots survive both JSON and pickle round trips
+    parts = [json.loads(json.dumps(parts[0])), pickle.loads(pickle.dumps(parts[1]))]
+    merged = analytics.merge_snapshots(parts)
+    assert list(merged.rows()) == list(whole.rows())
+
+
+def test_snapshot_version_is_checked():
+    state = analytics.SalesAggregator().snapshot()
+    state["version"] += 1
+    with pytest.raises(ValueError):
+        analytics.SalesAggregator.from_snapshot(state)
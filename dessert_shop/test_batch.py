@@ -0,0 +1,172 @@
+"""Test cases for the columnar OrderBatch."""
+
+import pickle
+import random
+
+try:
+    from dessert_shop import batch
+    from dessert_shop import dessert as ds
+    from dessert_shop import money
+    from dessert_shop import pricing
+    from dessert_shop import taxes
+except Exception:  # pragma: no cover
+    import batch
+    import dessert as ds
+    import money
+    import pricing
+    import taxes
+
+import pytest
+
+
+def random_items(count, seed=1420):
+    """Return `count` random dessert items with realistic prices."""
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        match rng.randrange(4):
+            case 0:
+                items.append(
+                    ds.Candy("Candy", rng.randrange(1, 400) / 16, rng.randrange(1, 999) / 100)
+                )
+            case 1:
+                items.append(ds.Cookie("Cookie", rng.randrange(1, 100), rng.randrange(1, 999) / 100))
+            case 2:
+                items.append(ds.IceCream("Ice", rng.randrange(1, 6), rng.randrange(1, 300) / 100))
+            case _:
+                items.append(
+                    ds.Sundae(
+                        "Sundae",
+                        rng.randrange(1, 6),
+                        rng.randrange(1, 300) / 100,
+                        "Fudge",
+                        rng.randrange(1, 200) / 100,
+                    )
+                )
+    return items
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test against both the NumPy and the plain Python pricing pass."""
+    if request.param == "numpy":
+        if batch.np is None:
+            pytest.skip("NumPy not installed")
+    else:
+        monkeypatch.setattr(batch, "np", None)
+    return request.param
+
+
+def test_batch_matches_per_object_lines(backend):
+    items = random_items(2000)
+    order_batch = batch.OrderBatch.from_items(items)
+    assert len(order_batch) == 2000
+    assert list(order_batch.line_costs()) == [item.calculate_cost() for item in items]
+    assert list(order_batch.line_taxes()) == [item.calculate_tax() for item in items]
+
+
+def test_batch_matches_order_totals(backend):
+    order = ds.Order()
+    for item in random_items(500, seed=7):
+        order.add(item)
+    order_batch = batch.OrderBatch.from_order(order)
+    assert order_batch.order_cost() == order.order_cost()
+    assert order_batch.order_tax() == order.order_tax()
+
+
+def test_batch_custom_tax_percent(backend):
+    candy = ds.Candy("Candy Corn", 1.5, 0.25)
+    candy.tax_percent = 6.1
+    order_batch = batch.OrderBatch.from_items([candy, ds.Cookie("Chocolate Chip", 6, 3.99)])
+    assert list(order_batch.line_taxes()) == [candy.calculate_tax(), 0.15]
+
+
+def test_batch_append_line_invalidates_prices(backend):
+    order_batch = batch.OrderBatch()
+    order_batch.append_line(batch.ICE_CREAM, 2, 0.79)
+    assert order_batch.order_cost() == 1.58
+    order_batch.append_line(batch.SUNDAE, 3, 0.69, 1.29)
+    assert order_batch.order_cost() == 4.94
+
+
+def test_batch_empty():
+    order_batch = batch.OrderBatch()
+    assert order_batch.order_cost() == 0
+    assert order_batch.order_tax() == 0
+
+
+def test_batch_invalid_kind():
+    with pytest.raises(ValueError):
+        batch.OrderBatch().append_line(9, 1, 1.0)
+
+
+def test_batch_matches_half_even_policy(backend):
+    money.set_rounding(money.Rounding.HALF_EVEN)
+    try:
+        items = random_items(500, seed=3)
+        order_batch = batch.OrderBatch.from_items(items)
+        assert list(order_batch.line_cost_cents()) == [item.cost_cents() for item in items]
+        assert list(order_batch.line_tax_cents()) == [item.tax_cents() for item in items]
+    finally:
+        money.set_rounding(money.Rounding.HALF_UP)
+
+
+def test_batch_reprices_when_rounding_changes(backend):
+    order_batch = batch.OrderBatch()
+    order_batch.append_line(batch.CANDY, 0.5, 0.25)  # exactly $0.125
+    assert list(order_batch.line_cost_cents()) == [13]
+    money.set_rounding(money.Rounding.HALF_EVEN)
+    try:
+        assert list(order_batch.line_cost_cents()) == [12]
+    finally:
+        money.set_rounding(money.Rounding.HALF_UP)
+    assert list(order_batch.line_cost_cents()) == [13]
+
+
+def test_batch_matches_pricing_rules(backend):
+    pricing.set_pricing_rules(
+        [
+            "Cookie: 10% off above 5 dozen",
+            "Cookie: 15% off above 8 dozen",
+            "Candy: 5% off above 10 lbs",
+            "Sundae: 20% off above 3 scoops",
+        ]
+    )
+    try:
+        items = random_items(2000, seed=11)
+        order_batch = batch.OrderBatch.from_items(items)
+        assert list(order_batch.line_cost_cents()) == [item.cost_cents() for item in items]
+        assert list(order_batch.line_tax_cents()) == [item.tax_cents() for item in items]
+    finally:
+        pricing.set_pricing_rules(())
+    # the batch reprices once the rules change
+    assert list(order_batch.line_cost_cents()) == [item._cost_cents() for item in items]
+
+
+def test_batch_taxes_against_rate_table(backend):
+    table = taxes.TaxTable(
+        {"UT": {"candy": 3.0, "ice_cream": 4.5, taxes.ANY_CATEGORY: 6.1}, "OR": {}}
+    )
+    items = random_items(500, seed=5)
+    items[0].tax_percent = 9.0
+    order_batch = batch.OrderBatch.from_items(items)
+    default_taxes = list(order_batch.line_tax_cents())
+
+    taxes.set_tax_table(table, "UT")
+    try:
+        expected = [item.tax_cents() for item in uncached_copies(items)]
+        assert list(order_batch.line_tax_cents()) == expected
+    finally:
+        taxes.set_tax_table(taxes.TaxTable({taxes.DEFAULT_JURISDICTION: {}}))
+    assert list(order_batch.line_tax_cents(table, "UT")) == expected
+    assert order_batch.order_tax_cents(table, "UT") == sum(expected)
+    assert list(order_batch.line_tax_cents(table, "OR")) == default_taxes
+    assert list(order_batch.line_tax_cents()) == default_taxes
+
+
+def uncached_copies(items):
+    """Return copies of items without their cached tax."""
+    copies = pickle.loads(pickle.dumps(items))
+    for item in copies:
+        item._tax = None
+    return copies
@@ -0,0 +1,24 @@
+"""Test cases for the benchmark suite's baseline handling."""
+
+try:
+    from dessert_shop import bench_suite
+except Exception:  # pragma: no cover
+    import bench_suite
+
+
+def test_every_case_runs(monkeypatch):
+    monkeypatch.setattr(bench_suite, "ITEMS_PER_MEASUREMENT", 8)
+    results = bench_suite.run_suite(sizes=[4], repeat=1)
+    assert set(results) == {f"{case.name}[4]" for case in bench_suite.CASES}
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_baseline_round_trip_and_compare(tmp_path):
+    path = tmp_path / "baseline.json"
+    bench_suite.save_baseline(path, {"add[10]": 1.0, "sort[10]": 2.0})
+    baseline = bench_suite.load_baseline(path)
+    assert baseline == {"add[10]": 1.0, "sort[10]": 2.0}
+
+    results = {"add[10]": 1.2, "sort[10]": 2.6, "str[10]": 9.0}
+    assert bench_suite.compare(results, baseline, tolerance=0.25) == ["sort[10]"]
+    assert bench_suite.compare(results, baseline, tolerance=0.1) == ["add[10]", "sort[10]"]
@@ -0,0 +1,108 @@
+"""Test cases for parallel multi-order checkout."""
+
+try:
+    from dessert_shop import checkout
+    from dessert_shop import dessert as ds
+    from dessert_shop import money, pricing
+    from dessert_shop.payment import PayType
+except Exception:  # pragma: no cover
+    import checkout
+    import dessert as ds
+    import money
+    import pricing
+    from payment import PayType
+
+import pytest
+
+
+def make_orders(count):
+    """Return `count` (order_id, Order) pairs with a few items each."""
+    orders = []
+    for i in range(count):
+        order = ds.Order()
+        order.add(ds.Sundae("Vanilla", 1 + i % 3, 0.69, "Hot Fudge", 1.29))
+        order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+        order.add(ds.Cookie("Chocolate Chip", i % 24, 3.99))
+        orders.append((str(i), order))
+    return orders
+
+
+def make_rows(count):
+    """Return `count` (order_id, rows) pairs as grouped by ingest.iter_order_rows."""
+    groups = []
+    for i in range(count):
+        order_id = str(i)
+        sundae = {"kind": "sundae", "name": "Vanilla", "quantity": str(1 + i % 3)}
+        sundae.update(price="0.69", topping_name="Hot Fudge", topping_price="1.29")
+        candy = {"kind": "candy", "name": "Candy Corn", "quantity": "1.5", "price": "0.25"}
+        cookie = {"kind": "cookie", "name": "Chocolate Chip", "price": "3.99"}
+        cookie["quantity"] = str(12 * (i % 10))
+        records = (sundae, candy, cookie)
+        rows = [(line, dict(record, order_id=order_id)) for line, record in enumerate(records, 1)]
+        groups.append((order_id, rows))
+    return groups
+
+
+def test_checkout_order_sorts_and_sets_pay_type():
+    _, order = make_orders(1)[0]
+    receipt = checkout.checkout_order(order, PayType.PHONE)
+    assert order.order[0].name == "Chocolate Chip"  # 0 cookies cost $0.00
+    assert receipt.endswith("Paid with PHONE")
+
+
+def test_checkout_orders_serial():
+    results = list(checkout.checkout_orders(make_orders(10), workers=1, chunksize=3))
+    assert [order_id for order_id, _ in results] == [str(i) for i in range(10)]
+    assert all(receipt.endswith("Paid with CASH") for _, receipt in results)
+
+
+def test_checkout_orders_parallel_matches_serial():
+    serial = list(checkout.checkout_orders(make_orders(50), PayType.CARD, workers=1))
+    parallel = list(
+        checkout.checkout_orders(make_orders(50), PayType.CARD, workers=2, chunksize=4)
+    )
+    assert parallel == serial
+
+
+def test_checkout_orders_invalid_chunksize():
+    with pytest.raises(ValueError):
+        list(checkout.checkout_orders(make_orders(1), chunksize=0))
+
+
+def test_checkout_rows_matches_orders():
+    from_rows = list(checkout.checkout_rows(make_rows(20), workers=1))
+    from_orders = list(checkout.checkout_orders(make_orders(20), workers=1))
+    assert [order_id for order_id, _ in from_rows] == [str(i) for i in range(20)]
+    assert len(from_rows) == len(from_orders)
+
+
+def test_checkout_rows_workers_use_parent_policies():
+    pricing.set_pricing_rules(["Cookie: 10% off above 5 dozen"])
+    money.set_rounding(money.Rounding.HALF_EVEN)
+    try:
+        serial = list(checkout.checkout_rows(make_rows(30), PayType.CARD, workers=1))
+        parallel = list(
+            checkout.checkout_rows(make_rows(30), PayType.CARD, workers=2, chunksize=4)
+        )
+        orders = list(checkout.checkout_orders(make_orders(30), workers=2, chunksize=4))
+        expected = list(checkout.checkout_orders(make_orders(30), workers=1))
+    finally:
+        pricing.set_pricing_rules(())
+        money.set_rounding(money.Rounding.HALF_UP)
+    assert parallel == serial
+    assert orders == expected
+    unpriced = list(checkout.checkout_rows(make_rows(30), PayType.CARD, workers=1))
+    assert unpriced != serial
+
+
+def test_checkout_rows_reports_errors_in_order():
+    groups = make_rows(6)
+    groups[1][1][0][1]["price"] = "-1"
+    groups[4][1].append((4, None))
+    groups.insert(2, ("bad", [(9, {"order_id": "bad", "kind": "pie", "name": "Apple"})]))
+    errors = []
+    results = list(
+        checkout.checkout_rows(groups, workers=2, chunksize=1, on_error=errors.append)
+    )
+    assert [order_id for order_id, _ in results] == ["0", "1", "2", "3", "4", "5"]
+    assert [error.line for error in errors] == [1, 9, 4]
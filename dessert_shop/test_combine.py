@@ -0,0 +1,86 @@
+"""Test cases for the combinable class registry."""
+
+try:
+    from dessert_shop import combine
+    from dessert_shop import dessert as ds
+except Exception:  # pragma: no cover
+    import combine
+    import dessert as ds
+
+import pytest
+
+
+class Fudge(ds.Candy):
+    """Candy subclass that is not registered itself."""
+
+
+class Brownie(ds.DessertItem):
+    """Combinable through the Protocol only, without a combine_key()."""
+
+    __slots__ = ("count",)
+
+    def __init__(self, name="", count=0):
+        super().__init__(name)
+        self.count = count
+
+    def _cost_cents(self):
+        return self.count * 100
+
+    def receipt_title(self):
+        return self.name
+
+    def receipt_details(self):
+        return []
+
+    def can_combine(self, other):
+        return isinstance(other, Brownie) and other.name == self.name
+
+    def combine(self, other):
+        self.count += other.count
+        return self
+
+
+def test_registered_keys():
+    candy = ds.Candy("Candy Corn", 1.5, 0.25)
+    cookie = ds.Cookie("Chocolate Chip", 6, 3.99)
+    assert combine.combine_spec(ds.Candy).key(candy) == (ds.Candy, "Candy Corn", 0.25)
+    assert combine.combine_spec(ds.Cookie).key(cookie) == (ds.Cookie, "Chocolate Chip", 3.99)
+    assert combine.combine_spec(ds.Candy).key_attributes == ("name", "price_per_pound")
+
+
+def test_non_combinable_classes():
+    assert combine.combine_spec(ds.IceCream) is None
+    assert combine.combine_spec(ds.Sundae) is None
+
+
+def test_unregistered_subclass_inherits_key():
+    fudge = Fudge("Fudge", 1.0, 4.0)
+    assert combine.combine_spec(Fudge) is combine.combine_spec(ds.Candy)
+    assert combine.combine_spec(Fudge).key(fudge) == (ds.Candy, "Fudge", 4.0)
+
+
+def test_combine_key_method_of_unregistered_class():
+    class Truffle(Brownie):
+        def combine_key(self):
+            return (Truffle, self.name)
+
+    truffle = Truffle("Dark", 2)
+    assert combine.combine_spec(Truffle).key(truffle) == (Truffle, "Dark")
+    assert combine.combine_spec(Truffle).key_attributes == ()
+
+
+def test_unregistered_classes_fall_back_to_protocol():
+    assert combine.combine_spec(Brownie).key is None
+
+    order = ds.Order()
+    order.add(Brownie("Walnut", 2))
+    order.add(ds.Candy("Fudge", 1.0, 4.0))
+    order.add(Brownie("Walnut", 3))
+    order.add(Brownie("Plain", 1))
+    assert [item.name for item in order] == ["Walnut", "Fudge", "Plain"]
+    assert order.order[0].count == 5
+
+
+def test_register_requires_protocol():
+    with pytest.raises(TypeError):
+        combine.register_combinable("name")(ds.IceCream)
@@ -0,0 +1,120 @@
+"""Stress tests for ConcurrentOrder with many threads adding at once."""
+
+try:
+    from dessert_shop import dessert as ds
+except Exception:  # pragma: no cover
+    import dessert as ds
+
+import pickle
+import sys
+import threading
+
+import pytest
+
+THREADS = 8
+ADDS_PER_THREAD = 500
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Switch threads as often as possible to provoke lost updates."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target):
+    start = threading.Barrier(THREADS)
+
+    def worker():
+        start.wait()
+        target()
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_adds_conserve_totals():
+    """Racing adds of the same combinable items lose no weight or quantity."""
+    order = ds.ConcurrentOrder()
+
+    def add_items():
+        for _ in range(ADDS_PER_THREAD):
+            order.add(ds.Candy("Gummy Bears", 0.25, 0.40))
+            order.add(ds.Cookie("Chocolate Chip", 3, 3.99))
+            order.add(ds.Candy("Candy Corn", 0.5, 0.25))
+            order.add(ds.IceCream("Vanilla", 1, 0.79))
+
+    run_threads(add_items)
+
+    adds = THREADS * ADDS_PER_THREAD
+    candies = {item.name: item for item in order if isinstance(item, ds.Candy)}
+    cookies = [item for item in order if isinstance(item, ds.Cookie)]
+    ice_creams = [item for item in order if isinstance(item, ds.IceCream)]
+    assert candies["Gummy Bears"].candy_weight == 0.25 * adds
+    assert candies["Candy Corn"].candy_weight == 0.5 * adds
+    assert len(cookies) == 1
+    assert cookies[0].cookie_quantity == 3 * adds
+    assert len(ice_creams) == adds
+    assert len(order) == 3 + adds
+
+    # the running totals agree with the items they were built from
+    assert order.order_cost_cents() == sum(item.cost_cents() for item in order)
+    assert order.order_tax_cents() == sum(item.tax_cents() for item in order)
+
+
+def test_plain_order_threads_do_not_crash():
+    """A plain Order is not thread-safe, but racing adds must not raise."""
+    order = ds.Order()
+    errors = []
+
+    def add_items():
+        try:
+            for _ in range(ADDS_PER_THREAD):
+                order.add(ds.Candy("Gummy Bears", 0.25, 0.40))
+                order.add(ds.Cookie("Chocolate Chip", 3, 3.99))
+        except Exception as error:  # pragma: no cover - reported below
+            errors.append(error)
+
+    run_threads(add_items)
+    assert errors == []
+
+
+def test_concurrent_adds_and_removes():
+    """Each thread removes what it added; the order ends up empty."""
+    order = ds.ConcurrentOrder(stripes=2)
+
+    def add_and_remove():
+        for _ in range(ADDS_PER_THREAD // 5):
+            sundae = ds.Sundae("Vanilla", 2, 0.79, "Fudge", 0.50)
+            order.add(sundae)
+            order.add(ds.Candy("Gummy Bears", 0.25, 0.40))
+            order.remove(sundae)
+
+    run_threads(add_and_remove)
+
+    assert len(order) == 1
+    (candy,) = order
+    assert candy.candy_weight == 0.25 * THREADS * (ADDS_PER_THREAD // 5)
+    assert order.order_cost_cents() == candy.cost_cents()
+    assert order.order_tax_cents() == candy.tax_cents()
+
+
+def test_concurrent_order_pickles():
+    """Locks are dropped when pickling and recreated on load."""
+    order = ds.ConcurrentOrder(stripes=4)
+    order.add(ds.Candy("Gummy Bears", 0.25, 0.40))
+    copy = pickle.loads(pickle.dumps(order))
+    copy.add(ds.Candy("Gummy Bears", 0.25, 0.40))
+    assert len(copy._stripes) == 4
+    assert copy.order[0].candy_weight == 0.5
+    assert copy.order_cost() == copy.order[0].calculate_cost()
+
+
+def test_concurrent_order_invalid_stripes():
+    with pytest.raises(ValueError):
+        ds.ConcurrentOrder(stripes=0)
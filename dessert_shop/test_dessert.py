@@ -174,3 +174,86 @@ def test_dessert_item_comparison_ge() -> None:
     candy3 = ds.Candy("Candy3", 1.0, 3.0)  # cost = 3.0
     assert candy1 >= candy2
     assert candy1 >= candy3
+
+
+def test_cost_and_tax_are_cached() -> None:
+    """Test that cost and tax are computed once and then reused."""
+    s = ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29)
+    assert s.calculate_cost() == 3.36
+    assert s.calculate_tax() == 0.24
+    assert s._cost == 336
+    assert s._tax == 24
+
+
+def test_cache_invalidated_by_field_edit() -> None:
+    """Test that editing a pricing field recomputes cost and tax."""
+    i = ds.IceCream("Vanilla", 2, 1.25)
+    assert i.calculate_cost() == 2.5
+    i.scoop_count = 4
+    assert i.calculate_cost() == 5.0
+    assert i.calculate_tax() == 0.36
+    i.tax_percent = 10.0
+    assert i.calculate_tax() == 0.5
+
+
+def test_cache_invalidated_by_combine() -> None:
+    """Test that combining candies recomputes the cached cost."""
+    c1 = ds.Candy("Gummy Bears", 1.0, 2.0)
+    c2 = ds.Candy("Gummy Bears", 0.5, 2.0)
+    assert c1.calculate_cost() == 2.0
+    c1.combine(c2)
+    assert c1.calculate_cost() == 3.0
+    assert c1.calculate_tax() == 0.22
+
+
+def test_items_are_slotted() -> None:
+    """Test that dessert items have no per-instance __dict__."""
+    for item in (
+        ds.Candy("Candy Corn", 1.5, 0.25),
+        ds.Cookie("Chocolate Chip", 6, 3.99),
+        ds.IceCream("Pistachio", 2, 0.79),
+        ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29),
+    ):
+        assert not hasattr(item, "__dict__")
+        assert isinstance(item.packaging, str)
+
+
+def test_tax_percent_default_and_override() -> None:
+    """Test that tax_percent uses the class default until set on the item."""
+    c1 = ds.Candy("Candy Corn", 1.5, 0.25)
+    c2 = ds.Candy("Candy Corn", 1.5, 0.25)
+    c1.tax_percent = 10
+    assert c1.tax_percent == 10.0
+    assert c2.tax_percent == ds.DessertItem.default_tax_percent == 7.25
+
+
+def test_items_pickle_round_trip() -> None:
+    """Test that slotted items survive pickling (used by parallel checkout)."""
+    import pickle
+
+    s = ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29)
+    s.tax_percent = 6.0
+    copy = pickle.loads(pickle.dumps(s))
+    assert copy.topping_name == "Hot Fudge"
+    assert copy.tax_percent == 6.0
+    assert copy.calculate_cost() == s.calculate_cost()
+
+
+class LabeledCandy(ds.Candy):
+    """Subclass without __slots__: its own attributes live in __dict__."""
+
+    def __init__(self, *args, label: str = "") -> None:
+        super().__init__(*args)
+        self.label = label
+
+
+def test_items_copy_and_pickle_keep_dict_attributes() -> None:
+    """Test that copies of an item subclass keep its __dict__ attributes."""
+    import copy
+    import pickle
+
+    candy = LabeledCandy("Candy Corn", 1.5, 0.25, label="Halloween")
+    for clone in (copy.copy(candy), pickle.loads(pickle.dumps(candy))):
+        assert clone.label == "Halloween"
+        assert clone.candy_weight == 1.5
+        assert clone.calculate_cost() == candy.calculate_cost()
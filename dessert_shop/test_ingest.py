@@ -0,0 +1,122 @@
+"""Test cases for bulk order ingestion from CSV and JSONL."""
+
+import io
+import json
+
+try:
+    from dessert_shop import ingest
+    from dessert_shop import dessert as ds
+    from dessert_shop.payment import PayType
+except Exception:  # pragma: no cover
+    import ingest
+    import dessert as ds
+    from payment import PayType
+
+import pytest
+
+CSV_TEXT = """order_id,kind,name,quantity,price,topping_name,topping_price,pay_type
+1,candy,Candy Corn,1.5,0.25,,,CARD
+1,cookie,Chocolate Chip,6,3.99,,,
+1,candy,Candy Corn,0.5,0.25,,,
+2,sundae,Vanilla,3,0.69,Hot Fudge,1.29,PHONE
+2,ice_cream,Pistachio,2.5,0.79,,,
+2,ice_cream,Pistachio,2,-0.79,,,
+3,ice_cream,Pistachio,2,0.79,,,
+"""
+
+
+def load(text, fmt="csv"):
+    """Return (orders, errors) loaded from text."""
+    errors = []
+    orders = list(ingest.iter_orders(io.StringIO(text), fmt, errors.append))
+    return orders, errors
+
+
+def test_iter_orders_csv():
+    orders, errors = load(CSV_TEXT)
+    assert [order_id for order_id, _ in orders] == ["1", "2", "3"]
+
+    first = orders[0][1]
+    assert len(first) == 2
+    assert first.order[0].candy_weight == 2.0
+    assert isinstance(first.order[1], ds.Cookie)
+    assert first.get_pay_type() == PayType.CARD
+
+    second = orders[1][1]
+    assert len(second) == 1
+    assert second.order[0].topping_name == "Hot Fudge"
+    assert second.get_pay_type() == PayType.PHONE
+
+    assert orders[2][1].get_pay_type() == PayType.CASH
+
+
+def test_iter_orders_reports_malformed_rows():
+    _, errors = load(CSV_TEXT)
+    assert errors == [
+        ingest.RowError(6, "quantity: Invalid input. Please enter an integer."),
+        ingest.RowError(7, "price: Price cannot be negative. Please try again."),
+    ]
+
+
+def test_iter_orders_skips_non_finite_rows():
+    text = """order_id,kind,name,quantity,price,topping_name,topping_price,pay_type
+1,candy,Gummy Bears,nan,0.25,,,
+1,cookie,Oatmeal,2,inf,,,
+1,candy,Gummy Bears,1.0,0.25,,,
+2,candy,Gumdrops,1e308,1e10,,,
+3,cookie,Oatmeal,2,3.45,,,
+"""
+    orders, errors = load(text)
+    assert [order_id for order_id, _ in orders] == ["1", "3"]
+    assert len(orders[0][1]) == 1
+    assert [error.line for error in errors] == [2, 3, 5]
+    assert errors[0].message == "quantity: Invalid input. Please enter a number."
+    assert errors[1].message.startswith("price: ")
+
+
+def test_iter_orders_jsonl():
+    rows = [
+        {"order_id": 7, "kind": "cookie", "name": "Oatmeal", "quantity": 12, "price": 3.45},
+        {"order_id": 7, "kind": "cookie", "name": "Oatmeal", "quantity": 2.0, "price": 3.45},
+        {"order_id": 7, "kind": "pie", "name": "Apple", "quantity": 1, "price": 9.0},
+        {"order_id": 7, "kind": "candy", "name": "Gummy", "quantity": 1, "price": 1, "pay_type": "cash"},
+    ]
+    text = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+    orders, errors = load(text, "jsonl")
+    assert len(orders) == 1
+    order_id, order = orders[0]
+    assert order_id == "7"
+    assert [type(item) for item in order] == [ds.Cookie, ds.Candy]
+    # 2.0 is a whole number of cookies, combined with the first row
+    assert order.order[0].cookie_quantity == 14
+    assert [error.line for error in errors] == [3, 5]
+    assert errors[0].message.startswith("kind: ")
+
+
+def test_write_receipts():
+    out = io.StringIO()
+    count = ingest.write_receipts(io.StringIO(CSV_TEXT), out, "csv", lambda error: None)
+    assert count == 3
+    text = out.getvalue()
+    assert text.startswith("Order 1\nName, Cost, Tax\n")
+    assert "Paid with CARD" in text
+    assert "Paid with PHONE" in text
+
+
+def test_parse_item_sundae_without_topping_price():
+    record = {"kind": "sundae", "name": "Vanilla", "quantity": "2", "price": "0.69"}
+    sundae = ingest.parse_item(dict(record, topping_name="Sprinkles", topping_price=" "))
+    assert sundae.topping_price == 0.0
+    assert ingest.parse_item(record).topping_price == 0.0
+    with pytest.raises(ValueError, match="^topping_price: "):
+        ingest.parse_item(dict(record, topping_price="-1"))
+
+
+def test_parse_item_unknown_kind():
+    with pytest.raises(ValueError):
+        ingest.parse_item({"kind": "pie", "name": "Apple", "quantity": "1", "price": "1"})
+
+
+def test_format_for():
+    assert ingest.format_for("orders.csv") == "csv"
+    assert ingest.format_for("orders.JSONL") == "jsonl"
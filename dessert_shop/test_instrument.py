@@ -0,0 +1,102 @@
+"""Test cases for the opt-in hot-path instrumentation."""
+
+import io
+import json
+
+try:
+    from dessert_shop import checkout
+    from dessert_shop import dessert as ds
+    from dessert_shop import instrument
+except Exception:  # pragma: no cover
+    import checkout
+    import dessert as ds
+    import instrument
+
+
+def make_order():
+    order = ds.Order()
+    order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    order.add(ds.Candy("Candy Corn", 0.5, 0.25))
+    order.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+    return order
+
+
+def test_disabled_methods_are_not_wrapped():
+    add = ds.Order.__dict__["add"]
+    assert not instrument.enabled()
+    with instrument.instrumented(instrument.HistogramSink()):
+        assert instrument.enabled()
+        assert ds.Order.__dict__["add"] is not add
+    assert not instrument.enabled()
+    assert ds.Order.__dict__["add"] is add
+
+
+def test_histogram_sink_counts_calls():
+    with instrument.instrumented(instrument.HistogramSink()) as sink:
+        order = make_order()
+        order.sort()
+        str(order)
+        order.order[0].calculate_tax()
+    assert sink.count("Order.add") == 3
+    assert sink.count("Candy.combine") == 1
+    assert sink.count("Order.sort") == 1
+    assert sink.count("Order.__str__") == 1
+    assert sink.count("DessertItem.cost_cents") > 0
+    assert sink.count("Cookie.combine") == 0
+    assert sink.count("DessertItem.calculate_tax") == 1
+
+    summary = sink.summary()["Order.add"]
+    assert summary["count"] == 3
+    assert sum(summary["buckets"].values()) == 3
+    assert summary["min_us"] <= summary["mean_us"] <= summary["max_us"]
+    json.loads(json.dumps(sink.summary()))
+
+
+def test_receipt_generators_are_timed_during_checkout():
+    order = make_order()
+    with instrument.instrumented(instrument.HistogramSink()) as sink:
+        receipt = checkout.checkout_order(order)
+        lines = list(order.line_items())
+        rows = order.receipt_rows()
+        next(rows)
+        rows.close()
+    assert receipt.endswith("Paid with CASH")
+    assert len(lines) == 2
+    # one event per iteration, including the one closed early
+    assert sink.count("Order.receipt_rows") == 2
+    assert sink.count("Order.line_items") == 1
+    assert sink.count("Order.__str__") == 1
+
+
+def test_json_lines_sink():
+    stream = io.StringIO()
+    with instrument.instrumented(instrument.JsonLinesSink(stream)):
+        ds.Cookie("Chocolate Chip", 6, 3.99).calculate_tax()
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    names = [event["name"] for event in events]
+    assert "DessertItem.calculate_tax" in names
+    assert all(event["seconds"] >= 0 for event in events)
+
+
+def test_nested_instrumentation_restores_previous_sink():
+    outer = instrument.HistogramSink()
+    inner = instrument.HistogramSink()
+    with instrument.instrumented(outer):
+        with instrument.instrumented(inner):
+            ds.Order().add(ds.IceCream("Vanilla", 1, 0.79))
+        ds.Order().add(ds.IceCream("Vanilla", 1, 0.79))
+    assert inner.count("Order.add") == 1
+    assert outer.count("Order.add") == 1
+
+
+def test_hook_points_are_registered():
+    points = instrument.hook_points()
+    for name in [
+        "Order.add",
+        "Order.sort",
+        "Order.__str__",
+        "Order.receipt_rows",
+        "Order.line_items",
+        "DessertItem.calculate_cost",
+    ]:
+        assert name in points
@@ -0,0 +1,103 @@
+"""Test cases for the integer-cents money helpers."""
+
+try:
+    from dessert_shop import money
+    from dessert_shop import dessert as ds
+except Exception:  # pragma: no cover
+    import money
+    import dessert as ds
+
+import pytest
+
+
+@pytest.fixture
+def half_even():
+    """Switch to banker's rounding for one test."""
+    money.set_rounding(money.Rounding.HALF_EVEN)
+    yield
+    money.set_rounding(money.Rounding.HALF_UP)
+
+
+def test_default_rounding_is_half_up():
+    assert money.get_rounding() == money.Rounding.HALF_UP
+
+
+def test_to_cents_exact_values():
+    assert money.to_cents(3.99) == 399
+    assert money.to_cents(0.0) == 0
+    assert money.to_cents(1.29) == 129
+
+
+def test_to_cents_half_up():
+    assert money.to_cents(0.125) == 13
+    assert money.to_cents(0.375) == 38
+    assert money.to_cents(-0.125) == -13
+
+
+def test_to_cents_rounds_the_exact_float():
+    # 0.57499999999999996 and 0.57500000000000007 as floats: neither is a tie
+    assert money.to_cents(2 / 12 * 3.45) == 57
+    assert money.to_cents(2 * 3.45 / 12) == 58
+    # 0.17499999999999999
+    assert money.to_cents(0.5 * 0.35) == 17
+
+
+def test_to_cents_half_even(half_even):
+    assert money.to_cents(0.125) == 12
+    assert money.to_cents(0.375) == 38
+    assert money.to_cents(-0.125) == -12
+
+
+def test_to_cents_half_even_matches_round(half_even):
+    """HALF_EVEN reproduces the round(amount, 2) pricing it replaced.
+
+    HALF_UP, the default, only differs on amounts that are exactly half
+    a cent (0.5 lb at $0.25 is $0.13 rather than $0.12), so costs and
+    taxes round ties the same way.
+    """
+    for quantity in range(1, 40):
+        for price in range(0, 1000, 7):
+            for amount in (quantity / 8 * price / 100, quantity / 12 * (price / 100)):
+                assert money.to_cents(amount) == round(round(amount, 2) * 100)
+
+
+def test_round_div():
+    assert money.round_div(5, 10) == 1
+    assert money.round_div(4, 10) == 0
+    assert money.round_div(15, 10) == 2
+    assert money.round_div(-5, 10) == -1
+
+
+def test_percent_of():
+    # 7.25% of $0.38 = $0.02755 -> $0.03
+    assert money.percent_of(38, money.to_basis_points(7.25)) == 3
+    # 7.25% of $2.00 = $0.145 -> $0.15
+    assert money.percent_of(200, 725) == 15
+
+
+def test_percent_of_half_even(half_even):
+    assert money.percent_of(200, 725) == 14
+
+
+def test_format_cents():
+    assert money.format_cents(0) == "0.00"
+    assert money.format_cents(5) == "0.05"
+    assert money.format_cents(205) == "2.05"
+    assert money.format_cents(-205) == "-2.05"
+
+
+def test_set_invalid_rounding():
+    with pytest.raises(ValueError):
+        money.set_rounding("HALF_DOWN")  # type: ignore
+
+
+def test_order_subtotal_and_tax_lines_agree():
+    """Test that the receipt tax line is the sum of the item tax lines."""
+    order = ds.Order()
+    order.add(ds.Candy("Gummy Bears", 0.5, 0.35))
+    order.add(ds.Cookie("Oatmeal Raisin", 2, 3.45))
+    order.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+    assert order.order_cost_cents() == 17 + 57 + 200
+    assert order.order_tax_cents() == 1 + 4 + 15
+    assert "Order Subtotals:, $2.74, [Tax: $0.20]" in str(order)
+    assert "Order Total:, , $2.94" in str(order)
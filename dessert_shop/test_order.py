@@ -101,3 +101,268 @@ def test_order_iterator():
     # Test StopIteration when exhausted
     with pytest.raises(StopIteration):
         next(iterator)
+
+
+def test_order_add_combines_like_items():
+    """Test that Order.add merges like items into the first matching item."""
+    order = ds.Order()
+    order.add(ds.Candy("Gummy Bears", 0.5, 0.25))
+    order.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+    order.add(ds.Candy("Gummy Bears", 1.0, 0.25))
+    order.add(ds.Candy("Gummy Bears", 1.0, 0.35))  # different price
+    order.add(ds.Cookie("Chocolate Chip", 12, 3.99))
+
+    assert len(order) == 3
+    assert order.order[0].candy_weight == 1.5
+    assert order.order[1].cookie_quantity == 18
+    assert order.order[2].price_per_pound == 0.35
+
+
+def test_order_add_never_combines_ice_cream():
+    """Test that non-Combinable items are always appended."""
+    order = ds.Order()
+    order.add(ds.IceCream("Vanilla", 2, 1.0))
+    order.add(ds.IceCream("Vanilla", 2, 1.0))
+    assert len(order) == 2
+
+
+def test_order_add_after_item_edited():
+    """Test that editing an item already in the order keeps combining correct."""
+    order = ds.Order()
+    order.add(ds.Candy("Gummy Bears", 0.5, 0.25))
+    order.order[0].name = "Gumdrops"
+
+    order.add(ds.Candy("Gummy Bears", 1.0, 0.25))
+    order.add(ds.Candy("Gumdrops", 1.0, 0.25))
+
+    assert len(order) == 2
+    assert order.order[0].name == "Gumdrops"
+    assert order.order[0].candy_weight == 1.5
+    assert order.order[1].candy_weight == 1.0
+
+
+def test_order_add_after_item_renamed():
+    """Test that an item renamed to an existing key still merges into it."""
+    order = ds.Order()
+    order.add(ds.Candy("Gummy Bears", 0.5, 0.25))
+    order.add(ds.Cookie("Oatmeal", 2, 3.99))
+    order.order[0].name = "Gumdrops"
+
+    order.add(ds.Candy("Gumdrops", 1.0, 0.25))
+    order.add(ds.Candy("Gummy Bears", 1.0, 0.25))
+
+    assert len(order) == 3
+    assert order.order[0].name == "Gumdrops"
+    assert order.order[0].candy_weight == 1.5
+    assert order.order[2].name == "Gummy Bears"
+    assert order.order_cost() == pytest.approx(0.38 + 0.67 + 0.25)
+
+
+def test_order_item_shared_between_orders():
+    """Test that adding an item to a second order gives that order a copy."""
+    first, second = ds.Order(), ds.Order()
+    ice_cream = ds.IceCream("Vanilla", 1, 1.0)
+    first.add(ice_cream)
+    second.add(ice_cream)
+    assert second.order[0] is not ice_cream
+
+    ice_cream.scoop_count = 3
+    assert first.order_cost() == 3.0
+    assert second.order_cost() == 1.0
+
+
+def test_order_copied_item_is_not_in_the_order():
+    """Test that editing a copy of an item leaves the order's totals alone."""
+    import copy
+
+    order = ds.Order()
+    order.add(ds.IceCream("Vanilla", 1, 1.0))
+    clone = copy.copy(order.order[0])
+    clone.scoop_count = 10
+    assert order.order_cost() == 1.0
+    assert order.order_cost() == sum(item.calculate_cost() for item in order)
+
+
+def test_order_same_item_added_twice():
+    """Test that an item added twice is totaled once per line."""
+    order = ds.Order()
+    ice_cream = ds.IceCream("Vanilla", 1, 1.0)
+    order.add(ice_cream)
+    order.add(ice_cream)
+    ice_cream.scoop_count = 2
+    assert len(order) == 2
+    assert order.order_cost() == 3.0
+    assert order.order_cost() == sum(item.calculate_cost() for item in order)
+
+
+def test_order_copy_and_pickle_relink_items():
+    """Test that copied and unpickled orders keep their own running totals."""
+    import copy
+    import pickle
+
+    order = ds.Order()
+    order.add(ds.IceCream("Vanilla", 1, 1.0))
+    order.add(ds.Candy("Gummy Bears", 1.0, 0.25))
+    for clone in (copy.copy(order), copy.deepcopy(order), pickle.loads(pickle.dumps(order))):
+        clone.order[0].scoop_count = 4
+        clone.add(ds.Candy("Gummy Bears", 1.0, 0.25))
+        assert len(clone) == 2
+        assert clone.order_cost() == 4.0 + 0.5
+        assert order.order_cost() == 1.0 + 0.25
+
+
+def test_order_add_many_combinable_items():
+    """Test combining a large number of like items."""
+    order = ds.Order()
+    for i in range(1000):
+        order.add(ds.Cookie(f"Cookie {i % 10}", 1, 3.99))
+    assert len(order) == 10
+    assert all(cookie.cookie_quantity == 100 for cookie in order)
+
+
+def test_order_receipt_rows_match_to_list_and_str():
+    """Test that the streamed receipt rows build the same receipt as __str__."""
+    order = ds.Order()
+    order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    order.add(ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29))
+
+    rows = list(order.receipt_rows())
+    assert rows == order.to_list()
+    assert str(order) == "\n".join(", ".join(row) for row in rows)
+    assert rows[2:4] == [
+        ["Candy Corn (Bag)"],
+        ["-    1.5 lbs. @ $0.25/lb:", "$0.38", "[Tax: $0.03]"],
+    ]
+    assert rows[4:7] == [
+        ["Hot Fudge Vanilla Sundae (Boat)"],
+        ["-    3 scoops. @ $0.69/scoop"],
+        ["-    Hot Fudge topping @ $1.29:", "$3.36", "[Tax: $0.24]"],
+    ]
+    assert rows[-1] == ["Paid with CASH"]
+
+
+def test_order_line_items():
+    """Test that line_items yields one structured row per item."""
+    order = ds.Order()
+    order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    order.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+
+    items = list(order.line_items())
+    assert items == [
+        ds.LineItem("Candy Corn (Bag)", 38, 3),
+        ds.LineItem("Chocolate Chip Cookies (Box)", 200, 15),
+    ]
+    assert items[1].name == "Chocolate Chip Cookies (Box)"
+    assert items[1].cost == 200
+    assert items[1].tax == 15
+
+
+def test_order_running_totals():
+    """Test that subtotal and tax follow adds, merges, edits and removals."""
+    order = ds.Order()
+    assert order.order_cost() == 0
+    candy = ds.Candy("Candy Corn", 1.5, 0.25)
+    order.add(candy)
+    assert order.order_cost_cents() == 38
+    assert order.order_tax_cents() == 3
+
+    # merge: 3.0 lbs @ 0.25 = 0.75
+    order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    assert order.order_cost_cents() == 75
+
+    # direct edit of an item in the order
+    sundae = ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29)
+    order.add(sundae)
+    sundae.scoop_count = 1
+    assert order.order_cost_cents() == 75 + 69 + 129
+
+    order.remove(candy)
+    assert len(order) == 1
+    assert order.order_cost_cents() == 198
+    assert order.order_tax_cents() == sundae.tax_cents()
+
+    # a removed item no longer affects the order
+    candy.candy_weight = 10
+    assert order.order_cost_cents() == 198
+
+
+def test_order_running_totals_match_items():
+    """Test that the running totals equal the sum over the items."""
+    order = ds.Order()
+    for i in range(200):
+        order.add(ds.Cookie(f"Cookie {i % 7}", i % 13, 3.45))
+        order.add(ds.IceCream("Pistachio", i % 4, 0.79))
+    order.order[3].price_per_scoop = 1.5
+    assert order.order_cost_cents() == sum(item.cost_cents() for item in order)
+    assert order.order_tax_cents() == sum(item.tax_cents() for item in order)
+
+
+def test_order_remove_is_by_identity():
+    """Test that remove() removes the given object, not an equal-cost one."""
+    order = ds.Order()
+    first = ds.IceCream("Vanilla", 2, 1.0)
+    second = ds.IceCream("Chocolate", 2, 1.0)
+    order.add(first)
+    order.add(second)
+    order.remove(second)
+    assert order.order == [first]
+    assert order.order[0] is first
+    with pytest.raises(ValueError):
+        order.remove(second)
+
+
+def test_order_remove_allows_combining_again():
+    """Test that removing a combinable item clears it from the combine index."""
+    order = ds.Order()
+    candy = ds.Candy("Gummy Bears", 0.5, 0.25)
+    order.add(candy)
+    order.remove(candy)
+    order.add(ds.Candy("Gummy Bears", 1.0, 0.25))
+    assert candy.candy_weight == 0.5
+    assert order.order[0].candy_weight == 1.0
+
+
+def make_tied_order():
+    """Return an order of ice creams with many equal costs."""
+    order = ds.Order()
+    for i in range(60):
+        order.add(ds.IceCream(f"Flavor {i}", i % 5, 0.79))
+    return order
+
+
+def test_order_sort_reverse_is_stable():
+    """Test that sort(reverse=True) orders by cost and keeps ties in order."""
+    order = make_tied_order()
+    expected = sorted(order.order, key=lambda item: item.calculate_cost(), reverse=True)
+    order.sort(reverse=True)
+    assert [item.name for item in order] == [item.name for item in expected]
+
+
+def test_order_top_k():
+    """Test that top_k matches the first k items of a full sort."""
+    order = make_tied_order()
+    items = list(order.order)
+    for k in (0, 1, 7, 60, 100):
+        assert order.top_k(k) == sorted(items)[:k]
+        assert [i.name for i in order.top_k(k)] == [i.name for i in sorted(items)[:k]]
+        expected = sorted(items, reverse=True)[:k]
+        assert [i.name for i in order.top_k(k, reverse=True)] == [i.name for i in expected]
+    # top_k does not reorder the order itself
+    assert order.order == items
+
+
+def test_order_nested_iteration():
+    """Test that nested loops over one order use independent iterators."""
+    order = ds.Order()
+    order.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    order.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+    order.add(ds.IceCream("Pistachio", 2, 0.79))
+
+    pairs = [(outer.name, inner.name) for outer in order for inner in order]
+    assert len(pairs) == 9
+
+    first = iter(order)
+    second = iter(order)
+    assert next(first).name == "Candy Corn"
+    assert next(first).name == "Chocolate Chip"
+    assert next(second).name == "Candy Corn"
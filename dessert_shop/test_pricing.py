@@ -0,0 +1,94 @@
+"""Test cases for volume and tiered pricing rules."""
+
+try:
+    from dessert_shop import dessert as ds
+    from dessert_shop import pricing
+except Exception:  # pragma: no cover
+    import dessert as ds
+    import pricing
+
+import pytest
+
+
+@pytest.fixture
+def rules():
+    """Install a rule set for one test, then restore list prices."""
+
+    def install(*texts):
+        return pricing.set_pricing_rules(texts)
+
+    yield install
+    pricing.set_pricing_rules(())
+
+
+def test_parse_rule():
+    assert pricing.parse_rule("Cookie: 10% off above 5 dozen") == (
+        "Cookie",
+        60.0,
+        10.0,
+    )
+    assert pricing.parse_rule("ice cream : 5 % off above 3 scoops") == (
+        "IceCream",
+        3.0,
+        5.0,
+    )
+    assert pricing.parse_rule("Candy: 2.5% off above 1.5") == ("Candy", 1.5, 2.5)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Cookie 10% off above 5 dozen",
+        "Fudge: 10% off above 5",
+        "Cookie: 10% off above 5 gallons",
+        "Cookie: 110% off above 5",
+        "Cookie: 1.2.3% off above 5",
+    ],
+)
+def test_parse_invalid_rule(text):
+    with pytest.raises(ValueError):
+        pricing.parse_rule(text)
+
+
+def test_compiled_rule_sets_are_cached():
+    first = pricing.compile_rules(["Cookie: 10% off above 60", "Candy: 5% off above 2"])
+    second = pricing.compile_rules(
+        [pricing.make_rule("Candy", 2, 5), "Cookie: 10% off above 5 dozen"]
+    )
+    assert first is second
+    assert first.price_function("IceCream") is None
+
+
+def test_no_rules_is_list_price():
+    assert pricing.get_pricing_rules().tables == {}
+    assert ds.Cookie("Chocolate Chip", 72, 3.99).cost_cents() == 2394
+
+
+def test_volume_discount(rules):
+    rules("Cookie: 10% off above 5 dozen")
+    assert ds.Cookie("Chocolate Chip", 60, 3.99).cost_cents() == 1995
+    # 23.94 - 2.39 (10%, rounded half up)
+    assert ds.Cookie("Chocolate Chip", 72, 3.99).cost_cents() == 2155
+    assert ds.Candy("Candy Corn", 72, 0.25).cost_cents() == 1800
+
+
+def test_tiered_discount(rules):
+    rules("Candy: 5% off above 2 lbs", "Candy: 10% off above 5 lbs")
+    assert ds.Candy("Gummy Bears", 2, 1.00).cost_cents() == 200
+    assert ds.Candy("Gummy Bears", 4, 1.00).cost_cents() == 380
+    assert ds.Candy("Gummy Bears", 6, 1.00).cost_cents() == 540
+
+
+def test_discount_applies_to_sundae_topping(rules):
+    rules("Sundae: 50% off above 2 scoops")
+    assert ds.Sundae("Vanilla", 3, 1.00, "Fudge", 1.00).cost_cents() == 200
+    assert ds.IceCream("Vanilla", 3, 1.00).cost_cents() == 300
+
+
+def test_combined_items_are_repriced(rules):
+    rules("Cookie: 10% off above 5 dozen")
+    order = ds.Order()
+    order.add(ds.Cookie("Chocolate Chip", 36, 3.99))
+    order.add(ds.Cookie("Chocolate Chip", 36, 3.99))
+    assert order.order_cost_cents() == 2155
+    assert order.order_tax_cents() == ds.Cookie("Chocolate Chip", 72, 3.99).tax_cents()
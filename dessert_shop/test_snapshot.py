@@ -0,0 +1,101 @@
+"""Test cases for binary order snapshots."""
+
+try:
+    from dessert_shop import snapshot
+    from dessert_shop import dessert as ds
+    from dessert_shop.payment import PayType
+except Exception:  # pragma: no cover
+    import snapshot
+    import dessert as ds
+    from payment import PayType
+
+import pytest
+
+
+def make_orders():
+    first = ds.Order()
+    first.add(ds.Candy("Candy Corn", 1.5, 0.25))
+    first.add(ds.Cookie("Chocolate Chip", 6, 3.99))
+    first.add(ds.Candy("Candy Corn", 0.5, 0.25))
+    first.set_pay_type(PayType.CARD)
+
+    second = ds.Order()
+    sundae = ds.Sundae("Vanilla", 3, 0.69, "Hot Fudge", 1.29)
+    sundae.tax_percent = 6.1
+    second.add(sundae)
+    ice_cream = ds.IceCream("Pistachio", 2, 0.79)
+    ice_cream.packaging = "Cone"
+    second.add(ice_cream)
+    second.set_pay_type(PayType.PHONE)
+    return [("A-1", first), ("A-2", second), ("A-3", ds.Order())]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "orders.snap"
+    orders = make_orders()
+    assert snapshot.write_snapshot(path, orders) == 3
+
+    with snapshot.Snapshot(path) as snap:
+        assert len(snap) == 3
+        assert snap.item_count == 4
+        loaded = list(snap)
+    for (order_id, order), (loaded_id, loaded_order) in zip(orders, loaded):
+        assert loaded_id == order_id
+        assert str(loaded_order) == str(order)
+        assert loaded_order.order_cost_cents() == order.order_cost_cents()
+        assert loaded_order.order_tax_cents() == order.order_tax_cents()
+
+
+def test_snapshot_lazy_access(tmp_path):
+    path = tmp_path / "orders.snap"
+    snapshot.write_snapshot(path, make_orders())
+    with snapshot.Snapshot(path) as snap:
+        assert snap.order_id(1) == "A-2"
+        second = snap[-2]
+        sundae, ice_cream = second
+        assert sundae.tax_percent == 6.1
+        assert sundae.topping_name == "Hot Fudge"
+        assert ice_cream.packaging == "Cone"
+        assert second.get_pay_type() == PayType.PHONE
+        with pytest.raises(IndexError):
+            snap[3]
+
+
+def test_snapshot_lazy_items(tmp_path):
+    path = tmp_path / "orders.snap"
+    orders = make_orders()
+    snapshot.write_snapshot(path, orders)
+    with snapshot.Snapshot(path) as snap:
+        items = snap.items(-2)
+        assert len(items) == 2
+        assert items[-1].packaging == "Cone"
+        assert [item.name for item in items] == [item.name for item in orders[1][1]]
+        assert [item.name for item in items[1:]] == [orders[1][1].order[1].name]
+        assert items[0].cost_cents() == orders[1][1].order[0].cost_cents()
+        assert items[0]._order is None
+        with pytest.raises(IndexError):
+            items[2]
+
+
+def test_snapshot_orders_still_combine(tmp_path):
+    path = tmp_path / "orders.snap"
+    snapshot.write_snapshot(path, make_orders())
+    with snapshot.Snapshot(path) as snap:
+        order = snap[0]
+    order.add(ds.Candy("Candy Corn", 1.0, 0.25))
+    assert len(order) == 2
+    assert order.order[0].candy_weight == 3.0
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "orders.snap"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(path)
+
+    snapshot.write_snapshot(path, [])
+    data = bytearray(path.read_bytes())
+    data[4] = snapshot.VERSION + 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="version"):
+        snapshot.Snapshot(path)
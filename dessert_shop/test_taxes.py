@@ -0,0 +1,87 @@
+"""Test cases for the per-jurisdiction tax table."""
+
+try:
+    from dessert_shop import dessert as ds
+    from dessert_shop import taxes
+except Exception:  # pragma: no cover
+    import dessert as ds
+    import taxes
+
+import pytest
+
+RATES = {
+    "UT": {"candy": 7.25, "bakery": 3.0, taxes.ANY_CATEGORY: 6.1},
+    "OR": {},
+}
+
+
+@pytest.fixture
+def utah():
+    """Tax at the UT rates for one test, then restore the default table."""
+    table = taxes.TaxTable(RATES)
+    taxes.set_tax_table(table, "UT")
+    yield table
+    taxes.set_tax_table(taxes.TaxTable({taxes.DEFAULT_JURISDICTION: {}}))
+
+
+def test_table_lookup():
+    table = taxes.TaxTable(RATES)
+    assert table.basis_points("UT", "candy") == 725
+    assert table.basis_points("UT", "ice_cream") == 610
+    assert table.percent("UT", "bakery") == 3.0
+    assert table.basis_points("OR", "candy") is None
+    assert set(table.jurisdictions) == {"UT", "OR"}
+
+
+def test_table_lookups_are_cached():
+    table = taxes.TaxTable(RATES, cache_size=4)
+    for _ in range(10):
+        table.basis_points("UT", "candy")
+    info = table.basis_points.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (9, 1, 4)
+
+
+def test_table_errors():
+    with pytest.raises(ValueError):
+        taxes.TaxTable({"UT": {"candy": -1}})
+    with pytest.raises(KeyError):
+        taxes.TaxTable(RATES).basis_points("NV", "candy")
+    with pytest.raises(ValueError):
+        taxes.set_tax_table(taxes.TaxTable(RATES), "NV")
+
+
+def test_items_use_active_table(utah):
+    cookie = ds.Cookie("Chocolate Chip", 12, 3.99)
+    assert cookie.tax_percent == 3.0
+    assert cookie.tax_cents() == 12
+    assert ds.IceCream("Vanilla", 2, 0.79).tax_percent == 6.1
+    assert ds.Candy("Candy Corn", 1, 1.0).tax_percent == 7.25
+
+
+def test_item_rate_overrides_table(utah):
+    cookie = ds.Cookie("Chocolate Chip", 12, 3.99)
+    cookie.tax_percent = 10
+    assert cookie.tax_cents() == 40
+
+
+def test_jurisdiction_without_rate_uses_class_default(utah):
+    taxes.set_jurisdiction("OR")
+    cookie = ds.Cookie("Chocolate Chip", 12, 3.99)
+    assert cookie.tax_percent == ds.DessertItem.default_tax_percent
+    assert cookie.tax_cents() == 29
+
+
+def test_order_tax_uses_table(utah):
+    order = ds.Order()
+    order.add(ds.Cookie("Chocolate Chip", 12, 3.99))
+    order.add(ds.Candy("Candy Corn", 1, 1.0))
+    assert order.order_tax_cents() == 12 + 7
+
+
+def test_tax_table_pickles():
+    import pickle
+
+    table = pickle.loads(pickle.dumps(taxes.TaxTable(RATES)))
+    assert table.jurisdictions == ("UT", "OR")
+    assert table.basis_points("UT", "candy") == 725
+    assert table.percent("UT", "gelato") == 6.1
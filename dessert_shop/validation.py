@@ -0,0 +1,71 @@
+"""validation.py
+
+Input validation rules shared by the interactive prompts and the bulk
+order loader.
+
+Each parser takes the raw text typed by the user (or read from a file) and
+returns the converted value, or raises ValueError with the message the
+prompts show to the user.
+"""
+
+import math
+
+
+def parse_non_negative_float(text: str, label: str) -> float:
+    """Parse text as a number that cannot be negative.
+
+    Parameters
+    ----------
+    text : str
+        The raw input text
+    label : str
+        Name of the value for error messages, e.g. "Weight"
+
+    Returns
+    -------
+    float
+        The parsed value
+
+    Raises
+    ------
+    ValueError
+        If text is not a finite number or the number is negative
+    """
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid input. Please enter a number.") from None
+    if not math.isfinite(value):
+        raise ValueError("Invalid input. Please enter a number.")
+    if value < 0:
+        raise ValueError(f"{label} cannot be negative. Please try again.")
+    return value
+
+
+def parse_non_negative_int(text: str, label: str) -> int:
+    """Parse text as an integer that cannot be negative.
+
+    Parameters
+    ----------
+    text : str
+        The raw input text
+    label : str
+        Name of the value for error messages, e.g. "Quantity"
+
+    Returns
+    -------
+    int
+        The parsed value
+
+    Raises
+    ------
+    ValueError
+        If text is not an integer or the integer is negative
+    """
+    try:
+        value = int(text)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid input. Please enter an integer.") from None
+    if value < 0:
+        raise ValueError(f"{label} cannot be negative. Please try again.")
+    return value
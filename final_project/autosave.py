@@ -0,0 +1,112 @@
+"""autosave.py
+
+Background autosave for TaskManager.
+
+TaskManager counts its changes and wakes the autosaver after each one.
+The autosaver thread waits until changes pause for `delay` seconds (but
+no longer than `max_delay` after the first unsaved change), so a burst
+of edits is written once. It then saves through
+``TaskManager.save_to_file``: the state is captured quickly under the
+manager's lock and written to disk (atomically, see journal.write_atomic)
+without holding it, so the interactive loop never waits for file I/O.
+In journal mode that includes the journal's fsync and its compaction;
+the SQLite backend commits each change as it is made (see
+sqlite_store.py), so it has nothing left for the thread to do.
+"""
+
+import threading
+import time
+from typing import Optional
+
+DEFAULT_DELAY = 1.0
+DEFAULT_MAX_DELAY = 10.0
+
+
+class Autosaver:
+    """Thread that saves a TaskManager a moment after it changes.
+
+    Attributes
+    ----------
+    delay : float
+        Seconds without changes before saving
+    max_delay : float
+        Longest time in seconds a change waits to be saved
+    saves : int
+        Number of saves done
+    error : Optional[OSError]
+        Error of the last failed save, if any (the next change retries)
+    """
+
+    def __init__(self, manager, delay: float = DEFAULT_DELAY, max_delay: float = DEFAULT_MAX_DELAY):
+        """Initialize the autosaver; call start() to start the thread.
+
+        Parameters
+        ----------
+        manager : TaskManager
+            Manager to save
+        delay : float, optional
+            Seconds without changes before saving (default DEFAULT_DELAY)
+        max_delay : float, optional
+            Longest time in seconds a change waits to be saved
+            (default DEFAULT_MAX_DELAY)
+        """
+        self.manager = manager
+        self.delay = delay
+        self.max_delay = max_delay
+        self.saves = 0
+        self.error: Optional[OSError] = None
+        self._wake = threading.Event()
+        self._stopping = False
+        # time.monotonic() of the latest change and of the first unsaved one
+        self._last_change = 0.0
+        self._first_change: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+
+    def start(self) -> None:
+        """Start the autosave thread."""
+        self._thread.start()
+
+    def notify(self) -> None:
+        """Record that the manager changed (cheap; never blocks)."""
+        self._last_change = time.monotonic()
+        if self._first_change is None:
+            self._first_change = self._last_change
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop the thread, then save pending changes right away."""
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._save()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Debounce: wait for a pause in the changes, a later change
+            # wakes the wait early and moves the deadline
+            while not self._stopping and self._first_change is not None:
+                deadline = min(
+                    self._last_change + self.delay, self._first_change + self.max_delay
+                )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wake.wait(remaining)
+                self._wake.clear()
+            if self._stopping:
+                return
+            self._save()
+
+    def _save(self) -> None:
+        self._first_change = None
+        if not self.manager.dirty:
+            return
+        try:
+            self.manager.save_to_file()
+        except OSError as error:
+            self.error = error
+        else:
+            self.saves += 1
+            self.error = None
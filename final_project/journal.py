@@ -0,0 +1,209 @@
+"""journal.py
+
+Append-only journal (write-ahead log) for TaskManager persistence.
+
+In journal mode every TaskManager change is appended to the journal as
+one compact JSON line instead of rewriting the whole task file. Each
+line is flushed to the operating system as it is appended, so it
+survives a crash of the process; the fsync that protects it against a
+power loss is left to the next save (see begin_sync), which autosave
+runs on its own thread. Saves periodically compact the journal: its
+records are moved aside (see rotate), a full snapshot is written
+atomically and the moved records are deleted. Each record carries a
+sequence number, and the snapshot stores the last one it includes, so a
+crash between these steps never applies a record twice.
+
+A crash in the middle of an append leaves at most one torn line at the
+end of the journal; it is ignored and cut off when the journal is read.
+"""
+
+import json
+import os
+from typing import Callable, List
+
+
+def _nothing() -> None:
+    pass
+
+
+def write_atomic(path: str, text: str) -> None:
+    """Replace a file so readers see either the old or the new contents.
+
+    The text is written and fsynced to a temporary file next to path,
+    which is then renamed over path. The directory is fsynced too, so the
+    rename itself survives a power loss.
+
+    Parameters
+    ----------
+    path : str
+        File to replace
+    text : str
+        New contents
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    _fsync_directory(os.path.dirname(path))
+
+
+def _fsync_directory(directory: str) -> None:
+    """Fsync a directory so renames in it are durable (POSIX only)."""
+    if os.name != "posix":
+        return  # directories cannot be opened for fsync on Windows
+    fd = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """Append-only file of JSON records, one per line.
+
+    Attributes
+    ----------
+    path : str
+        Journal file name
+    old_path : str
+        File holding the records moved aside by rotate() until the
+        snapshot that includes them is written
+    size : int
+        Number of records in the journal
+    """
+
+    def __init__(self, path: str):
+        """Initialize a journal; the file is created on the first append.
+
+        Parameters
+        ----------
+        path : str
+            Journal file name
+        """
+        self.path = path
+        self.old_path = path + ".old"
+        self.size = 0
+        self._file = None
+        self._unsynced = 0
+
+    def read(self) -> List[dict]:
+        """Read every complete record, dropping a torn last line.
+
+        Records moved aside by an unfinished compaction are read first.
+
+        Returns
+        -------
+        List[dict]
+            The records in the order they were appended
+        """
+        self.close()
+        records = _read_records(self.old_path) + _read_records(self.path)
+        self.size = len(records)
+        return records
+
+    def append(self, record: dict) -> None:
+        """Append a record and flush it to the operating system.
+
+        Parameters
+        ----------
+        record : dict
+            JSON-serializable record
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.size += 1
+        self._unsynced += 1
+
+    def sync(self) -> None:
+        """Fsync the appended records to disk."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def begin_sync(self) -> Callable[[], None]:
+        """Return a function that fsyncs the records appended so far.
+
+        The returned function does the slow fsync and may be called from
+        another thread, even after the journal was rotated or closed.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that waits until the appended records are on disk
+        """
+        if self._file is None or not self._unsynced:
+            return _nothing
+        self._unsynced = 0
+        # A duplicate descriptor stays valid if the journal file is closed
+        fd = os.dup(self._file.fileno())
+
+        def sync():
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        return sync
+
+    def rotate(self) -> Callable[[], None]:
+        """Move the records to old_path and start an empty journal.
+
+        Call begin_sync() first so the moved records can still be synced.
+        If old_path still holds the records of an unfinished compaction,
+        the journal is left as it is (its records are older than the next
+        snapshot and are skipped on replay).
+
+        Returns
+        -------
+        Callable[[], None]
+            Function deleting the moved records; call it from any thread
+            once a snapshot including them is written
+        """
+        old_path = self.old_path
+        if not os.path.exists(old_path):
+            self.close()
+            if os.path.exists(self.path):
+                os.replace(self.path, old_path)
+            open(self.path, "w").close()
+            self.size = 0
+
+        def discard():
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+        return discard
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def _read_records(path: str) -> List[dict]:
+    """Read the complete records of one journal file, cutting off a torn tail."""
+    records = []
+    valid_end = 0
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_end += len(line)
+    except FileNotFoundError:
+        return records
+    # Cut off a partial record so new records start on a clean line
+    if valid_end < os.path.getsize(path):
+        os.truncate(path, valid_end)
+    return records
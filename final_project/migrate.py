@@ -0,0 +1,80 @@
+"""migrate.py
+
+Convert a To Done task file between storage backends.
+
+The backend of each file is chosen by its name (see storage.open_store):
+
+    python migrate.py tasks.json tasks.db      # JSON -> SQLite
+    python migrate.py tasks.db tasks.json      # SQLite -> JSON
+
+Focus areas, task IDs and completion status are copied as they are. A
+JSON source that has a journal next to it is read with its journal.
+"""
+
+import argparse
+import os
+from typing import List, Optional
+from storage import SQLITE_SUFFIXES, TaskStore, open_store
+
+
+def migrate(source: TaskStore, target: TaskStore) -> int:
+    """Copy every focus area and task from source to target.
+
+    The target's previous contents are replaced.
+
+    Parameters
+    ----------
+    source : TaskStore
+        Loaded store to copy from
+    target : TaskStore
+        Store to copy to
+
+    Returns
+    -------
+    int
+        Number of tasks copied
+    """
+    tasks = source.tasks()
+    target.replace_all(source.focus_areas, tasks)
+    target.save()
+    return len(tasks)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the migration tool; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Convert a To Done task file between JSON and SQLite"
+    )
+    parser.add_argument("source", help="task file to read")
+    parser.add_argument("target", help="task file to write")
+    parser.add_argument(
+        "--force", action="store_true", help="replace the target if it already exists"
+    )
+    args = parser.parse_args(argv)
+
+    # A journal-mode source has no JSON snapshot until its first compaction
+    journal = not args.source.endswith(SQLITE_SUFFIXES) and any(
+        os.path.exists(args.source + suffix) for suffix in (".journal", ".journal.old")
+    )
+    if not (os.path.exists(args.source) or journal):
+        print(f"✗ {args.source} does not exist.")
+        return 1
+    if os.path.exists(args.target) and not args.force:
+        print(f"✗ {args.target} already exists (use --force to replace it).")
+        return 1
+
+    source = open_store(args.source, journal=journal)
+    source.load()
+    target = open_store(args.target)
+    target.load()
+    try:
+        count = migrate(source, target)
+    finally:
+        source.close()
+        target.close()
+    print(f"✓ Migrated {count} task(s) from {args.source} to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+"""sqlite_store.py
+
+SQLite storage backend for TaskManager.
+
+Tasks live in a ``tasks`` table indexed on (focus_area, is_complete) and
+on is_complete, so listing, counting, renaming and deleting the tasks of
+one focus area are indexed queries and nothing is loaded up front. The
+database runs in WAL mode and every change is committed as its own
+transaction, so several processes can share one task file.
+
+Unlike JsonStore, this store does no work in ``begin_save``, so autosave
+does not move SQLite's I/O to its thread: each commit runs on the thread
+that made the change. A sqlite3 connection belongs to the thread that
+opened it, and with ``synchronous=NORMAL`` in WAL mode a commit only
+appends to the write-ahead log without an fsync; the fsyncs happen at
+SQLite's periodic checkpoints.
+
+Tasks returned by the store are copies of the rows: change them through
+TaskManager, not by editing their attributes.
+"""
+
+import sqlite3
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+from storage import DEFAULT_FOCUS_AREAS, TaskStore
+from task import Task
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = [
+    "CREATE TABLE focus_areas (name TEXT PRIMARY KEY) WITHOUT ROWID",
+    # AUTOINCREMENT so the IDs of deleted tasks are never reused
+    """CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        focus_area TEXT NOT NULL,
+        is_complete INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX tasks_by_area ON tasks (focus_area, is_complete)",
+    "CREATE INDEX tasks_by_status ON tasks (is_complete)",
+]
+
+_COLUMNS = "SELECT id, title, focus_area, is_complete FROM tasks"
+
+
+def _task(row: tuple) -> Task:
+    task_id, title, focus_area, is_complete = row
+    return Task(title, focus_area, bool(is_complete), task_id=task_id)
+
+
+class SqliteStore(TaskStore):
+    """Task store backed by a SQLite database.
+
+    Attributes
+    ----------
+    path : str
+        Database file name
+    """
+
+    def __init__(self, path: str):
+        """Open (and if needed create) the database.
+
+        Parameters
+        ----------
+        path : str
+            Database file name
+
+        Raises
+        ------
+        ValueError
+            If the database has an unsupported schema version
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Safe in WAL mode: commits survive a crash of the process, only a
+        # power loss can lose the latest ones
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            # Take the write lock first, so two processes creating the same
+            # database do not both create the schema
+            self._conn.execute("BEGIN IMMEDIATE")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == 0:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+                self._conn.executemany(
+                    "INSERT INTO focus_areas VALUES (?)", [(a,) for a in DEFAULT_FOCUS_AREAS]
+                )
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            elif version != SCHEMA_VERSION:
+                raise ValueError(f"Unsupported task database version: {version}")
+
+    @property
+    def focus_areas(self) -> Set[str]:
+        """Names of the focus areas (a new set per access)."""
+        return {name for (name,) in self._conn.execute("SELECT name FROM focus_areas")}
+
+    def save(self) -> None:
+        # Every change is committed as it is made
+        self._conn.commit()
+
+    def begin_save(self) -> Callable[[], None]:
+        # Nothing to defer: every change is already committed on the
+        # caller's thread, and the connection must not be used from the
+        # autosave thread (see the module docstring)
+        return lambda: None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def tasks(self) -> List[Task]:
+        return [_task(row) for row in self._conn.execute(f"{_COLUMNS} ORDER BY id")]
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        row = self._conn.execute(f"{_COLUMNS} WHERE id = ?", (task_id,)).fetchone()
+        return None if row is None else _task(row)
+
+    def get_tasks(self, focus_area: Optional[str], include_completed: bool) -> List[Task]:
+        conditions, parameters = [], []
+        if focus_area:
+            conditions.append("focus_area = ?")
+            parameters.append(focus_area)
+        if not include_completed:
+            conditions.append("is_complete = 0")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn.execute(f"{_COLUMNS}{where} ORDER BY id", parameters)
+        return [_task(row) for row in rows]
+
+    def task_counts(self, focus_area: str) -> Tuple[int, int, int]:
+        counts = dict(
+            self._conn.execute(
+                "SELECT is_complete, COUNT(*) FROM tasks WHERE focus_area = ? GROUP BY is_complete",
+                (focus_area,),
+            )
+        )
+        active, completed = counts.get(0, 0), counts.get(1, 0)
+        return active, completed, active + completed
+
+    def add_task(self, title: str, focus_area: str) -> Task:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO tasks (title, focus_area) VALUES (?, ?)", (title, focus_area)
+            )
+            self._conn.execute("INSERT OR IGNORE INTO focus_areas VALUES (?)", (focus_area,))
+        return Task(title, focus_area, task_id=cursor.lastrowid)
+
+    def complete_task(self, task_id: int) -> bool:
+        with self._conn:
+            cursor = self._conn.execute("UPDATE tasks SET is_complete = 1 WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def delete_task(self, task_id: int) -> bool:
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def add_focus_area(self, focus_area: str) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO focus_areas VALUES (?)", (focus_area,))
+
+    def rename_focus_area(self, old_name: str, new_name: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "UPDATE tasks SET focus_area = ? WHERE focus_area = ?", (new_name, old_name)
+            )
+            self._conn.execute(
+                "UPDATE focus_areas SET name = ? WHERE name = ?", (new_name, old_name)
+            )
+
+    def delete_focus_area(self, focus_area: str) -> int:
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM tasks WHERE focus_area = ?", (focus_area,))
+            self._conn.execute("DELETE FROM focus_areas WHERE name = ?", (focus_area,))
+        return cursor.rowcount
+
+    def cleanup_completed(self) -> int:
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM tasks WHERE is_complete = 1")
+        return cursor.rowcount
+
+    def replace_all(self, focus_areas: Iterable[str], tasks: Iterable[Task]) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.execute("DELETE FROM focus_areas")
+            self._conn.executemany(
+                "INSERT INTO focus_areas VALUES (?)", [(a,) for a in set(focus_areas)]
+            )
+            # Tasks without an ID get one from AUTOINCREMENT
+            self._conn.executemany(
+                "INSERT INTO tasks (id, title, focus_area, is_complete) VALUES (?, ?, ?, ?)",
+                [(t.id, t.title, t.focus_area, int(t.is_complete)) for t in tasks],
+            )
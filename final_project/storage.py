@@ -0,0 +1,482 @@
+"""storage.py
+
+Storage backends for TaskManager.
+
+`TaskStore` is the interface TaskManager uses to keep tasks and focus
+areas. Two backends implement it:
+
+- `JsonStore` (the default) keeps every task in memory and saves them to
+  a JSON file, optionally through an append-only journal
+  (see journal.py).
+- `SqliteStore` (sqlite_store.py) keeps tasks in an indexed SQLite
+  database and answers queries without loading every task, so the file
+  can be large and shared between processes.
+
+`open_store` picks the backend from the file name; migrate.py converts a
+task file from one backend to the other.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from journal import Journal, write_atomic
+from task import Task
+
+# Focus areas of a new task file
+DEFAULT_FOCUS_AREAS = ("Work", "Personal")
+# File name endings that select the SQLite backend
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+class TaskStore(ABC):
+    """Interface of a TaskManager storage backend.
+
+    Stores do not validate their input: TaskManager checks names, limits
+    and duplicates before calling them.
+
+    Attributes
+    ----------
+    path : str
+        File the store persists to
+    focus_areas : Set[str]
+        Names of the focus areas
+    """
+
+    path: str
+    focus_areas: Set[str]
+
+    def load(self) -> None:
+        """Load persisted data (no-op for stores that query on demand)."""
+
+    def save(self) -> None:
+        """Make every change so far durable."""
+        self.begin_save()()
+
+    @abstractmethod
+    def begin_save(self) -> Callable[[], None]:
+        """Capture the state to save and return a function that writes it.
+
+        Capturing is quick and must not be interleaved with changes;
+        the returned function does the file I/O without touching the
+        store, so it can run on a background thread while the store is
+        being changed.
+        """
+
+    def close(self) -> None:
+        """Release files and connections held by the store."""
+
+    @abstractmethod
+    def tasks(self) -> List[Task]:
+        """Return every task in display order."""
+
+    @abstractmethod
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Return the task with the given ID, or None."""
+
+    @abstractmethod
+    def get_tasks(self, focus_area: Optional[str], include_completed: bool) -> List[Task]:
+        """Return the tasks of a focus area (all tasks if None) in display order."""
+
+    @abstractmethod
+    def task_counts(self, focus_area: str) -> Tuple[int, int, int]:
+        """Return the (active, completed, total) task counts of a focus area."""
+
+    @abstractmethod
+    def add_task(self, title: str, focus_area: str) -> Task:
+        """Add a task (and its focus area) and return it with its new ID."""
+
+    @abstractmethod
+    def complete_task(self, task_id: int) -> bool:
+        """Mark a task complete; False if there is no task with that ID."""
+
+    @abstractmethod
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task; False if there is no task with that ID."""
+
+    @abstractmethod
+    def add_focus_area(self, focus_area: str) -> None:
+        """Add a focus area."""
+
+    @abstractmethod
+    def rename_focus_area(self, old_name: str, new_name: str) -> None:
+        """Rename a focus area and move its tasks to the new name."""
+
+    @abstractmethod
+    def delete_focus_area(self, focus_area: str) -> int:
+        """Delete a focus area and its tasks; return the number of tasks deleted."""
+
+    @abstractmethod
+    def cleanup_completed(self) -> int:
+        """Delete every completed task; return the number deleted."""
+
+    @abstractmethod
+    def replace_all(self, focus_areas: Iterable[str], tasks: Iterable[Task]) -> None:
+        """Replace the whole contents, keeping the tasks' IDs where set."""
+
+
+class _AreaIndex:
+    """Tasks of one focus area, split into active and completed buckets.
+
+    Each bucket is an insertion-ordered dict from task ID to Task, so
+    adding, moving and removing a task are O(1) and the counts are the
+    bucket lengths.
+
+    Attributes
+    ----------
+    tasks : Dict[int, Task]
+        Every task of the area, in display (insertion) order
+    active : Dict[int, Task]
+        Tasks that are not complete
+    completed : Dict[int, Task]
+        Tasks that are complete
+    """
+
+    __slots__ = ("tasks", "active", "completed")
+
+    def __init__(self):
+        self.tasks: Dict[int, Task] = {}
+        self.active: Dict[int, Task] = {}
+        self.completed: Dict[int, Task] = {}
+
+    def add(self, task: Task) -> None:
+        self.tasks[task.id] = task
+        if task.is_complete:
+            self.completed[task.id] = task
+        else:
+            self.active[task.id] = task
+
+    def remove(self, task: Task) -> None:
+        del self.tasks[task.id]
+        self.active.pop(task.id, None)
+        self.completed.pop(task.id, None)
+
+    def mark_complete(self, task: Task) -> None:
+        if self.active.pop(task.id, None) is not None:
+            self.completed[task.id] = task
+
+
+class JsonStore(TaskStore):
+    """In-memory store persisted to a JSON file.
+
+    By default the whole file is rewritten on every save. In journal mode
+    each change is appended to ``<path>.journal`` instead and the JSON
+    file becomes a snapshot. The first save after the journal has grown
+    about as large as the snapshot rewrites it atomically, so saving
+    costs O(changes) on average and survives crashes.
+
+    Attributes
+    ----------
+    path : str
+        Name of JSON file for persistence
+    focus_areas : Set[str]
+        Set of focus area names
+    MIN_COMPACT_RECORDS : int
+        In journal mode, a save compacts the journal once it holds this
+        many records, or as many records as the snapshot has tasks if
+        that is more
+    """
+
+    MIN_COMPACT_RECORDS = 1000
+
+    def __init__(self, path: str, journal: bool = False):
+        """Initialize an empty store; call load() to read the file.
+
+        Parameters
+        ----------
+        path : str
+            JSON file name for persistence
+        journal : bool, optional
+            Record changes in an append-only journal next to the JSON
+            file instead of rewriting it on every save (default False)
+        """
+        self.path = path
+        self.focus_areas: Set[str] = set()
+        # Task ID -> Task; insertion order is the display order
+        self._tasks: Dict[int, Task] = {}
+        self._next_id = 1
+        # Focus area -> its tasks, kept in sync by every method that adds,
+        # completes, moves or removes tasks
+        self._index: Dict[str, _AreaIndex] = {}
+        self._journal: Optional[Journal] = Journal(path + ".journal") if journal else None
+        # Sequence number of the last journal record
+        self._seq = 0
+        # Number of tasks in the snapshot the journal applies to
+        self._snapshot_size = 0
+
+    def tasks(self) -> List[Task]:
+        return list(self._tasks.values())
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def get_tasks(self, focus_area: Optional[str], include_completed: bool) -> List[Task]:
+        if not focus_area:
+            if include_completed:
+                return self.tasks()
+            return [t for t in self._tasks.values() if not t.is_complete]
+
+        area = self._index.get(focus_area)
+        if area is None:
+            return []
+        return list((area.tasks if include_completed else area.active).values())
+
+    def task_counts(self, focus_area: str) -> Tuple[int, int, int]:
+        area = self._index.get(focus_area)
+        if area is None:
+            return 0, 0, 0
+        return len(area.active), len(area.completed), len(area.tasks)
+
+    def _index_task(self, task: Task) -> None:
+        """Add a task to the index of its focus area."""
+        area = self._index.get(task.focus_area)
+        if area is None:
+            area = self._index[task.focus_area] = _AreaIndex()
+        area.add(task)
+
+    def _insert_task(self, task: Task) -> None:
+        """Add a task that already has an ID."""
+        self._next_id = max(self._next_id, task.id + 1)
+        self._tasks[task.id] = task
+        self._index_task(task)
+        self.focus_areas.add(task.focus_area)
+
+    def add_task(self, title: str, focus_area: str) -> Task:
+        task = Task(title, focus_area, task_id=self._next_id)
+        self._insert_task(task)
+        self._record("add", id=task.id, title=title, area=focus_area)
+        return task
+
+    def complete_task(self, task_id: int) -> bool:
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        task.mark_complete()
+        self._index[task.focus_area].mark_complete(task)
+        self._record("complete", id=task_id)
+        return True
+
+    def delete_task(self, task_id: int) -> bool:
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return False
+        self._index[task.focus_area].remove(task)
+        self._record("delete", id=task_id)
+        return True
+
+    def add_focus_area(self, focus_area: str) -> None:
+        self.focus_areas.add(focus_area)
+        self._record("add_area", area=focus_area)
+
+    def rename_focus_area(self, old_name: str, new_name: str) -> None:
+        # Update the tasks with this focus area, found through the index
+        area = self._index.pop(old_name, None)
+        if area is not None:
+            for task in area.tasks.values():
+                task.focus_area = new_name
+            self._index[new_name] = area
+
+        self.focus_areas.discard(old_name)
+        self.focus_areas.add(new_name)
+        self._record("rename_area", old=old_name, new=new_name)
+
+    def delete_focus_area(self, focus_area: str) -> int:
+        area = self._index.pop(focus_area, None)
+        deleted_count = 0 if area is None else len(area.tasks)
+        if deleted_count:
+            for task_id in area.tasks:
+                del self._tasks[task_id]
+
+        self.focus_areas.discard(focus_area)
+        self._record("delete_area", area=focus_area)
+        return deleted_count
+
+    def cleanup_completed(self) -> int:
+        removed = 0
+        for area in self._index.values():
+            for task_id in area.completed:
+                del area.tasks[task_id]
+                del self._tasks[task_id]
+            removed += len(area.completed)
+            area.completed.clear()
+        if removed:
+            self._record("cleanup")
+        return removed
+
+    def replace_all(self, focus_areas: Iterable[str], tasks: Iterable[Task]) -> None:
+        self.focus_areas = set(focus_areas)
+        self._set_tasks(
+            [Task(t.title, t.focus_area, t.is_complete, task_id=t.id) for t in tasks]
+        )
+        # A journal only holds changes; write the new contents as a snapshot
+        self.compact()
+
+    def _to_dict(self) -> dict:
+        """Return the tasks and focus areas as JSON-serializable data."""
+        return {
+            "focus_areas": list(self.focus_areas),
+            "tasks": [task.to_dict() for task in self._tasks.values()],
+        }
+
+    def begin_save(self) -> Callable[[], None]:
+        """Capture the tasks and return a function saving them to the JSON file.
+
+        The file is replaced atomically, so a crash while saving leaves
+        the previous version. In journal mode the changes are already in
+        the journal; the function fsyncs them and, once the journal is
+        large, writes the compacted snapshot (see compact()).
+        """
+        if self._journal is None:
+            data = self._to_dict()  # task dicts are copies, safe to serialize later
+            return lambda: write_atomic(self.path, json.dumps(data, indent=2))
+        if self._journal.size >= max(self.MIN_COMPACT_RECORDS, self._snapshot_size):
+            return self._begin_compact()
+        return self._journal.begin_sync()
+
+    def _record(self, op: str, **fields) -> None:
+        """Append a change to the journal (no-op without journal mode)."""
+        if self._journal is None:
+            return
+        self._seq += 1
+        self._journal.append({"seq": self._seq, "op": op, **fields})
+
+    def compact(self) -> None:
+        """Write a snapshot of every task and empty the journal.
+
+        No-op without journal mode. The snapshot records the sequence
+        number of the last change it includes, so if the journal cannot be
+        emptied (e.g. after a crash) those changes are skipped on the next
+        load.
+        """
+        if self._journal is not None:
+            self._begin_compact()()
+
+    def _begin_compact(self) -> Callable[[], None]:
+        """Capture a snapshot and rotate the journal; return the writer.
+
+        The returned function syncs the rotated records, writes the
+        snapshot and then deletes them, without touching the store.
+        """
+        sync = self._journal.begin_sync()
+        data = self._to_dict()
+        data["journal_seq"] = self._seq
+        discard = self._journal.rotate()
+        self._snapshot_size = len(self._tasks)
+
+        def write():
+            sync()
+            write_atomic(self.path, json.dumps(data, separators=(",", ":")))
+            discard()
+
+        return write
+
+    def close(self) -> None:
+        """Sync and close the journal (no-op without journal mode)."""
+        if self._journal is not None:
+            self._journal.close()
+
+    def _apply(self, record: dict) -> None:
+        """Redo one journal record."""
+        op = record["op"]
+        if op == "add":
+            self._insert_task(Task(record["title"], record["area"], task_id=record["id"]))
+        elif op == "complete":
+            self.complete_task(record["id"])
+        elif op == "delete":
+            self.delete_task(record["id"])
+        elif op == "add_area":
+            self.add_focus_area(record["area"])
+        elif op == "rename_area":
+            self.rename_focus_area(record["old"], record["new"])
+        elif op == "delete_area":
+            self.delete_focus_area(record["area"])
+        elif op == "cleanup":
+            self.cleanup_completed()
+
+    def _replay_journal(self, seq: int) -> None:
+        """Redo the journal records newer than the snapshot's sequence number."""
+        journal, self._journal = self._journal, None  # don't journal the replay
+        try:
+            for record in journal.read():
+                if record["seq"] > seq:
+                    self._apply(record)
+                    seq = record["seq"]
+        finally:
+            self._journal = journal
+        self._seq = seq
+
+    def load(self) -> None:
+        """Load tasks and focus areas from the JSON file.
+
+        In journal mode the file is a snapshot and the journal records
+        written after it are replayed on top.
+
+        Raises
+        ------
+        ValueError
+            If the file is not valid JSON; the file and the journal are
+            left as they are, so no saved task is lost
+        """
+        seq = 0
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+                self.focus_areas = set(data.get("focus_areas", []))
+                tasks = [Task.from_dict(task_data) for task_data in data.get("tasks", [])]
+                seq = data.get("journal_seq", 0)
+        except FileNotFoundError:
+            # First run - start with default focus areas
+            self.focus_areas = set(DEFAULT_FOCUS_AREAS)
+            tasks = []
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Corrupted task file {self.path}: {error}") from None
+        self._set_tasks(tasks)
+        self._snapshot_size = len(tasks)
+        if self._journal is not None:
+            self._replay_journal(seq)
+
+    def _set_tasks(self, tasks: List[Task]) -> None:
+        """Replace every task, keeping saved IDs that are unique.
+
+        Tasks saved before IDs existed (or with a duplicate ID) get a new
+        ID after the highest one in use.
+        """
+        self._next_id = max((t.id for t in tasks if t.id is not None), default=0) + 1
+        self._tasks = {}
+        for task in tasks:
+            if task.id is None or task.id in self._tasks:
+                task.id = self._next_id
+                self._next_id += 1
+            self._tasks[task.id] = task
+        self._index = {}
+        for task in self._tasks.values():
+            self._index_task(task)
+
+
+def open_store(path: str, journal: bool = False) -> TaskStore:
+    """Create the store for a task file, chosen by its name.
+
+    Parameters
+    ----------
+    path : str
+        Task file; names ending in .db, .sqlite or .sqlite3 use SQLite,
+        anything else JSON
+    journal : bool, optional
+        Use journal mode (JSON files only, default False)
+
+    Returns
+    -------
+    TaskStore
+        The store, not loaded yet
+
+    Raises
+    ------
+    ValueError
+        If journal mode is requested for a SQLite file
+    """
+    if path.endswith(SQLITE_SUFFIXES):
+        if journal:
+            raise ValueError("Journal mode is only available for JSON task files")
+        from sqlite_store import SqliteStore  # sqlite3 is only imported when used
+
+        return SqliteStore(path)
+    return JsonStore(path, journal)
@@ -4,6 +4,8 @@ Task class for To Done CLI application.
 Represents a single task with title, focus area, and completion status.
 """
 
+from typing import Optional
+
 
 class Task:
     """Represents a single task.
@@ -16,9 +18,17 @@ class Task:
         Category/focus area the task belongs to
     is_complete : bool
         Whether the task has been completed
+    id : Optional[int]
+        Stable ID assigned by the TaskManager (None until the task is added)
     """
 
-    def __init__(self, title: str, focus_area: str, is_complete: bool = False):
+    def __init__(
+        self,
+        title: str,
+        focus_area: str,
+        is_complete: bool = False,
+        task_id: Optional[int] = None,
+    ):
         """Initialize a new task.
 
         Parameters
@@ -29,10 +39,13 @@ class Task:
             Category/focus area for the task
         is_complete : bool, optional
             Initial completion status (default False)
+        task_id : int, optional
+            Stable ID of the task (default None, assigned by the TaskManager)
         """
         self.title = title
         self.focus_area = focus_area
         self.is_complete = is_complete
+        self.id = task_id
 
     def mark_complete(self) -> None:
         """Mark this task as complete."""
@@ -58,6 +71,7 @@ class Task:
             Dictionary representation of the task
         """
         return {
+            "id": self.id,
             "title": self.title,
             "focus_area": self.focus_area,
             "is_complete": self.is_complete,
@@ -81,4 +95,5 @@ class Task:
             title=data["title"],
             focus_area=data["focus_area"],
             is_complete=data.get("is_complete", False),
+            task_id=data.get("id"),
         )
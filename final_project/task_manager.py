@@ -2,10 +2,18 @@
 
 TaskManager class for To Done CLI application.
 Manages the collection of tasks and focus areas with JSON persistence.
+
+Tasks are kept by a storage backend (see storage.py): a JSON file by
+default, optionally with an append-only journal, or a SQLite database
+for task files named ``*.db``, ``*.sqlite`` or ``*.sqlite3``.
+
+TaskManager tracks unsaved changes (``dirty``) and can save them in the
+background with an autosave thread (``start_autosave``, see autosave.py).
 """
 
-import json
-from typing import List, Set
+import threading
+from typing import List, Optional, Set, Tuple
+from storage import TaskStore, open_store
 from task import Task
 
 
@@ -15,35 +23,79 @@ class TaskManager:
     Attributes
     ----------
     tasks : List[Task]
-        List of all Task objects
+        All Task objects in display order (read-only; a new list per access)
     focus_areas : Set[str]
-        Set of focus area names
+        Set of focus area names (read-only; change it through the methods)
     filename : str
-        Name of JSON file for persistence
+        Name of the file for persistence
+    storage : TaskStore
+        Storage backend holding the tasks
+    dirty : bool
+        Whether there are changes that have not been saved yet
     MAX_FOCUS_AREAS : int
         Maximum number of focus areas allowed
     """
 
     MAX_FOCUS_AREAS = 10
 
-    def __init__(self, filename: str = "tasks.json"):
+    def __init__(
+        self,
+        filename: str = "tasks.json",
+        journal: bool = False,
+        storage: Optional[TaskStore] = None,
+    ):
         """Initialize TaskManager and load existing data.
 
         Parameters
         ----------
         filename : str, optional
-            JSON file name for persistence (default "tasks.json")
+            File name for persistence (default "tasks.json"); names ending
+            in .db, .sqlite or .sqlite3 use a SQLite database
+        journal : bool, optional
+            Record changes in an append-only journal next to the JSON
+            file instead of rewriting it on every save (default False)
+        storage : TaskStore, optional
+            Storage backend to use instead of one chosen by filename
         """
-        self.tasks: List[Task] = []
-        self.focus_areas: Set[str] = set()
-        self.filename = filename
+        self.storage = storage if storage is not None else open_store(filename, journal)
+        self.filename = self.storage.path
+        # Held while changing tasks and while capturing them for a save, so
+        # a background save never sees a half-made change
+        self._lock = threading.RLock()
+        # Held for a whole save, so saves are written in order
+        self._save_lock = threading.Lock()
+        # Number of changes made, and how many of them are saved
+        self._changes = 0
+        self._saved_changes = 0
+        self._autosaver = None
         self.load_from_file()
         # Clean up any completed tasks from previous session
         cleaned = self.cleanup_completed_tasks()
         if cleaned > 0:
             self.save_to_file()  # Save immediately after cleanup
 
-    def add_task(self, title: str, focus_area: str) -> None:
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in display order."""
+        return self.storage.tasks()
+
+    @property
+    def focus_areas(self) -> Set[str]:
+        """Names of the focus areas."""
+        return self.storage.focus_areas
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are unsaved changes."""
+        return self._changes != self._saved_changes
+
+    def _changed(self) -> None:
+        """Count a change and wake the autosaver (call with the lock held)."""
+        self._changes += 1
+        if self._autosaver is not None:
+            self._autosaver.notify()
+
+    def add_task(self, title: str, focus_area: str) -> Task:
         """Create and add a new task.
 
         Parameters
@@ -52,10 +104,31 @@ class TaskManager:
             Task description
         focus_area : str
             Focus area for the task
+
+        Returns
+        -------
+        Task
+            The new task, with its ID assigned
         """
-        task = Task(title, focus_area)
-        self.tasks.append(task)
-        self.focus_areas.add(focus_area)
+        with self._lock:
+            task = self.storage.add_task(title, focus_area)
+            self._changed()
+        return task
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Look up a task by its ID.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of the task
+
+        Returns
+        -------
+        Optional[Task]
+            The task, or None if there is no task with that ID
+        """
+        return self.storage.get_task(task_id)
 
     def get_tasks(self, focus_area: str = None, include_completed: bool = True) -> List[Task]:
         """Get tasks, optionally filtered by focus area.
@@ -72,15 +145,22 @@ class TaskManager:
         List[Task]
             List of tasks matching the criteria
         """
-        filtered_tasks = self.tasks
+        return self.storage.get_tasks(focus_area, include_completed)
 
-        if focus_area:
-            filtered_tasks = [t for t in filtered_tasks if t.focus_area == focus_area]
+    def task_counts(self, focus_area: str) -> Tuple[int, int, int]:
+        """Count the tasks of a focus area without listing them.
 
-        if not include_completed:
-            filtered_tasks = [t for t in filtered_tasks if not t.is_complete]
+        Parameters
+        ----------
+        focus_area : str
+            Focus area to count
 
-        return filtered_tasks
+        Returns
+        -------
+        Tuple[int, int, int]
+            (active, completed, total) task counts
+        """
+        return self.storage.task_counts(focus_area)
 
     def complete_task(self, index: int, focus_area: str = None) -> bool:
         """Mark a task as complete.
@@ -99,10 +179,28 @@ class TaskManager:
         """
         tasks = self.get_tasks(focus_area, include_completed=True)
         if 0 <= index < len(tasks):
-            tasks[index].mark_complete()
-            return True
+            return self.complete_task_by_id(tasks[index].id)
         return False
 
+    def complete_task_by_id(self, task_id: int) -> bool:
+        """Mark the task with the given ID as complete.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of the task
+
+        Returns
+        -------
+        bool
+            True if successful, False if there is no task with that ID
+        """
+        with self._lock:
+            if not self.storage.complete_task(task_id):
+                return False
+            self._changed()
+        return True
+
     def delete_task(self, index: int, focus_area: str = None) -> bool:
         """Delete a task from the list.
 
@@ -120,11 +218,28 @@ class TaskManager:
         """
         tasks = self.get_tasks(focus_area, include_completed=True)
         if 0 <= index < len(tasks):
-            task_to_delete = tasks[index]
-            self.tasks.remove(task_to_delete)
-            return True
+            return self.delete_task_by_id(tasks[index].id)
         return False
 
+    def delete_task_by_id(self, task_id: int) -> bool:
+        """Delete the task with the given ID.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of the task
+
+        Returns
+        -------
+        bool
+            True if successful, False if there is no task with that ID
+        """
+        with self._lock:
+            if not self.storage.delete_task(task_id):
+                return False
+            self._changed()
+        return True
+
     def add_focus_area(self, focus_area: str) -> tuple[bool, str]:
         """Add a new focus area.
 
@@ -140,16 +255,19 @@ class TaskManager:
         """
         if not focus_area:
             return False, "Focus area name cannot be empty"
-        
-        if focus_area in self.focus_areas:
+
+        focus_areas = self.focus_areas
+        if focus_area in focus_areas:
             return False, f"Focus area '{focus_area}' already exists"
-        
-        if len(self.focus_areas) >= self.MAX_FOCUS_AREAS:
+
+        if len(focus_areas) >= self.MAX_FOCUS_AREAS:
             return False, f"Maximum {self.MAX_FOCUS_AREAS} focus areas reached"
-        
-        self.focus_areas.add(focus_area)
+
+        with self._lock:
+            self.storage.add_focus_area(focus_area)
+            self._changed()
         return True, f"Focus area '{focus_area}' created successfully!"
-    
+
     def at_focus_area_limit(self) -> bool:
         """Check if at or near focus area limit.
 
@@ -175,19 +293,15 @@ class TaskManager:
         bool
             True if successful, False if old name doesn't exist or new name already exists
         """
-        if old_name not in self.focus_areas or new_name in self.focus_areas:
+        focus_areas = self.focus_areas
+        if old_name not in focus_areas or new_name in focus_areas:
             return False
 
-        # Update all tasks with this focus area
-        for task in self.tasks:
-            if task.focus_area == old_name:
-                task.focus_area = new_name
-
-        # Update focus areas set
-        self.focus_areas.remove(old_name)
-        self.focus_areas.add(new_name)
+        with self._lock:
+            self.storage.rename_focus_area(old_name, new_name)
+            self._changed()
         return True
-    
+
     def delete_focus_area(self, focus_area: str) -> int:
         """Delete a focus area and all its associated tasks.
 
@@ -203,19 +317,12 @@ class TaskManager:
         """
         if focus_area not in self.focus_areas:
             return 0
-        
-        # Count and remove tasks in this focus area
-        tasks_to_remove = [t for t in self.tasks if t.focus_area == focus_area]
-        deleted_count = len(tasks_to_remove)
-        
-        for task in tasks_to_remove:
-            self.tasks.remove(task)
-        
-        # Remove the focus area
-        self.focus_areas.remove(focus_area)
-        
+
+        with self._lock:
+            deleted_count = self.storage.delete_focus_area(focus_area)
+            self._changed()
         return deleted_count
-    
+
     def cleanup_completed_tasks(self) -> int:
         """Remove all completed tasks from the task list.
 
@@ -224,31 +331,64 @@ class TaskManager:
         int
             Number of tasks that were removed
         """
-        initial_count = len(self.tasks)
-        self.tasks = [t for t in self.tasks if not t.is_complete]
-        return initial_count - len(self.tasks)
+        with self._lock:
+            removed = self.storage.cleanup_completed()
+            if removed:
+                self._changed()
+        return removed
 
     def save_to_file(self) -> None:
-        """Save tasks and focus areas to JSON file."""
-        data = {
-            "focus_areas": list(self.focus_areas),
-            "tasks": [task.to_dict() for task in self.tasks],
-        }
-        with open(self.filename, "w") as f:
-            json.dump(data, f, indent=2)
+        """Save tasks and focus areas to the storage file.
+
+        JSON files are replaced atomically. In journal mode the changes
+        are already written; this fsyncs them and, once the journal is
+        large, compacts it into a new snapshot. With SQLite every change
+        is committed as it is made and there is nothing left to do. Safe
+        to call from the autosave thread: the tasks are captured under the
+        lock and written without holding it.
+        """
+        with self._save_lock:
+            with self._lock:
+                changes = self._changes
+                write = self.storage.begin_save()
+            write()
+            self._saved_changes = changes
 
     def load_from_file(self) -> None:
-        """Load tasks and focus areas from JSON file."""
-        try:
-            with open(self.filename, "r") as f:
-                data = json.load(f)
-                self.focus_areas = set(data.get("focus_areas", []))
-                self.tasks = [Task.from_dict(task_data) for task_data in data.get("tasks", [])]
-        except FileNotFoundError:
-            # First run - start with default focus areas
-            self.focus_areas = {"Work", "Personal"}
-            self.tasks = []
-        except json.JSONDecodeError:
-            # Corrupted file - start fresh
-            self.focus_areas = {"Work", "Personal"}
-            self.tasks = []
+        """Load tasks and focus areas from the storage file."""
+        with self._lock:
+            self.storage.load()
+            self._saved_changes = self._changes
+
+    def start_autosave(
+        self, delay: Optional[float] = None, max_delay: Optional[float] = None
+    ) -> None:
+        """Start saving changes in the background.
+
+        Parameters
+        ----------
+        delay : float, optional
+            Seconds without changes before saving (default 1)
+        max_delay : float, optional
+            Longest time in seconds a change waits to be saved (default 10)
+        """
+        from autosave import DEFAULT_DELAY, DEFAULT_MAX_DELAY, Autosaver
+
+        self.stop_autosave()
+        self._autosaver = Autosaver(
+            self,
+            DEFAULT_DELAY if delay is None else delay,
+            DEFAULT_MAX_DELAY if max_delay is None else max_delay,
+        )
+        self._autosaver.start()
+
+    def stop_autosave(self) -> None:
+        """Stop the autosave thread after it saves pending changes."""
+        if self._autosaver is not None:
+            self._autosaver.stop()
+            self._autosaver = None
+
+    def close(self) -> None:
+        """Stop autosaving, then sync and close the storage backend's files."""
+        self.stop_autosave()
+        self.storage.close()
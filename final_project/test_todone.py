@@ -6,8 +6,14 @@ Tests all core features, edge cases, and error handling.
 
 from task import Task
 from task_manager import TaskManager
+from storage import open_store
+import migrate
 import os
 import json
+import sqlite3
+import subprocess
+import sys
+import time
 
 
 def test_task_class():
@@ -48,6 +54,7 @@ def test_task_class():
 
     # to_dict
     task_dict = task.to_dict()
+    assert task_dict["id"] is None
     assert task_dict["title"] == "Finish project"
     assert task_dict["focus_area"] == "Work"
     assert task_dict["is_complete"] == True
@@ -296,6 +303,431 @@ def test_task_manager():
     print("✅ All TaskManager tests passed!\n")
 
 
+def test_focus_area_index():
+    """Test that focus area counts and lookups stay in sync with the tasks."""
+    print("Testing focus area index...")
+
+    test_file = "test_index.json"
+    if os.path.exists(test_file):
+        os.remove(test_file)
+
+    manager = TaskManager(test_file)
+    manager.add_task("Write report", "Work")
+    manager.add_task("Email team", "Work")
+    manager.add_task("Plan sprint", "Work")
+    manager.add_task("Buy milk", "Personal")
+    assert manager.task_counts("Work") == (3, 0, 3)
+    assert manager.task_counts("Personal") == (1, 0, 1)
+    assert manager.task_counts("Nowhere") == (0, 0, 0)
+    print("✓ Task counts after adding work")
+
+    # Completing keeps display order and moves the task between buckets
+    manager.complete_task(1, "Work")
+    assert manager.task_counts("Work") == (2, 1, 3)
+    titles = [t.title for t in manager.get_tasks("Work")]
+    assert titles == ["Write report", "Email team", "Plan sprint"]
+    active = [t.title for t in manager.get_tasks("Work", include_completed=False)]
+    assert active == ["Write report", "Plan sprint"]
+    # Completing an already completed task does not count it twice
+    manager.complete_task(1, "Work")
+    assert manager.task_counts("Work") == (2, 1, 3)
+    print("✓ Complete task updates counts and keeps order")
+
+    manager.delete_task(0, "Work")
+    assert manager.task_counts("Work") == (1, 1, 2)
+    print("✓ Delete task updates counts")
+
+    manager.rename_focus_area("Work", "Job")
+    assert manager.task_counts("Work") == (0, 0, 0)
+    assert manager.task_counts("Job") == (1, 1, 2)
+    assert all(t.focus_area == "Job" for t in manager.get_tasks("Job"))
+    print("✓ Rename focus area moves the index")
+
+    assert manager.cleanup_completed_tasks() == 1
+    assert manager.task_counts("Job") == (1, 0, 1)
+    assert len(manager.tasks) == 2
+    print("✓ Cleanup updates counts")
+
+    assert manager.delete_focus_area("Job") == 1
+    assert manager.task_counts("Job") == (0, 0, 0)
+    assert [t.title for t in manager.tasks] == ["Buy milk"]
+    print("✓ Delete focus area updates counts")
+
+    # The index is rebuilt when loading
+    manager.complete_task(0, "Personal")
+    manager.save_to_file()
+    manager.load_from_file()
+    assert manager.task_counts("Personal") == (0, 1, 1)
+    print("✓ Index rebuilt on load")
+
+    os.remove(test_file)
+
+    print("✅ All focus area index tests passed!\n")
+
+
+def test_task_ids():
+    """Test stable task IDs and completing/deleting by ID."""
+    print("Testing task IDs...")
+
+    test_file = "test_ids.json"
+    if os.path.exists(test_file):
+        os.remove(test_file)
+
+    manager = TaskManager(test_file)
+    first = manager.add_task("Write report", "Work")
+    second = manager.add_task("Buy milk", "Personal")
+    third = manager.add_task("Email team", "Work")
+    assert len({first.id, second.id, third.id}) == 3
+    assert manager.get_task(second.id) is second
+    assert manager.get_task(999) is None
+    print("✓ Added tasks get unique IDs")
+
+    assert manager.complete_task_by_id(third.id) == True
+    assert third.is_complete
+    assert manager.task_counts("Work") == (1, 1, 2)
+    assert manager.complete_task_by_id(999) == False
+    print("✓ Complete task by ID works")
+
+    assert manager.delete_task_by_id(first.id) == True
+    assert manager.get_task(first.id) is None
+    assert manager.delete_task_by_id(first.id) == False
+    assert [t.title for t in manager.get_tasks("Work")] == ["Email team"]
+    print("✓ Delete task by ID works")
+
+    # IDs are not reused and survive saving and loading
+    fourth = manager.add_task("Plan sprint", "Work")
+    assert fourth.id > third.id
+    manager.save_to_file()
+    reloaded = TaskManager(test_file)
+    assert reloaded.get_task(second.id).title == "Buy milk"
+    assert reloaded.get_task(fourth.id).title == "Plan sprint"
+    assert reloaded.add_task("New", "Work").id > fourth.id
+    print("✓ IDs survive save and load")
+
+    # Files saved before IDs existed get IDs on load
+    with open(test_file, "w") as f:
+        json.dump({"focus_areas": ["Work"], "tasks": [
+            {"title": "Old 1", "focus_area": "Work"},
+            {"title": "Old 2", "focus_area": "Work"},
+        ]}, f)
+    legacy = TaskManager(test_file)
+    ids = [t.id for t in legacy.tasks]
+    assert None not in ids and len(set(ids)) == 2
+    print("✓ Tasks without IDs get IDs on load")
+
+    os.remove(test_file)
+
+    print("✅ All task ID tests passed!\n")
+
+
+def test_journal_mode():
+    """Test journal persistence: replay, torn records and compaction."""
+    print("Testing journal mode...")
+
+    test_file = "test_journal.json"
+    journal_file = test_file + ".journal"
+    for path in (test_file, journal_file):
+        if os.path.exists(path):
+            os.remove(path)
+
+    manager = TaskManager(test_file, journal=True)
+    report = manager.add_task("Write report", "Work")
+    milk = manager.add_task("Buy milk", "Personal")
+    manager.add_task("Email team", "Work")
+    manager.complete_task_by_id(milk.id)
+    manager.delete_task(1, "Work")
+    manager.add_focus_area("Fitness")
+    manager.rename_focus_area("Personal", "Home")
+    manager.save_to_file()
+    assert not os.path.exists(test_file)  # no snapshot until compaction
+    with open(journal_file) as f:
+        assert len(f.readlines()) == 7
+    print("✓ Changes are appended to the journal")
+
+    # A new manager replays the journal (and cleans up the completed task)
+    reloaded = TaskManager(test_file, journal=True)
+    assert [t.title for t in reloaded.tasks] == ["Write report"]
+    assert reloaded.get_task(report.id).focus_area == "Work"
+    assert reloaded.focus_areas == {"Work", "Home", "Fitness"}
+    assert reloaded.add_task("Plan sprint", "Work").id > milk.id
+    reloaded.close()
+    manager.close()
+    print("✓ Journal is replayed on load")
+
+    # A record torn by a crash is dropped
+    with open(journal_file, "a") as f:
+        f.write('{"seq": 999, "op": "add", "id": 99, "ti')
+    torn = TaskManager(test_file, journal=True)
+    assert [t.title for t in torn.tasks] == ["Write report", "Plan sprint"]
+    torn.add_task("After crash", "Work")
+    torn.close()
+    assert len(TaskManager(test_file, journal=True).tasks) == 3
+    print("✓ Torn journal record is ignored")
+
+    # Appended records survive the process dying before the next fsync
+    script = (
+        "import os\n"
+        "from task_manager import TaskManager\n"
+        f"manager = TaskManager({test_file!r}, journal=True)\n"
+        "for i in range(5):\n"
+        "    manager.add_task(f'Killed {i}', 'Work')\n"
+        "os._exit(1)\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here)
+    subprocess.run([sys.executable, "-c", script], env=env, check=False)
+    killed = TaskManager(test_file, journal=True)
+    assert [t.title for t in killed.tasks][3:] == [f"Killed {i}" for i in range(5)]
+    for task in killed.get_tasks("Work")[3:]:
+        killed.delete_task_by_id(task.id)
+    killed.close()
+    print("✓ Journal survives an unclean exit")
+
+    # Compaction writes a snapshot and empties the journal
+    small = TaskManager(test_file, journal=True)
+    small.storage.compact()
+    assert os.path.getsize(journal_file) == 0
+    with open(test_file) as f:
+        assert len(json.load(f)["tasks"]) == 3
+    # ... and happens on the first save after the journal outgrows the snapshot
+    small.storage.MIN_COMPACT_RECORDS = 4
+    for i in range(4):
+        small.add_task(f"Task {i}", "Work")
+    with open(test_file) as f:
+        assert len(json.load(f)["tasks"]) == 3  # never on the changing thread
+    small.save_to_file()
+    with open(test_file) as f:
+        snapshot = json.load(f)
+    assert len(snapshot["tasks"]) == 7
+    assert os.path.getsize(journal_file) == 0
+    small.add_task("Task 4", "Work")
+    print("✓ Journal compacts into a snapshot")
+
+    # A crash after the journal is rotated but before the snapshot is
+    # written loses nothing
+    for i in range(5, 11):
+        small.add_task(f"Task {i}", "Work")
+    write = small.storage.begin_save()
+    assert os.path.exists(journal_file + ".old")
+    small.add_task("Task 11", "Work")
+    crashed = TaskManager(test_file, journal=True)
+    assert len(crashed.tasks) == 15
+    crashed.close()
+    write()
+    assert not os.path.exists(journal_file + ".old")
+    small.close()
+    assert len(TaskManager(test_file, journal=True).tasks) == 15
+    print("✓ Interrupted compaction is recovered")
+
+    # Records already in the snapshot are not applied twice
+    with open(journal_file, "a") as f:
+        f.write(json.dumps({"seq": snapshot["journal_seq"], "op": "cleanup"}) + "\n")
+        f.write(json.dumps({"seq": 1, "op": "delete", "id": report.id}) + "\n")
+    replayed = TaskManager(test_file, journal=True)
+    assert len(replayed.tasks) == 15
+    assert replayed.get_task(report.id) is not None
+    replayed.close()
+    print("✓ Records older than the snapshot are skipped")
+
+    # A corrupt snapshot is reported, not replaced by the default focus areas
+    with open(test_file) as f:
+        good_snapshot = f.read()
+    with open(test_file, "w") as f:
+        f.write(good_snapshot[: len(good_snapshot) // 2])
+    journal_size = os.path.getsize(journal_file)
+    try:
+        TaskManager(test_file, journal=True)
+        assert False, "corrupt snapshot was loaded"
+    except ValueError as error:
+        assert test_file in str(error)
+    assert os.path.getsize(journal_file) == journal_size
+    with open(test_file, "w") as f:
+        f.write(good_snapshot)
+    repaired = TaskManager(test_file, journal=True)
+    assert len(repaired.tasks) == 15
+    repaired.close()
+    print("✓ Corrupt snapshot raises an error and keeps the journal")
+
+    for path in (test_file, journal_file):
+        os.remove(path)
+
+    print("✅ All journal mode tests passed!\n")
+
+
+def test_sqlite_storage():
+    """Test the SQLite storage backend."""
+    print("Testing SQLite storage...")
+
+    test_file = "test_tasks.db"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(test_file + suffix):
+            os.remove(test_file + suffix)
+
+    manager = TaskManager(test_file)
+    assert manager.focus_areas == {"Work", "Personal"}
+    assert len(manager.tasks) == 0
+    print("✓ New database has the default focus areas")
+
+    report = manager.add_task("Write report", "Work")
+    manager.add_task("Email team", "Work")
+    milk = manager.add_task("Buy milk", "Personal")
+    manager.add_task("Go to gym", "Fitness")
+    assert "Fitness" in manager.focus_areas
+    assert [t.title for t in manager.get_tasks("Work")] == ["Write report", "Email team"]
+    assert manager.get_task(milk.id).title == "Buy milk"
+    assert manager.get_task(999) is None
+    print("✓ Add and get tasks works")
+
+    assert manager.complete_task(1, "Work") == True
+    assert manager.complete_task(5, "Work") == False
+    assert manager.task_counts("Work") == (1, 1, 2)
+    active = manager.get_tasks("Work", include_completed=False)
+    assert [t.title for t in active] == ["Write report"]
+    print("✓ Complete task and counts work")
+
+    assert manager.rename_focus_area("Work", "Job") == True
+    assert manager.rename_focus_area("Job", "Personal") == False
+    assert manager.task_counts("Job") == (1, 1, 2)
+    assert all(t.focus_area == "Job" for t in manager.get_tasks("Job"))
+    print("✓ Rename focus area works")
+
+    assert manager.delete_task_by_id(milk.id) == True
+    assert manager.delete_task_by_id(milk.id) == False
+    assert manager.delete_focus_area("Fitness") == 1
+    assert "Fitness" not in manager.focus_areas
+    success, message = manager.add_focus_area("Job")
+    assert success == False and "already exists" in message
+    print("✓ Delete task and focus area work")
+
+    # Changes are committed as they happen; a second manager sees them
+    # and cleans up the completed task on startup
+    other = TaskManager(test_file)
+    assert [t.id for t in other.tasks] == [report.id]
+    assert manager.add_task("New", "Job").id > milk.id
+    other.close()
+    manager.close()
+    print("✓ Database is shared between managers")
+
+    # Focus area queries use the indexes
+    conn = sqlite3.connect(test_file)
+    plan = " ".join(
+        str(row) for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM tasks WHERE focus_area = 'Job'"
+        )
+    )
+    assert "tasks_by_area" in plan
+    conn.close()
+    print("✓ Focus area queries are indexed")
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(test_file + suffix):
+            os.remove(test_file + suffix)
+
+    print("✅ All SQLite storage tests passed!\n")
+
+
+def test_migration():
+    """Test converting task files between JSON and SQLite."""
+    print("Testing migration...")
+
+    json_file = "test_migrate.json"
+    db_file = "test_migrate.db"
+    back_file = "test_migrate_back.json"
+    paths = [json_file, json_file + ".journal", back_file]
+    paths += [db_file + suffix for suffix in ("", "-wal", "-shm")]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+    manager = TaskManager(json_file, journal=True)
+    manager.add_focus_area("Fitness")
+    first = manager.add_task("Write report", "Work")
+    manager.add_task("Buy milk", "Personal")
+    done = manager.add_task("Email team", "Work")
+    manager.delete_task_by_id(first.id)
+    manager.complete_task_by_id(done.id)
+    manager.close()
+    expected = [t.to_dict() for t in manager.tasks]
+
+    assert migrate.main([json_file, db_file]) == 0
+    assert migrate.main([json_file, db_file]) == 1  # target exists
+    db_store = open_store(db_file)
+    assert [t.to_dict() for t in db_store.tasks()] == expected
+    assert db_store.focus_areas == {"Work", "Personal", "Fitness"}
+    db_store.close()
+    print("✓ JSON to SQLite keeps IDs, completion and focus areas")
+
+    assert migrate.main([db_file, back_file]) == 0
+    with open(back_file) as f:
+        data = json.load(f)
+    assert data["tasks"] == expected
+    assert sorted(data["focus_areas"]) == ["Fitness", "Personal", "Work"]
+    print("✓ SQLite to JSON round trip works")
+
+    assert migrate.main(["missing.json", "missing.db"]) == 1
+    print("✓ Missing source is reported")
+
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+    print("✅ All migration tests passed!\n")
+
+
+def test_autosave():
+    """Test dirty tracking, atomic saves and the background autosave."""
+    print("Testing autosave...")
+
+    test_file = "test_autosave.json"
+    if os.path.exists(test_file):
+        os.remove(test_file)
+
+    manager = TaskManager(test_file)
+    assert manager.dirty == False
+    task = manager.add_task("Write report", "Work")
+    assert manager.dirty == True
+    manager.save_to_file()
+    assert manager.dirty == False
+    assert not os.path.exists(test_file + ".tmp")
+    print("✓ Changes mark the manager dirty until saved")
+
+    # Failed changes are not changes
+    assert manager.complete_task_by_id(999) == False
+    assert manager.rename_focus_area("Nowhere", "Elsewhere") == False
+    assert manager.add_focus_area("Work")[0] == False
+    assert manager.cleanup_completed_tasks() == 0
+    assert manager.dirty == False
+    print("✓ Failed changes leave the manager clean")
+
+    def saved_titles():
+        with open(test_file) as f:
+            return [t["title"] for t in json.load(f)["tasks"]]
+
+    manager.start_autosave(delay=0.05, max_delay=1.0)
+    for i in range(20):
+        manager.add_task(f"Task {i}", "Work")
+    deadline = time.monotonic() + 5
+    while manager.dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.dirty == False
+    assert len(saved_titles()) == 21
+    # The burst of changes is written in far fewer saves than changes
+    assert 1 <= manager._autosaver.saves < 20
+    print("✓ Autosave writes a burst of changes in the background")
+
+    # Stopping saves what is still pending
+    manager.complete_task_by_id(task.id)
+    manager.close()
+    assert manager.dirty == False
+    with open(test_file) as f:
+        assert json.load(f)["tasks"][0]["is_complete"] == True
+    print("✓ Closing saves pending changes")
+
+    os.remove(test_file)
+
+    print("✅ All autosave tests passed!\n")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("RUNNING TO DONE TESTS")
@@ -303,6 +735,12 @@ if __name__ == "__main__":
 
     test_task_class()
     test_task_manager()
+    test_focus_area_index()
+    test_task_ids()
+    test_journal_mode()
+    test_sqlite_storage()
+    test_migration()
+    test_autosave()
 
     print("=" * 60)
     print("🎉 ALL TESTS PASSED! 🎉")
@@ -4,6 +4,7 @@ Main application file for To Done CLI.
 A productivity tool to manage tasks organized by focus areas.
 """
 
+import sys
 from task_manager import TaskManager
 
 
@@ -36,7 +37,8 @@ Personal life). Here's how it works:
    - This saves you time when managing multiple tasks!
 
 4. SAVE YOUR WORK
-   - Your tasks automatically save when you exit
+   - Your tasks save automatically a moment after each change
+     and again when you exit
    - Completed tasks are automatically cleaned up on exit
    - Your progress loads the next time you start the app
 
@@ -65,9 +67,7 @@ def display_focus_area_menu(manager: TaskManager) -> None:
 
     sorted_areas = sorted(manager.focus_areas)
     for i, area in enumerate(sorted_areas, 1):
-        task_count = len(manager.get_tasks(area, include_completed=False))
-        completed_count = len([t for t in manager.get_tasks(area) if t.is_complete])
-        total_count = len(manager.get_tasks(area))
+        task_count, completed_count, total_count = manager.task_counts(area)
         print(f"  {i}. {area} ({task_count} active, {completed_count}/{total_count} complete)")
 
     print("\nOPTIONS:")
@@ -175,7 +175,7 @@ def select_focus_area(manager: TaskManager) -> str:
 
             print("\nAVAILABLE FOCUS AREAS:")
             for i, area in enumerate(sorted_areas, 1):
-                task_count = len(manager.get_tasks(area))
+                task_count = manager.task_counts(area)[2]
                 print(f"  {i}. {area} ({task_count} tasks)")
 
             area_choice = input(f"\nWhich focus area to delete? (1-{len(sorted_areas)}): ").strip()
@@ -186,7 +186,7 @@ def select_focus_area(manager: TaskManager) -> str:
                 area_num = int(area_choice)
                 if 1 <= area_num <= len(sorted_areas):
                     area_to_delete = sorted_areas[area_num - 1]
-                    task_count = len(manager.get_tasks(area_to_delete))
+                    task_count = manager.task_counts(area_to_delete)[2]
                     
                     if task_count > 0:
                         confirm = input(f"\n⚠️  This will delete '{area_to_delete}' and its {task_count} task(s). Continue? (y/N): ").strip().lower()
@@ -321,10 +321,7 @@ def manage_tasks(manager: TaskManager, focus_area: str) -> None:
             # If task number provided (e.g., S1), complete it immediately
             if task_num > 0:
                 if 1 <= task_num <= len(active_tasks):
-                    # Get index in full task list
-                    all_tasks = manager.get_tasks(focus_area)
-                    actual_index = all_tasks.index(active_tasks[task_num - 1])
-                    if manager.complete_task(actual_index, focus_area):
+                    if manager.complete_task_by_id(active_tasks[task_num - 1].id):
                         print(f"✓ Task {task_num} marked as complete!")
                     else:
                         print("✗ Could not complete task.")
@@ -342,10 +339,7 @@ def manage_tasks(manager: TaskManager, focus_area: str) -> None:
                 task_input = input(f"\nWhich task to complete? (1-{len(active_tasks)}): ").strip()
                 if task_input:
                     task_index = int(task_input) - 1
-                    # Get index in full task list
-                    all_tasks = manager.get_tasks(focus_area)
-                    actual_index = all_tasks.index(active_tasks[task_index])
-                    if manager.complete_task(actual_index, focus_area):
+                    if manager.complete_task_by_id(active_tasks[task_index].id):
                         print(f"✓ Task marked as complete!")
                     else:
                         print("✗ Invalid task number.")
@@ -366,7 +360,7 @@ def manage_tasks(manager: TaskManager, focus_area: str) -> None:
                     task_to_delete = tasks[task_num - 1]
                     confirm = input(f"\n⚠️  Delete '{task_to_delete.title}'? (y/N): ").strip().lower()
                     if confirm == 'y':
-                        if manager.delete_task(task_num - 1, focus_area):
+                        if manager.delete_task_by_id(task_to_delete.id):
                             print(f"✓ Task deleted!")
                         else:
                             print("✗ Could not delete task.")
@@ -390,7 +384,7 @@ def manage_tasks(manager: TaskManager, focus_area: str) -> None:
                         task_to_delete = tasks[task_index]
                         confirm = input(f"\n⚠️  Delete '{task_to_delete.title}'? (y/N): ").strip().lower()
                         if confirm == 'y':
-                            if manager.delete_task(task_index, focus_area):
+                            if manager.delete_task_by_id(task_to_delete.id):
                                 print(f"✓ Task deleted!")
                             else:
                                 print("✗ Could not delete task.")
@@ -411,9 +405,22 @@ def manage_tasks(manager: TaskManager, focus_area: str) -> None:
             input("Press Enter to continue...")
 
 
-def main():
-    """Main application loop."""
-    manager = TaskManager()
+def main(filename: str = "tasks.json"):
+    """Main application loop.
+
+    Parameters
+    ----------
+    filename : str, optional
+        Task file to use (default "tasks.json"); a name ending in .db,
+        .sqlite or .sqlite3 stores the tasks in a SQLite database
+    """
+    try:
+        manager = TaskManager(filename)
+    except ValueError as error:
+        print(f"\n✗ {error}")
+        print("Repair or move the file aside, then start To Done again.")
+        return
+    manager.start_autosave()
 
     try:
         while True:
@@ -425,6 +432,7 @@ def main():
                 if completed_count > 0:
                     print(f"✓ Removed {completed_count} completed task(s)")
                 manager.save_to_file()
+                manager.close()
                 print("✓ All tasks saved successfully!")
                 print("\n👋 Thanks for using To Done! Stay focused! 🎯\n")
                 break
@@ -438,9 +446,10 @@ def main():
         if completed_count > 0:
             print(f"✓ Removed {completed_count} completed task(s)")
         manager.save_to_file()
+        manager.close()
         print("✓ All tasks saved successfully!")
         print("\n👋 Thanks for using To Done! Stay focused! 🎯\n")
 
 
 if __name__ == "__main__":
-    main()
+    main(*sys.argv[1:2])